@@ -4,8 +4,10 @@ from pathlib import Path
 
 if __package__ in (None, ""):
     sys.path.insert(0, str(Path(__file__).resolve().parent))
+    import abm_log
     from util import now_iso, json_write
 else:
+    from . import abm_log
     from .util import now_iso, json_write
 
 
@@ -21,6 +23,9 @@ THROUGHPUT_COLLAPSE_THRESHOLD = 0
 COORDINATION_DOMINANCE_THRESHOLD = 0.25
 VERIFICATION_DRAG_THRESHOLD = 0.5
 RETRY_AMPLIFICATION_THRESHOLD = 2.0
+# cycle_end phase_ns keys counted as doing work; every other phase, and any
+# untimed remainder of cycle_ns, is bookkeeping.
+WORK_PHASES = ("acceptance",)
 
 
 def _ensure_parent(path):
@@ -29,29 +34,17 @@ def _ensure_parent(path):
 
 def append_event(payload):
     _ensure_parent(EVENTS_PATH)
+    abm_log.rotate_if_needed(EVENTS_PATH, abm_log.log_policy())
     with open(EVENTS_PATH, "a", encoding="utf-8") as fh:
-        fh.write(json.dumps(payload, sort_keys=True, separators=(",", ":")) + "\n")
+        abm_log.append_text(fh, json.dumps(payload, sort_keys=True, separators=(",", ":")) + "\n")
 
 
 def load_events():
-    if not EVENTS_PATH.exists():
-        return []
-    events = []
-    for line in EVENTS_PATH.read_text(encoding="utf-8").splitlines():
-        if line.strip():
-            events.append(json.loads(line))
-    return events
+    return abm_log.read_events(EVENTS_PATH)
 
 
 def load_events_from_path(path):
-    path = Path(path)
-    if not path.exists():
-        return []
-    events = []
-    for line in path.read_text(encoding="utf-8").splitlines():
-        if line.strip():
-            events.append(json.loads(line))
-    return events
+    return abm_log.read_events(path)
 
 
 def _parse_cycle_id(cycle_id):
@@ -95,6 +88,32 @@ def build_event(
     }
 
 
+def _cycle_timing(detail):
+    phase_ns = detail.get("phase_ns")
+    if not isinstance(phase_ns, dict):
+        return None
+    phases = {k: int(v) for k, v in phase_ns.items() if isinstance(v, (int, float)) and v >= 0}
+    work_ns = sum(v for k, v in phases.items() if k in WORK_PHASES)
+    timed_ns = sum(phases.values())
+    cycle_ns = detail.get("cycle_ns")
+    total_ns = int(cycle_ns) if isinstance(cycle_ns, (int, float)) and cycle_ns >= timed_ns else timed_ns
+    return phases, work_ns, total_ns - work_ns
+
+
+def _add_timing(bucket, timing):
+    phases, work_ns, bookkeeping_ns = timing
+    bucket["work_ns"] += work_ns
+    bucket["bookkeeping_ns"] += bookkeeping_ns
+    for name, value in phases.items():
+        bucket["phase_ns"][name] = bucket["phase_ns"].get(name, 0) + value
+
+
+def coordination_overhead(data):
+    work_ns = int(data.get("work_ns", 0))
+    bookkeeping_ns = int(data.get("bookkeeping_ns", 0))
+    return _safe_ratio(bookkeeping_ns, work_ns + bookkeeping_ns)
+
+
 def compute_aggregates(events):
     event_counts = {}
     by_work_order = {}
@@ -108,6 +127,7 @@ def compute_aggregates(events):
         run_id = event.get("run_id")
         cycle_id = event.get("cycle_id")
         detail = event.get("detail", {}) if isinstance(event.get("detail"), dict) else {}
+        timing = _cycle_timing(detail) if event_type == "cycle_end" else None
 
         if isinstance(wo_id, str):
             wo = by_work_order.setdefault(
@@ -120,6 +140,9 @@ def compute_aggregates(events):
                     "state_transitions": 0,
                     "done_transitions": 0,
                     "max_cycle_id": 0,
+                    "work_ns": 0,
+                    "bookkeeping_ns": 0,
+                    "phase_ns": {},
                 },
             )
             if event_type == "cycle_start":
@@ -136,6 +159,8 @@ def compute_aggregates(events):
                 wo["state_transitions"] += 1
                 if detail.get("to_state") == "done":
                     wo["done_transitions"] += 1
+            if timing:
+                _add_timing(wo, timing)
             wo["max_cycle_id"] = max(wo["max_cycle_id"], _parse_cycle_id(cycle_id))
 
         if isinstance(run_id, str):
@@ -148,6 +173,9 @@ def compute_aggregates(events):
                     "verify_fail": 0,
                     "state_transitions": 0,
                     "done_transitions": 0,
+                    "work_ns": 0,
+                    "bookkeeping_ns": 0,
+                    "phase_ns": {},
                     "work_orders": set(),
                 },
             )
@@ -165,6 +193,8 @@ def compute_aggregates(events):
                 run["state_transitions"] += 1
                 if detail.get("to_state") == "done":
                     run["done_transitions"] += 1
+            if timing:
+                _add_timing(run, timing)
             if isinstance(wo_id, str):
                 run["work_orders"].add(wo_id)
 
@@ -172,7 +202,10 @@ def compute_aggregates(events):
     for run_id, data in by_run.items():
         data = dict(data)
         data["work_orders"] = sorted(data["work_orders"])
+        data["coordination_overhead"] = coordination_overhead(data)
         by_run_out[run_id] = data
+    for data in by_work_order.values():
+        data["coordination_overhead"] = coordination_overhead(data)
 
     aggregates = {
         "meta": {"version": AGGREGATES_VERSION},
@@ -220,6 +253,7 @@ def compute_scaling_indicators(aggregates):
         verification_drag = _safe_ratio(verify_fail, verify_pass + verify_fail)
         retry_amplification = _safe_ratio(attempt_count, cycle_count)
         indicators[run_id] = {
+            "coordination_overhead": coordination_overhead(data),
             "throughput_to_coordination": throughput_to_coordination,
             "verification_drag": verification_drag,
             "retry_amplification": retry_amplification,
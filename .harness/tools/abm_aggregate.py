@@ -1,11 +1,41 @@
 import argparse
+import heapq
 import json
 import math
+import os
+import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    import abm_log
+    import abm_sketch
+    from util import hooks_policy
+else:
+    from . import abm_log
+    from . import abm_sketch
+    from .util import hooks_policy
+
 RUNS_ROOT = Path("artifacts/abm_runs")
+HOOKS_PATH = Path(".harness/contracts/hooks.json")
+ROLLUP_PATH = RUNS_ROOT / "rollup.json"
+STATE_VERSION = "abm.aggregate_state.v1"
+QUANTILES = {"p50_ms": 50, "p90_ms": 90, "p95_ms": 95, "p99_ms": 99}
+TOP_SPANS = 10
+# Critical-path time not covered by any top-level span.
+UNTRACKED = "(untracked)"
+
+
+def sketch_policy(hooks_path: Path = HOOKS_PATH) -> Dict[str, Any]:
+    policy = hooks_policy("duration_sketch", hooks_path)
+    return {
+        "relative_accuracy": float(policy.get("relative_accuracy", abm_sketch.DEFAULT_RELATIVE_ACCURACY)),
+        "max_bins": int(policy.get("max_bins", abm_sketch.DEFAULT_MAX_BINS)),
+        "exact_samples": bool(policy.get("exact_samples", False)),
+    }
 
 
 def find_repo_root(start: Path) -> Optional[Path]:
@@ -19,118 +49,399 @@ def find_repo_root(start: Path) -> Optional[Path]:
 
 
 def load_events(path: Path) -> List[Dict[str, Any]]:
-    events: List[Dict[str, Any]] = []
-    if not path.exists():
-        return events
-    for line in path.read_text(encoding="utf-8").splitlines():
-        if not line.strip():
-            continue
-        events.append(json.loads(line))
-    return events
+    return abm_log.read_events(path)
 
 
 def _percentile(sorted_vals: List[float], pct: float) -> float:
     if not sorted_vals:
         return 0.0
-    idx = int((pct / 100.0) * (len(sorted_vals) - 1))
-    return float(sorted_vals[idx])
-
-
-def aggregate_events(events: List[Dict[str, Any]]) -> Dict[str, Any]:
-    counts_by_kind: Dict[str, int] = {}
-    counts_by_name: Dict[str, int] = {}
-    counts_by_kind_name: Dict[str, Dict[str, int]] = {}
-    durations_by_name: Dict[str, List[float]] = {}
-    errors_by_class: Dict[str, int] = {}
-    retries_by_class: Dict[str, int] = {}
-    tokens_in = 0
-    tokens_out = 0
-    payload_chars_total = 0
-    cost_total = 0.0
+    pos = (pct / 100.0) * (len(sorted_vals) - 1)
+    low = int(math.floor(pos))
+    high = int(math.ceil(pos))
+    return float(sorted_vals[low] + (sorted_vals[high] - sorted_vals[low]) * (pos - low))
 
-    for event in events:
+
+def duration_stats(sketch: Dict[str, Any], samples: Optional[List[float]] = None) -> Dict[str, Any]:
+    """Summary of one step name; exact interpolated percentiles when samples are kept."""
+    stats: Dict[str, Any] = {
+        "count": sketch["count"],
+        "total_ms": sketch["sum"],
+        "min_ms": sketch["min"] if sketch["count"] else 0.0,
+        "max_ms": sketch["max"] if sketch["count"] else 0.0,
+        "sketch": abm_sketch.to_json(sketch),
+    }
+    if samples is not None:
+        sorted_vals = sorted(samples)
+        for key, pct in QUANTILES.items():
+            stats[key] = _percentile(sorted_vals, pct)
+        stats["samples_ms"] = sorted_vals
+    else:
+        for key, pct in QUANTILES.items():
+            stats[key] = abm_sketch.quantile(sketch, pct / 100.0)
+    return stats
+
+
+def _covered_ns(start: int, end: int, intervals: List[List[int]]) -> int:
+    """Length of the union of intervals, clipped to [start, end]."""
+    covered = 0
+    cursor = start
+    for low, high in sorted(intervals):
+        low, high = max(low, cursor), min(high, end)
+        if high > low:
+            covered += high - low
+            cursor = high
+    return covered
+
+
+def _critical_path(
+    span: List[Any], window_end: int, children: Dict[Any, List[List[Any]]], out: List[List[Any]]
+) -> None:
+    """Walk back from window_end, always descending into the child that finished last."""
+    span_id, _, name, start, _ = span
+    cursor = window_end
+    for child in sorted(children.get(span_id, []), key=lambda c: c[4], reverse=True):
+        if child[3] >= cursor:
+            continue
+        child_end = min(child[4], cursor)
+        if cursor > child_end:
+            out.append([span_id, name, cursor - child_end])
+        _critical_path(child, child_end, children, out)
+        cursor = max(child[3], start)
+    if cursor > start:
+        out.append([span_id, name, cursor - start])
+
+
+def span_records(events: List[Dict[str, Any]]) -> List[List[Any]]:
+    """[span_id, parent_id, name, start_ns, end_ns] for every well-formed span event."""
+    return [
+        [event["span_id"], event.get("parent_id"), event.get("name", ""), event["start_ns"], event["end_ns"]]
+        for event in events
+        if _is_span(event)
+    ]
+
+
+def span_report(spans: List[List[Any]], top_n: int = TOP_SPANS) -> Dict[str, Any]:
+    """Self vs child time per name, hottest spans and the critical path of one run.
+
+    Needs the whole span tree, so it only runs on batch and final aggregates;
+    live snapshots carry the bounded per-name totals and top spans instead.
+    """
+    ids = {span[0] for span in spans}
+    children: Dict[Any, List[List[Any]]] = {}
+    for span in spans:
+        parent = span[1] if span[1] in ids and span[1] != span[0] else None
+        children.setdefault(parent, []).append(span)
+    self_by_name: Dict[str, Dict[str, float]] = {}
+    hot: List[Dict[str, Any]] = []
+    for span in spans:
+        span_id, parent_id, name, start, end = span
+        child_ns = _covered_ns(start, end, [[c[3], c[4]] for c in children.get(span_id, [])])
+        stats = self_by_name.setdefault(name, {"self_ms": 0.0, "child_ms": 0.0})
+        stats["self_ms"] += (end - start - child_ns) / 1e6
+        stats["child_ms"] += child_ns / 1e6
+        hot.append(
+            {
+                "span_id": span_id,
+                "parent_id": parent_id,
+                "name": name,
+                "ms": (end - start) / 1e6,
+                "self_ms": (end - start - child_ns) / 1e6,
+            }
+        )
+    hot.sort(key=lambda h: (-h["self_ms"], str(h["span_id"])))
+
+    critical_ms_by_name: Dict[str, float] = {}
+    path: List[Dict[str, Any]] = []
+    roots = children.get(None, [])
+    if roots:
+        run_root = [None, None, UNTRACKED, min(r[3] for r in roots), max(r[4] for r in roots)]
+        segments: List[List[Any]] = []
+        _critical_path(run_root, run_root[4], children, segments)
+        for span_id, name, ns in reversed(segments):
+            critical_ms_by_name[name] = critical_ms_by_name.get(name, 0.0) + ns / 1e6
+            if path and path[-1]["span_id"] == span_id:
+                path[-1]["ms"] += ns / 1e6
+            else:
+                path.append({"span_id": span_id, "name": name, "ms": ns / 1e6})
+    return {
+        "self_by_name": self_by_name,
+        "top_self_ms": hot[:top_n],
+        "critical_path": path,
+        "critical_path_ms": sum(segment["ms"] for segment in path),
+        "critical_ms_by_name": critical_ms_by_name,
+    }
+
+
+def _is_span(event: Dict[str, Any]) -> bool:
+    return (
+        event.get("kind") == "span"
+        and isinstance(event.get("span_id"), str)
+        and isinstance(event.get("start_ns"), int)
+        and isinstance(event.get("end_ns"), int)
+    )
+
+
+def event_weight(meta: Dict[str, Any]) -> Any:
+    """How many real events a sampled event stands for (meta.weight, default 1)."""
+    weight = meta.get("weight", 1)
+    if isinstance(weight, bool) or not isinstance(weight, (int, float)) or weight <= 0:
+        return 1
+    return int(weight) if weight == int(weight) else float(weight)
+
+
+class RunningAggregator:
+    """Incremental form of aggregate_events: O(1) work per add(), snapshot() on demand."""
+
+    def __init__(
+        self,
+        relative_accuracy: float = abm_sketch.DEFAULT_RELATIVE_ACCURACY,
+        max_bins: int = abm_sketch.DEFAULT_MAX_BINS,
+        exact_samples: bool = False,
+    ) -> None:
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.exact_samples = exact_samples
+        self.event_count = 0
+        self.counts_by_kind: Dict[str, int] = {}
+        self.counts_by_name: Dict[str, int] = {}
+        self.counts_by_kind_name: Dict[str, Dict[str, int]] = {}
+        self.sketches_by_name: Dict[str, Dict[str, Any]] = {}
+        self.samples_by_name: Dict[str, List[float]] = {}
+        self.errors_by_class: Dict[str, int] = {}
+        self.retries_by_class: Dict[str, int] = {}
+        self.tokens_in = 0
+        self.tokens_out = 0
+        self.payload_chars_total = 0
+        self.cost_total = 0.0
+        # Events a background writer had to drop, from its `dropped` events.
+        self.dropped_events = 0
+        # Bounded span totals: per-name count and ms (the duration sketch is
+        # in sketches_by_name) plus a min-heap of the top_spans longest.
+        self.span_count = 0
+        self.spans_by_name: Dict[str, Dict[str, Any]] = {}
+        self.top_spans: List[List[Any]] = []
+
+    def add(self, event: Dict[str, Any]) -> None:
+        self.event_count += 1
         kind = event.get("kind", "")
         name = event.get("name", "")
-        counts_by_kind[kind] = counts_by_kind.get(kind, 0) + 1
-        counts_by_name[name] = counts_by_name.get(name, 0) + 1
-        by_name = counts_by_kind_name.setdefault(kind, {})
-        by_name[name] = by_name.get(name, 0) + 1
+        meta = event.get("meta") if isinstance(event.get("meta"), dict) else {}
+        weight = event_weight(meta)
+        self.counts_by_kind[kind] = self.counts_by_kind.get(kind, 0) + weight
+        self.counts_by_name[name] = self.counts_by_name.get(name, 0) + weight
+        by_name = self.counts_by_kind_name.setdefault(kind, {})
+        by_name[name] = by_name.get(name, 0) + weight
 
         ms = event.get("ms")
         if isinstance(ms, (int, float)):
-            durations_by_name.setdefault(name, []).append(float(ms))
+            sketch = self.sketches_by_name.get(name)
+            if sketch is None:
+                sketch = self.sketches_by_name[name] = abm_sketch.new_sketch(self.relative_accuracy, self.max_bins)
+            abm_sketch.add(sketch, ms, weight)
+            if self.exact_samples:
+                self.samples_by_name.setdefault(name, []).append(float(ms))
+
+        if _is_span(event):
+            span_ms = (event["end_ns"] - event["start_ns"]) / 1e6
+            self.span_count += 1
+            stats = self.spans_by_name.setdefault(name, {"count": 0, "total_ms": 0.0})
+            stats["count"] += 1
+            stats["total_ms"] += span_ms
+            self._push_top([span_ms, event["span_id"], event.get("parent_id"), name])
 
-        meta = event.get("meta") if isinstance(event.get("meta"), dict) else {}
         if kind == "error":
             error_class = meta.get("error_class") or "unknown"
-            errors_by_class[error_class] = errors_by_class.get(error_class, 0) + 1
+            self.errors_by_class[error_class] = self.errors_by_class.get(error_class, 0) + weight
         if kind == "retry":
             retry_class = meta.get("error_class") or "unknown"
-            retries_by_class[retry_class] = retries_by_class.get(retry_class, 0) + 1
+            self.retries_by_class[retry_class] = self.retries_by_class.get(retry_class, 0) + weight
+        if kind == "dropped":
+            self.dropped_events += int(meta.get("dropped", 0) or 0)
 
-        tokens_in += int(meta.get("tokens_in", 0) or 0)
-        tokens_out += int(meta.get("tokens_out", 0) or 0)
-        payload_chars_total += int(
-            meta.get("payload_chars", meta.get("text_bytes", 0)) or 0
+        self.tokens_in += int(round(int(meta.get("tokens_in", 0) or 0) * weight))
+        self.tokens_out += int(round(int(meta.get("tokens_out", 0) or 0) * weight))
+        self.payload_chars_total += int(
+            round(int(meta.get("payload_chars", meta.get("text_bytes", 0)) or 0) * weight)
         )
         try:
-            cost_total += float(meta.get("cost_estimate_usd", 0.0) or 0.0)
+            self.cost_total += float(meta.get("cost_estimate_usd", 0.0) or 0.0) * weight
         except (TypeError, ValueError):
             pass
 
-    duration_stats: Dict[str, Dict[str, Any]] = {}
-    total_ms = 0.0
-    for name, values in durations_by_name.items():
-        sorted_vals = sorted(values)
-        total = sum(sorted_vals)
-        total_ms += total
-        duration_stats[name] = {
-            "count": len(sorted_vals),
-            "total_ms": total,
-            "max_ms": max(sorted_vals) if sorted_vals else 0.0,
-            "p50_ms": _percentile(sorted_vals, 50),
-            "p90_ms": _percentile(sorted_vals, 90),
-            "p95_ms": _percentile(sorted_vals, 95),
-            "samples_ms": sorted_vals,
+    def _push_top(self, entry: List[Any]) -> None:
+        if len(self.top_spans) < TOP_SPANS:
+            heapq.heappush(self.top_spans, entry)
+        elif entry[:2] > self.top_spans[0][:2]:
+            heapq.heapreplace(self.top_spans, entry)
+
+    def merge(self, other: "RunningAggregator") -> "RunningAggregator":
+        """Fold `other` into self; the result equals aggregating both event streams."""
+        self.event_count += other.event_count
+        for mine, theirs in (
+            (self.counts_by_kind, other.counts_by_kind),
+            (self.counts_by_name, other.counts_by_name),
+            (self.errors_by_class, other.errors_by_class),
+            (self.retries_by_class, other.retries_by_class),
+        ):
+            for key, count in theirs.items():
+                mine[key] = mine.get(key, 0) + count
+        for kind, names in other.counts_by_kind_name.items():
+            by_name = self.counts_by_kind_name.setdefault(kind, {})
+            for name, count in names.items():
+                by_name[name] = by_name.get(name, 0) + count
+        for name, sketch in other.sketches_by_name.items():
+            mine_sketch = self.sketches_by_name.get(name)
+            if mine_sketch is None:
+                mine_sketch = self.sketches_by_name[name] = abm_sketch.new_sketch(self.relative_accuracy, self.max_bins)
+            abm_sketch.merge(mine_sketch, sketch)
+        for name, samples in other.samples_by_name.items():
+            self.samples_by_name.setdefault(name, []).extend(samples)
+        # Samples only stay exact if every merged part kept them.
+        self.exact_samples = self.exact_samples and other.exact_samples
+        self.tokens_in += other.tokens_in
+        self.tokens_out += other.tokens_out
+        self.payload_chars_total += other.payload_chars_total
+        self.cost_total += other.cost_total
+        self.dropped_events += other.dropped_events
+        self.span_count += other.span_count
+        for name, theirs in other.spans_by_name.items():
+            stats = self.spans_by_name.setdefault(name, {"count": 0, "total_ms": 0.0})
+            stats["count"] += theirs["count"]
+            stats["total_ms"] += theirs["total_ms"]
+        for entry in other.top_spans:
+            self._push_top(list(entry))
+        return self
+
+    def to_state(self) -> Dict[str, Any]:
+        """JSON-safe state that from_state() turns back into a mergeable aggregator."""
+        return {
+            "version": STATE_VERSION,
+            "relative_accuracy": self.relative_accuracy,
+            "max_bins": self.max_bins,
+            "exact_samples": self.exact_samples,
+            "event_count": self.event_count,
+            "counts_by_kind": dict(self.counts_by_kind),
+            "counts_by_name": dict(self.counts_by_name),
+            "counts_by_kind_name": {k: dict(v) for k, v in self.counts_by_kind_name.items()},
+            "sketches_by_name": {k: abm_sketch.to_json(v) for k, v in self.sketches_by_name.items()},
+            "samples_by_name": {k: list(v) for k, v in self.samples_by_name.items()},
+            "errors_by_class": dict(self.errors_by_class),
+            "retries_by_class": dict(self.retries_by_class),
+            "tokens_in": self.tokens_in,
+            "tokens_out": self.tokens_out,
+            "payload_chars_total": self.payload_chars_total,
+            "cost_total": self.cost_total,
+            "dropped_events": self.dropped_events,
+            "span_count": self.span_count,
+            "spans_by_name": {k: dict(v) for k, v in self.spans_by_name.items()},
+            "top_spans": [list(entry) for entry in self.top_spans],
         }
 
-    tokens_total = tokens_in + tokens_out
-    tokens_est_total = int(math.ceil(payload_chars_total / 4.0)) if payload_chars_total else 0
-    estimated = tokens_total == 0 and tokens_est_total > 0
-    budgets_tokens_total = tokens_est_total if estimated else tokens_total
-
-    aggregates = {
-        "counts_by_kind": counts_by_kind,
-        "counts_by_name": counts_by_name,
-        "counts_by_kind_name": counts_by_kind_name,
-        "durations_by_name": duration_stats,
-        "errors_by_class": errors_by_class,
-        "retries_by_class": retries_by_class,
-        "tokens": {
-            "tokens_in": tokens_in,
-            "tokens_out": tokens_out,
-            "tokens_total": tokens_total,
-        },
-        "budgets": {
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "RunningAggregator":
+        aggregator = cls(state["relative_accuracy"], state["max_bins"], state["exact_samples"])
+        for key in (
+            "event_count",
+            "counts_by_kind",
+            "counts_by_name",
+            "counts_by_kind_name",
+            "samples_by_name",
+            "errors_by_class",
+            "retries_by_class",
+            "tokens_in",
+            "tokens_out",
+            "payload_chars_total",
+            "cost_total",
+        ):
+            setattr(aggregator, key, state[key])
+        aggregator.dropped_events = state.get("dropped_events", 0)
+        aggregator.span_count = state.get("span_count", 0)
+        aggregator.spans_by_name = state.get("spans_by_name", {})
+        aggregator.top_spans = state.get("top_spans", [])
+        heapq.heapify(aggregator.top_spans)
+        aggregator.sketches_by_name = {k: abm_sketch.from_json(v) for k, v in state["sketches_by_name"].items()}
+        return aggregator
+
+    def snapshot(self) -> Dict[str, Any]:
+        durations_by_name: Dict[str, Dict[str, Any]] = {}
+        total_ms = 0.0
+        for name, sketch in self.sketches_by_name.items():
+            total_ms += sketch["sum"]
+            samples = self.samples_by_name.get(name, []) if self.exact_samples else None
+            durations_by_name[name] = duration_stats(sketch, samples)
+
+        tokens_in = self.tokens_in
+        tokens_out = self.tokens_out
+        tokens_total = tokens_in + tokens_out
+        payload_chars_total = self.payload_chars_total
+        tokens_est_total = int(math.ceil(payload_chars_total / 4.0)) if payload_chars_total else 0
+        estimated = tokens_total == 0 and tokens_est_total > 0
+        budgets_tokens_total = tokens_est_total if estimated else tokens_total
+
+        aggregates = {
+            "counts_by_kind": dict(self.counts_by_kind),
+            "counts_by_name": dict(self.counts_by_name),
+            "counts_by_kind_name": {k: dict(v) for k, v in self.counts_by_kind_name.items()},
+            "durations_by_name": durations_by_name,
+            "errors_by_class": dict(self.errors_by_class),
+            "retries_by_class": dict(self.retries_by_class),
             "tokens": {
-                "tokens_in_total": int(tokens_in),
-                "tokens_out_total": int(tokens_out),
-                "tokens_total": int(budgets_tokens_total),
-                "tokens_est_total": int(tokens_est_total),
-                "estimated": bool(estimated),
+                "tokens_in": tokens_in,
+                "tokens_out": tokens_out,
+                "tokens_total": tokens_total,
             },
-            "cost_total_usd": float(round(cost_total, 6)),
-        },
-        "total_ms": total_ms,
-    }
+            "budgets": {
+                "tokens": {
+                    "tokens_in_total": int(tokens_in),
+                    "tokens_out_total": int(tokens_out),
+                    "tokens_total": int(budgets_tokens_total),
+                    "tokens_est_total": int(tokens_est_total),
+                    "estimated": bool(estimated),
+                },
+                "cost_total_usd": float(round(self.cost_total, 6)),
+            },
+            "total_ms": total_ms,
+            "dropped_events": self.dropped_events,
+        }
+        if self.span_count:
+            aggregates["spans"] = {
+                "span_count": self.span_count,
+                "by_name": {k: dict(v) for k, v in self.spans_by_name.items()},
+                "top_ms": [
+                    {"span_id": span_id, "parent_id": parent_id, "name": name, "ms": ms}
+                    for ms, span_id, parent_id, name in sorted(self.top_spans, reverse=True)
+                ],
+            }
+        return aggregates
+
+
+def aggregate_events(
+    events: List[Dict[str, Any]],
+    relative_accuracy: float = abm_sketch.DEFAULT_RELATIVE_ACCURACY,
+    max_bins: int = abm_sketch.DEFAULT_MAX_BINS,
+    exact_samples: bool = False,
+) -> Dict[str, Any]:
+    aggregator = RunningAggregator(relative_accuracy, max_bins, exact_samples)
+    for event in events:
+        aggregator.add(event)
+    aggregates = aggregator.snapshot()
+    add_span_analysis(aggregates, events)
     return aggregates
 
 
+def add_span_analysis(aggregates: Dict[str, Any], events: List[Dict[str, Any]]) -> None:
+    """Fold the full span_report into a snapshot's bounded spans section."""
+    if "spans" in aggregates:
+        aggregates["spans"].update(span_report(span_records(events)))
+
+
 def write_summary(path: Path, aggregates: Dict[str, Any]) -> None:
     lines = []
     lines.append("# ABM Agent Test Summary")
     lines.append("")
     lines.append(f"Total ms: {aggregates.get('total_ms', 0.0):.2f}")
+    if aggregates.get("dropped_events"):
+        lines.append(f"Dropped events: {aggregates['dropped_events']}")
     lines.append("")
     lines.append("## Counts by kind")
     for kind in sorted(aggregates.get("counts_by_kind", {}).keys()):
@@ -160,30 +471,154 @@ def write_summary(path: Path, aggregates: Dict[str, Any]) -> None:
             lines.append(f"- {name}: {stats.get('p95_ms', 0.0):.2f}")
     else:
         lines.append("- none")
+    spans = aggregates.get("spans")
+    if spans and "critical_path" in spans:
+        lines.append("")
+        lines.append(f"## Critical path ({spans['critical_path_ms']:.2f} ms)")
+        for segment in spans["critical_path"]:
+            lines.append(f"- {segment['name']}: {segment['ms']:.2f}")
+        lines.append("")
+        lines.append("## Self vs child ms by span name")
+        for name in sorted(spans["self_by_name"].keys()):
+            stats = spans["self_by_name"][name]
+            lines.append(f"- {name}: self={stats['self_ms']:.2f} child={stats['child_ms']:.2f}")
 
     path.write_text("\n".join(lines) + "\n", encoding="utf-8")
 
 
-def aggregate_run(run_id: str, repo_root: Path, partial: bool = False) -> Path:
+def write_aggregates(
+    path: Path, run_id: str, aggregator: RunningAggregator, events: Optional[List[Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    aggregates = aggregator.snapshot()
+    if events is not None:
+        add_span_analysis(aggregates, events)
+    aggregates["run_id"] = run_id
+    aggregates["event_count"] = aggregator.event_count
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    tmp_path.write_text(json.dumps(aggregates, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp_path, path)
+    return aggregates
+
+
+def aggregate_run(
+    run_id: str, repo_root: Path, partial: bool = False, exact_samples: Optional[bool] = None
+) -> Path:
     run_dir = RUNS_ROOT / run_id
     events_path = run_dir / "events.jsonl"
     aggregates_path = run_dir / ("aggregates_partial.json" if partial else "aggregates.json")
     summary_path = run_dir / ("summary_partial.md" if partial else "summary.md")
+    policy = sketch_policy(repo_root / HOOKS_PATH)
+    if exact_samples is not None:
+        policy["exact_samples"] = exact_samples
+    aggregator = RunningAggregator(**policy)
     events = load_events(events_path)
-    aggregates = aggregate_events(events)
-    aggregates["run_id"] = run_id
-    aggregates["event_count"] = len(events)
-    aggregates_path.write_text(
-        json.dumps(aggregates, indent=2, sort_keys=True) + "\n", encoding="utf-8"
-    )
+    for event in events:
+        aggregator.add(event)
+    # Partial aggregates match the bounded live snapshots; the final ones get
+    # the full span tree analysis.
+    aggregates = write_aggregates(aggregates_path, run_id, aggregator, None if partial else events)
     write_summary(summary_path, aggregates)
     return aggregates_path
 
 
+def run_state(events_path: str, policy: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Aggregate one run's events into a mergeable state (None without events)."""
+    if not abm_log.exists(events_path):
+        return None
+    aggregator = RunningAggregator(**policy)
+    for line in abm_log.iter_lines(events_path):
+        if line.strip():
+            aggregator.add(json.loads(line))
+    return aggregator.to_state()
+
+
+def collect_run_states(
+    run_ids: List[str], repo_root: Path, policy: Dict[str, Any], jobs: Optional[int] = None
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """run_id -> run_state(), one run per worker process."""
+    paths = [str(repo_root / RUNS_ROOT / run_id / "events.jsonl") for run_id in run_ids]
+    jobs = min(jobs or os.cpu_count() or 1, len(paths))
+    if jobs <= 1:
+        states = [run_state(path, policy) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            states = list(pool.map(run_state, paths, [policy] * len(paths)))
+    return dict(zip(run_ids, states))
+
+
+def _rollup_entry(aggregator: RunningAggregator, run_ids: List[str]) -> Dict[str, Any]:
+    entry = aggregator.snapshot()
+    entry["event_count"] = aggregator.event_count
+    entry["run_count"] = len(run_ids)
+    entry["run_ids"] = sorted(run_ids)
+    return entry
+
+
+def rollup_states(
+    states: Dict[str, Optional[Dict[str, Any]]], scenarios: Dict[str, str], policy: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Merge per-run states into per-scenario and overall aggregates."""
+    overall = RunningAggregator(**policy)
+    groups: Dict[str, RunningAggregator] = {}
+    members: Dict[str, List[str]] = {}
+    for run_id in sorted(states):
+        state = states[run_id]
+        scenario = scenarios.get(run_id, "")
+        members.setdefault(scenario, []).append(run_id)
+        group = groups.setdefault(scenario, RunningAggregator(**policy))
+        if state is None:
+            continue
+        aggregator = RunningAggregator.from_state(state)
+        group.merge(aggregator)
+        overall.merge(aggregator)
+    return {
+        "per_scenario": {name: _rollup_entry(groups[name], members[name]) for name in sorted(groups) if name},
+        "overall": _rollup_entry(overall, sorted(states)),
+        "runs_without_events": sorted(run_id for run_id, state in states.items() if state is None),
+    }
+
+
+def rollup_runs(
+    pattern: str,
+    repo_root: Path,
+    scenario_regex: str = "",
+    jobs: Optional[int] = None,
+    exact_samples: Optional[bool] = None,
+) -> Dict[str, Any]:
+    policy = sketch_policy(repo_root / HOOKS_PATH)
+    if exact_samples is not None:
+        policy["exact_samples"] = exact_samples
+    run_ids = sorted(path.name for path in (repo_root / RUNS_ROOT).glob(pattern) if path.is_dir())
+    scenarios: Dict[str, str] = {}
+    if scenario_regex:
+        matcher = re.compile(scenario_regex)
+        for run_id in run_ids:
+            match = matcher.search(run_id)
+            if match:
+                scenarios[run_id] = match.groupdict().get("scenario") or match.group(0)
+    rollup = rollup_states(collect_run_states(run_ids, repo_root, policy, jobs), scenarios, policy)
+    rollup["runs"] = pattern
+    return rollup
+
+
 def main() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--run_id", default="", help="Run id (default: LATEST)")
+    parser.add_argument("--runs", default="", help="Roll up every run dir matching this glob instead")
+    parser.add_argument(
+        "--scenario-regex",
+        default="",
+        help="Group --runs by the (?P<scenario>...) group of this regex on the run id",
+    )
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes for --runs (default: CPUs)")
+    parser.add_argument("--output", default=str(ROLLUP_PATH), help="Rollup path for --runs")
     parser.add_argument("--partial", action="store_true", help="Write partial aggregates")
+    parser.add_argument(
+        "--exact-samples",
+        action="store_true",
+        default=None,
+        help="Also keep every duration (samples_ms) and compute exact percentiles",
+    )
     args = parser.parse_args()
 
     repo_root = find_repo_root(Path.cwd())
@@ -191,6 +626,16 @@ def main() -> int:
         print("ERROR: could not locate repo root")
         return 1
 
+    if args.runs:
+        rollup = rollup_runs(args.runs, repo_root, args.scenario_regex, args.jobs, args.exact_samples)
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = output.with_name(f"{output.name}.tmp")
+        tmp_path.write_text(json.dumps(rollup, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        os.replace(tmp_path, output)
+        print(str(output))
+        return 0
+
     if args.run_id:
         run_id = args.run_id
     else:
@@ -200,7 +645,7 @@ def main() -> int:
             return 1
         run_id = latest.read_text(encoding="utf-8").strip()
 
-    aggregates_path = aggregate_run(run_id, repo_root, partial=args.partial)
+    aggregates_path = aggregate_run(run_id, repo_root, partial=args.partial, exact_samples=args.exact_samples)
     print(str(aggregates_path))
     return 0
 
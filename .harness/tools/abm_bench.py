@@ -1,16 +1,35 @@
 import argparse
+import functools
 import json
+import os
 import subprocess
 import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from itertools import product
 
 if __package__ in (None, ""):
     sys.path.insert(0, str(Path(__file__).resolve().parent))
     import abm as abm_mod
+    import abm_bench_cache
+    import abm_dist
+    import abm_history
+    import abm_scaling
+    import abm_sim
+    import abm_stats
+    import abm_workload
     from util import json_write
 else:
     from . import abm as abm_mod
+    from . import abm_bench_cache
+    from . import abm_dist
+    from . import abm_history
+    from . import abm_scaling
+    from . import abm_sim
+    from . import abm_stats
+    from . import abm_workload
     from .util import json_write
 
 
@@ -18,6 +37,22 @@ RUN_RECEIPTS_DIR = Path("receipts/RUN")
 BENCH_DIR = Path("benchmarks")
 RESULTS_PATH = Path("artifacts/abm/benchmarks/results.json")
 LIMITS_DIR = Path("artifacts/abm/benchmarks/limits")
+RALPH_SUMMARY_PATH = Path("artifacts/abm/ralph_summary.json")
+# Parameter an adaptive sweep bisects when the spec names no "stress_parameter".
+STRESS_PARAMETERS = {
+    "work_in_progress": "wip_limit",
+    "dependency_graph_depth": "depth",
+    "retry_amplification": "retry_rate",
+    "verification_drag": "verification_fail_rate",
+}
+INDICATOR_KEYS = (
+    "throughput_to_coordination",
+    "verification_drag",
+    "retry_amplification",
+    "coordination_overhead",
+    "cycle_count",
+    "done_transitions",
+)
 
 
 def load_benchmarks(path):
@@ -56,70 +91,531 @@ def latest_run_done():
     return latest
 
 
-def run_ralph():
+def run_ralph(root, run_id):
+    # RUN_FAIL is a legitimate benchmark outcome; only a run that leaves no
+    # terminal receipt behind means ralph itself broke.
+    root = Path(root)
+    summary_path = root / RALPH_SUMMARY_PATH
     result = subprocess.run(
-        [sys.executable, ".harness/tools/ralph.py", "--loop"],
+        [
+            sys.executable,
+            ".harness/tools/ralph.py",
+            "--loop",
+            "--run-id",
+            run_id,
+            "--json-summary",
+            str(RALPH_SUMMARY_PATH),
+        ],
+        cwd=root,
         text=True,
         capture_output=True,
     )
-    if result.returncode != 0:
+    summary = json.loads(summary_path.read_text(encoding="utf-8")) if summary_path.exists() else {}
+    if not summary.get("receipt"):
         raise RuntimeError(
             f"ralph run failed: {result.stdout.strip()} {result.stderr.strip()}".strip()
         )
-    receipt = latest_run_done()
-    if not receipt:
-        raise RuntimeError("missing RUN_DONE receipt")
-    return receipt
+    receipt = json.loads((root / summary["receipt"]).read_text(encoding="utf-8"))
+    return receipt, summary
 
 
-def main():
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--benchmarks", default=str(BENCH_DIR))
-    parser.add_argument("--results", default=str(RESULTS_PATH))
-    parser.add_argument("--execute", action="store_true")
-    args = parser.parse_args()
+def repetition_seed(seed, benchmark_id, param_set, rep):
+    # Repetition 0 keeps the single-run seed; warmups (rep < 0) and further
+    # repetitions draw their own.
+    if rep == 0:
+        return abm_sim.derive_seed(seed, benchmark_id, param_set)
+    return abm_sim.derive_seed(seed, benchmark_id, param_set, rep)
+
+
+def execute_param_set(benchmark_id, index, param_set, seed, workdir, rep=0):
+    # Every parameter set gets its own workload repository, so concurrent
+    # runs never share events, receipts or aggregates.
+    suffix = "" if rep == 0 else f"-r{rep}" if rep > 0 else f"-w{-rep}"
+    root = Path(workdir) / f"{benchmark_id}-{index:03d}{suffix}"
+    run_seed = repetition_seed(seed, benchmark_id, param_set, rep)
+    workload = abm_workload.build_workload(root, param_set, seed=run_seed)
+    receipt, summary = run_ralph(root, f"bench-{run_seed:016x}")
+    aggregates = abm_mod.compute_aggregates(abm_mod.load_events_from_path(root / abm_mod.EVENTS_PATH))
+    workload["outcome"] = summary["status"]
+    workload["ralph"] = {key: summary.get(key) for key in ("exit_code", "cycles", "attempts", "cycle_ns", "phase_ns")}
+    return receipt, aggregates, workload
+
+
+def simulate_param_set(benchmark_id, param_set, seed, rep=0):
+    sim = abm_sim.simulate(param_set, seed=repetition_seed(seed, benchmark_id, param_set, rep))
+    receipt = {"run_id": sim["run_id"], "dispatch_hash": sim["dispatch_hash"], "head": sim["head"]}
+    return receipt, abm_mod.compute_aggregates(sim["events"]), sim["summary"]
+
+
+def measure(task):
+    # Module-level so ProcessPoolExecutor can pickle it.
+    benchmark_id, index, rep, param_set, mode, seed, workdir = task
+    started = time.perf_counter()
+    if mode == "simulate":
+        receipt, aggregates, simulation = simulate_param_set(benchmark_id, param_set, seed, rep)
+        extra = {"simulation": simulation}
+    elif mode == "execute":
+        receipt, aggregates, workload = execute_param_set(benchmark_id, index, param_set, seed, workdir, rep)
+        extra = {"workload": workload}
+    else:
+        receipt = latest_run_done()
+        aggregates = json.loads(Path(abm_mod.AGGREGATES_PATH).read_text(encoding="utf-8")) if abm_mod.AGGREGATES_PATH.exists() else {}
+        extra = {}
+    return receipt, aggregates, extra, time.perf_counter() - started
+
+
+def sample_record(receipt, aggregates, extra, wall_s):
+    run_id = receipt.get("run_id") if receipt else ""
+    indicators = abm_mod.compute_scaling_indicators(aggregates).get(run_id, {})
+    limits = abm_mod.classify_limits({run_id: indicators}).get(run_id, {})
+    sample = {
+        "run_id": receipt.get("run_id") if receipt else None,
+        "dispatch_hash": receipt.get("dispatch_hash") if receipt else None,
+        "head": receipt.get("head") if receipt else None,
+        "wall_s": wall_s,
+        "indicators": indicators,
+        "limit": limits.get("limit") if limits else None,
+    }
+    sample.update(extra)
+    return sample
+
+
+def summarize_param_set(benchmark_id, stress_axis, param_set, samples, seed):
+    stats_seed = abm_sim.derive_seed(seed, benchmark_id, param_set, "stats")
+    flat = [dict(s["indicators"], wall_s=s["wall_s"]) for s in samples]
+    stats = abm_stats.summarize_samples(flat, INDICATOR_KEYS + ("wall_s",), seed=stats_seed)
+    # Limits are classified on the repetition means; per-sample limits stay
+    # in `samples` for auditing.
+    indicators = {key: stats[key]["mean"] for key in INDICATOR_KEYS if stats[key]["n"]}
+    limits = abm_mod.classify_limits({"mean": indicators}).get("mean", {})
+    first = samples[0] if samples else {}
+    result = {
+        "benchmark_id": benchmark_id,
+        "stress_axis": stress_axis,
+        "parameters": param_set,
+        "run_id": first.get("run_id"),
+        "dispatch_hash": first.get("dispatch_hash"),
+        "head": first.get("head"),
+        "indicators": indicators,
+        "limit": limits.get("limit") if indicators else first.get("limit"),
+        "repetitions": len(samples),
+        "reused": sum(1 for s in samples if s.get("reused")),
+        "stats": stats,
+        "samples": samples,
+    }
+    for key in ("simulation", "workload"):
+        if key in first:
+            result[key] = first[key]
+    return result
+
+
+def write_limits(result):
+    """One limits file per parameter set, classified on the repetition means."""
+    if not result.get("run_id"):
+        return None
+    limits = abm_mod.classify_limits({"mean": result["indicators"]}).get("mean", {})
+    LIMITS_DIR.mkdir(parents=True, exist_ok=True)
+    path = LIMITS_DIR / f"{result['run_id']}.json"
+    json_write(path, limits)
+    return path
+
+
+def run_tasks(tasks, pool=None, coordinator=None):
+    """Yield (position, outcome) for each task as it finishes."""
+    if coordinator is not None:
+        yield from coordinator.run(tasks)
+    elif pool is not None:
+        futures = {pool.submit(measure, task): position for position, task in enumerate(tasks)}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    else:
+        for position, task in enumerate(tasks):
+            yield position, measure(task)
+
+
+def measure_param_sets(entries, specs, mode, args, workdir, trees, runner=run_tasks, progress=None):
+    """Measure (benchmark_id, index, param_set) entries and summarize each one.
+
+    progress(result) is called as soon as every repetition of a parameter set
+    is in; the returned list keeps entry order.
+    """
+    repeat, warmup = (args.repeat, args.warmup) if mode != "latest" else (1, 0)
+    tasks = []
+    for benchmark_id, index, param_set in entries:
+        for rep in list(range(-warmup, 0)) + list(range(repeat)):
+            tasks.append((benchmark_id, index, rep, param_set, mode, args.seed, workdir))
+
+    # Measured repetitions are cached under a digest of the relevant harness
+    # trees, the workload dispatch, the spec and the parameters; warmups are
+    # skipped for parameter sets whose repetitions are all reused.
+    keys = {}
+    outcomes = {}
+    if trees:
+        for idx, (benchmark_id, _, rep, param_set, _, seed, _) in enumerate(tasks):
+            if rep < 0:
+                continue
+            keys[idx] = abm_bench_cache.cache_key(
+                trees,
+                specs[benchmark_id],
+                param_set,
+                mode,
+                rep,
+                seed,
+                repetition_seed(seed, benchmark_id, param_set, rep),
+            )
+            cached = None if args.force else abm_bench_cache.lookup(keys[idx], args.max_age)
+            if cached is not None:
+                outcomes[idx] = cached
+    missing = {(task[0], task[1]) for idx, task in enumerate(tasks) if task[2] >= 0 and idx not in outcomes}
+    pending = [idx for idx, task in enumerate(tasks) if idx not in outcomes and (task[0], task[1]) in missing]
+    fresh = set(pending)
+
+    reps = {}
+    for idx, task in enumerate(tasks):
+        if task[2] >= 0:
+            reps.setdefault((task[0], task[1]), []).append(idx)
+    summaries = {}
+
+    def settle(key):
+        if key in summaries or any(idx not in outcomes for idx in reps[key]):
+            return
+        samples = []
+        for idx in reps[key]:
+            sample = sample_record(*outcomes[idx])
+            sample["reused"] = idx not in fresh
+            samples.append(sample)
+        benchmark_id, _ = key
+        param_set = tasks[reps[key][0]][3]
+        summaries[key] = summarize_param_set(
+            benchmark_id, specs[benchmark_id].get("stress_axis"), param_set, samples, args.seed
+        )
+        if mode != "simulate":
+            # Simulated runs have no receipts in this repository, so their
+            # limits stay in results.json instead of untracked limits/ files.
+            write_limits(summaries[key])
+        if progress is not None:
+            progress(summaries[key])
+
+    for key in reps:
+        settle(key)
+    for position, outcome in runner([tasks[idx] for idx in pending]):
+        idx = pending[position]
+        if idx in keys:
+            abm_bench_cache.store(keys[idx], outcome)
+        outcomes[idx] = outcome
+        settle((tasks[idx][0], tasks[idx][1]))
+    return [summaries[(benchmark_id, index)] for benchmark_id, index, _ in entries]
+
+
+def stress_parameter(spec):
+    return spec.get("stress_parameter") or STRESS_PARAMETERS.get(spec.get("stress_axis"))
+
+
+def limited(result):
+    return result.get("limit") not in (None, "nominal")
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _axis_key(series):
+    if all(_is_number(v) for v in series["values"]):
+        return lambda v: v
+    return series["values"].index
+
+
+def adaptive_boundary(series):
+    seen = series["seen"]
+    key = _axis_key(series)
+    worse = [v for v in seen if limited(seen[v])]
+    first = min(worse, key=key) if worse else None
+    below = [v for v in seen if not limited(seen[v]) and (first is None or key(v) < key(first))]
+    return {
+        "last_nominal": max(below, key=key) if below else None,
+        "first_limited": first,
+        "limit": seen[first]["limit"] if first is not None else "nominal",
+    }
+
+
+def adaptive_probes(series, refine):
+    """Next values to measure along one axis, assuming limits only get worse as it grows."""
+    values, seen = series["values"], series["seen"]
+    ends = [v for v in dict.fromkeys((values[0], values[-1])) if v not in seen]
+    if ends:
+        return ends
+    if limited(seen[values[0]]) or not limited(seen[values[-1]]):
+        return []
+    key = _axis_key(series)
+    boundary = adaptive_boundary(series)
+    lo, hi = boundary["last_nominal"], boundary["first_limited"]
+    between = [v for v in values if v not in seen and key(lo) < key(v) < key(hi)]
+    if between:
+        return [between[len(between) // 2]]
+    # Grid exhausted: refine between the bracketing values when numeric.
+    refined = sum(1 for v in seen if v not in values)
+    if refined >= refine or not (_is_number(lo) and _is_number(hi)):
+        return []
+    mid = (lo + hi) // 2 if isinstance(lo, int) and isinstance(hi, int) else (lo + hi) / 2.0
+    return [] if mid in (lo, hi) else [mid]
 
-    benchmarks = load_benchmarks(Path(args.benchmarks))
-    results = []
 
+def adaptive_sweep(benchmarks, run, refine=0):
+    """Bisect each stress axis for the first non-nominal limit instead of the full grid.
+
+    Every combination of the remaining parameters is its own series. A series
+    stops as soon as its lowest value is already limited, its highest value is
+    still nominal, or the boundary is bracketed between neighbouring values.
+    """
+    series_list = []
+    indexes = {}
     for spec in benchmarks:
         benchmark_id = spec.get("benchmark_id")
-        stress_axis = spec.get("stress_axis")
         parameters = spec.get("parameters", {})
-        for param_set in expand_parameters(parameters):
-            receipt = None
-            if args.execute:
-                receipt = run_ralph()
-                abm_mod.write_aggregates()
-            else:
-                receipt = latest_run_done()
-            aggregates = json.loads(Path(abm_mod.AGGREGATES_PATH).read_text(encoding="utf-8")) if abm_mod.AGGREGATES_PATH.exists() else {}
-            indicators = abm_mod.compute_scaling_indicators(aggregates).get(
-                receipt.get("run_id") if receipt else "", {}
-            )
-            limits = abm_mod.classify_limits({receipt.get("run_id") if receipt else "": indicators}).get(
-                receipt.get("run_id") if receipt else "", {}
-            )
-            if receipt:
-                LIMITS_DIR.mkdir(parents=True, exist_ok=True)
-                limit_path = LIMITS_DIR / f"{receipt['run_id']}.json"
-                json_write(limit_path, limits)
-            results.append(
-                {
-                    "benchmark_id": benchmark_id,
-                    "stress_axis": stress_axis,
-                    "parameters": param_set,
-                    "run_id": receipt.get("run_id") if receipt else None,
-                    "dispatch_hash": receipt.get("dispatch_hash") if receipt else None,
-                    "head": receipt.get("head") if receipt else None,
-                    "indicators": indicators,
-                    "limit": limits.get("limit") if limits else None,
-                }
+        for index, param_set in enumerate(expand_parameters(parameters)):
+            indexes[(benchmark_id, json.dumps(param_set, sort_keys=True))] = index
+        axis = stress_parameter(spec)
+        if axis not in parameters:
+            axis = sorted(parameters)[0] if parameters else None
+        if axis is None:
+            continue
+        values = list(parameters[axis])
+        if all(_is_number(v) for v in values):
+            values = sorted(values)
+        others = {k: v for k, v in parameters.items() if k != axis}
+        for fixed in expand_parameters(others):
+            series_list.append(
+                {"benchmark_id": benchmark_id, "axis": axis, "fixed": fixed, "values": values, "seen": {}}
             )
 
+    results = []
+    while True:
+        probes = []
+        for series in series_list:
+            for value in adaptive_probes(series, refine):
+                probes.append((series, value))
+        if not probes:
+            break
+        entries = []
+        for series, value in probes:
+            param_set = dict(series["fixed"], **{series["axis"]: value})
+            key = (series["benchmark_id"], json.dumps(param_set, sort_keys=True))
+            index = indexes.setdefault(key, len(indexes))
+            entries.append((series["benchmark_id"], index, param_set))
+        # One batch per round, so --jobs spreads the probes of all series.
+        for (series, value), result in zip(probes, run(entries)):
+            series["seen"][value] = result
+            results.append(result)
+
+    report = []
+    for series in series_list:
+        report.append(
+            {
+                "benchmark_id": series["benchmark_id"],
+                "axis": series["axis"],
+                "parameters": series["fixed"],
+                "probes": len(series["seen"]),
+                "grid_size": len(series["values"]),
+                "boundary": adaptive_boundary(series),
+            }
+        )
+    return results, report
+
+
+def write_results(path, payload):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    json_write(tmp_path, payload)
+    os.replace(tmp_path, path)
+
+
+def worker_main(argv):
+    parser = argparse.ArgumentParser(prog="abm_bench.py worker")
+    parser.add_argument("address", help="Coordinator host:port or unix:/path.")
+    parser.add_argument("--workdir", default=None, help="Keep --execute workload repositories here.")
+    parser.add_argument("--name", default=None)
+    parser.add_argument("--token", default=os.environ.get("ABM_DIST_TOKEN"))
+    parser.add_argument("--heartbeat-s", type=float, default=abm_dist.DEFAULT_HEARTBEAT_S)
+    parser.add_argument(
+        "--connect-timeout",
+        type=float,
+        default=abm_dist.DEFAULT_CONNECT_TIMEOUT_S,
+        help="Give up after the coordinator has been unreachable this long.",
+    )
+    args = parser.parse_args(argv)
+    tmp = None
+    workdir = args.workdir
+    if not workdir:
+        tmp = tempfile.TemporaryDirectory(prefix="abm-worker-")
+        workdir = tmp.name
+
+    def prepare(task):
+        # Workload repositories live on the worker, not where the coordinator runs.
+        return tuple(task[:6]) + (workdir,)
+
+    try:
+        completed = abm_dist.run_worker(
+            args.address,
+            measure,
+            prepare=prepare,
+            name=args.name,
+            token=args.token,
+            heartbeat_s=args.heartbeat_s,
+            connect_timeout_s=args.connect_timeout,
+        )
+    finally:
+        if tmp is not None:
+            tmp.cleanup()
+    print(f"worker finished {completed} tasks")
+    return 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["worker"]:
+        return worker_main(argv[1:])
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--benchmarks", default=str(BENCH_DIR))
+    parser.add_argument("--results", default=str(RESULTS_PATH))
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--execute", action="store_true")
+    mode.add_argument(
+        "--simulate",
+        action="store_true",
+        help="Drive each parameter set through the abm_sim discrete-event model.",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Base seed for --simulate and --execute.")
+    parser.add_argument(
+        "--workdir",
+        default=None,
+        help="Keep --execute workload repositories here instead of a temporary directory.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="Measure each parameter set K times (--execute/--simulate).",
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=0,
+        help="Discarded runs per parameter set before the measured ones.",
+    )
+    parser.add_argument(
+        "--no-history",
+        action="store_true",
+        help="Do not file --execute/--simulate results in the benchmark history database.",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-measure every parameter set even when a cached result matches.",
+    )
+    parser.add_argument(
+        "--max-age",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Only reuse cached results recorded within this many seconds.",
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Bisect each stress axis for the first non-nominal limit instead of sweeping the full grid.",
+    )
+    parser.add_argument(
+        "--refine",
+        type=int,
+        default=0,
+        help="Extra midpoint probes per axis once --adaptive has bracketed a limit between grid values.",
+    )
+    parser.add_argument(
+        "--analyze",
+        action="store_true",
+        help="Fit the Universal Scalability Law along each sweep and write scaling.json.",
+    )
+    parser.add_argument(
+        "--coordinator",
+        default=None,
+        metavar="ADDRESS",
+        help="Serve parameter sets to `abm_bench.py worker` processes on host:port or unix:/path.",
+    )
+    parser.add_argument("--lease-s", type=float, default=abm_dist.DEFAULT_LEASE_S)
+    parser.add_argument("--token", default=os.environ.get("ABM_DIST_TOKEN"))
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Measure up to N parameter sets concurrently (--execute/--simulate).",
+    )
+    args = parser.parse_args(argv)
+    if args.coordinator and not (args.execute or args.simulate):
+        parser.error("--coordinator needs --execute or --simulate")
+    if args.jobs < 1:
+        parser.error("--jobs must be >= 1")
+    if args.repeat < 1 or args.warmup < 0:
+        parser.error("--repeat must be >= 1 and --warmup >= 0")
+    if args.adaptive and not (args.execute or args.simulate):
+        parser.error("--adaptive needs --execute or --simulate")
+
+    benchmarks = load_benchmarks(Path(args.benchmarks))
+    tmp = None
+    workdir = args.workdir
+    if args.execute and not workdir:
+        tmp = tempfile.TemporaryDirectory(prefix="abm-bench-")
+        workdir = tmp.name
+
+    mode = "simulate" if args.simulate else "execute" if args.execute else "latest"
+    specs = {spec.get("benchmark_id"): spec for spec in benchmarks}
+    trees = abm_bench_cache.relevant_tree() if mode != "latest" else None
+    pool = None
+    coordinator = None
+    if args.coordinator:
+        coordinator = abm_dist.Coordinator(args.coordinator, lease_s=args.lease_s, token=args.token)
+        print(f"coordinating on {coordinator.address}", file=sys.stderr, flush=True)
+    elif args.jobs > 1 and mode != "latest":
+        pool = ProcessPoolExecutor(max_workers=args.jobs)
+    runner = functools.partial(run_tasks, pool=pool, coordinator=coordinator)
+    streamed = []
+
+    def progress(result):
+        # Rewritten after every finished parameter set so a long sweep can be
+        # followed (or salvaged) before it ends.
+        streamed.append(result)
+        write_results(Path(args.results), {"results": streamed, "partial": True})
+
+    def run(entries):
+        return measure_param_sets(entries, specs, mode, args, workdir, trees, runner, progress)
+
+    adaptive = None
+    if args.adaptive:
+        results, adaptive = adaptive_sweep(benchmarks, run, args.refine)
+    else:
+        entries = []
+        for spec in benchmarks:
+            for index, param_set in enumerate(expand_parameters(spec.get("parameters", {}))):
+                entries.append((spec.get("benchmark_id"), index, param_set))
+        results = run(entries)
+    if pool is not None:
+        pool.shutdown()
+    if coordinator is not None:
+        coordinator.close()
+    if tmp is not None:
+        tmp.cleanup()
+
     RESULTS_PATH.parent.mkdir(parents=True, exist_ok=True)
-    json_write(Path(args.results), {"results": results})
+    payload = {"results": results}
+    if adaptive is not None:
+        payload["adaptive"] = adaptive
+    write_results(Path(args.results), payload)
+    if mode != "latest" and not args.no_history:
+        abm_history.record_results(results, abm_history.resolve_head())
     print(str(args.results))
+    if args.analyze:
+        scaling_path = Path(args.results).with_name(abm_scaling.SCALING_PATH.name)
+        json_write(scaling_path, abm_scaling.analyze(results, specs))
+        print(str(scaling_path))
     return 0
 
 
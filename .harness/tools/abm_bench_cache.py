@@ -0,0 +1,85 @@
+import hashlib
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    import abm as abm_mod
+    import abm_workload
+    from util import git_session, json_read, json_write, now_iso
+else:
+    from . import abm as abm_mod
+    from . import abm_workload
+    from .util import git_session, json_read, json_write, now_iso
+
+
+CACHE_DIR = Path("artifacts/abm/benchmarks/cache")
+CACHE_VERSION = "abm.bench_cache.v1"
+# Paths whose content decides a benchmark outcome: the harness code plus
+# everything abm_workload copies into a workload. Docs and artifacts are not
+# listed, so changing them keeps cached results valid.
+RELEVANT_PATHS = [".harness/tools"] + [p for p in abm_workload.WORKLOAD_FILES if p != ".gitignore"]
+
+
+def _digest(payload):
+    data = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def relevant_tree():
+    """Tree oids of RELEVANT_PATHS in the working tree (uncommitted edits included)."""
+    session = git_session()
+    tree = session.worktree_tree()
+    if not tree:
+        return None
+    return {path: session.rev_parse(f"{tree}:{path}") for path in RELEVANT_PATHS}
+
+
+def cache_key(trees, spec, param_set, mode, rep, seed, run_seed):
+    dispatch = abm_workload.workload_dispatch(param_set, run_seed)
+    return _digest(
+        {
+            "version": CACHE_VERSION,
+            "aggregates_version": abm_mod.AGGREGATES_VERSION,
+            "python": sys.version,
+            "trees": trees,
+            "dispatch_hash": _digest(dispatch),
+            "spec": spec,
+            "parameters": param_set,
+            "mode": mode,
+            "rep": rep,
+            "seed": seed,
+        }
+    )
+
+
+def _age_s(recorded_utc):
+    try:
+        recorded = datetime.fromisoformat(recorded_utc)
+    except (TypeError, ValueError):
+        return None
+    return (datetime.now(timezone.utc) - recorded).total_seconds()
+
+
+def lookup(key, max_age_s=None, cache_dir=CACHE_DIR):
+    path = Path(cache_dir) / f"{key}.json"
+    if not path.exists():
+        return None
+    try:
+        entry = json_read(path)
+    except (OSError, ValueError):
+        return None
+    if entry.get("key") != key:
+        return None
+    if max_age_s is not None:
+        age = _age_s(entry.get("recorded_utc"))
+        if age is None or age > max_age_s:
+            return None
+    return entry["outcome"]
+
+
+def store(key, outcome, cache_dir=CACHE_DIR):
+    path = Path(cache_dir) / f"{key}.json"
+    json_write(path, {"key": key, "recorded_utc": now_iso(), "outcome": outcome})
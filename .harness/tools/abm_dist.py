@@ -0,0 +1,264 @@
+import collections
+import json
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+import traceback
+
+DEFAULT_LEASE_S = 60.0
+DEFAULT_HEARTBEAT_S = 10.0
+DEFAULT_POLL_S = 1.0
+DEFAULT_CONNECT_TIMEOUT_S = 30.0
+# A task that fails on this many leases aborts the sweep, like an exception
+# from a local measurement would.
+MAX_TASK_FAILURES = 3
+# How long close() keeps answering "done" so polling workers exit cleanly.
+DONE_GRACE_S = 5.0
+
+
+def parse_address(text):
+    """`unix:/path/to.sock` or `host:port` -> (family, address)."""
+    if text.startswith("unix:"):
+        return socket.AF_UNIX, text[len("unix:"):]
+    host, sep, port = text.rpartition(":")
+    if not sep or not port.isdigit():
+        raise ValueError(f"address must be host:port or unix:/path, got {text!r}")
+    return socket.AF_INET, (host or "127.0.0.1", int(port))
+
+
+def format_address(family, address):
+    if family == socket.AF_UNIX:
+        return f"unix:{address}"
+    return f"{address[0]}:{address[1]}"
+
+
+def request(address, message, timeout=DEFAULT_LEASE_S):
+    """Send one JSON line and read one JSON line back; one connection per message."""
+    family, target = parse_address(address)
+    with socket.socket(family, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(target)
+        sock.sendall((json.dumps(message, sort_keys=True) + "\n").encode("utf-8"))
+        with sock.makefile("r", encoding="utf-8") as fh:
+            line = fh.readline()
+    if not line:
+        raise ConnectionError("coordinator closed the connection")
+    return json.loads(line)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            reply = self.server.coordinator.handle(json.loads(line))
+        except (ValueError, KeyError, TypeError) as exc:
+            reply = {"error": f"bad request: {exc}"}
+        self.wfile.write((json.dumps(reply, sort_keys=True) + "\n").encode("utf-8"))
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+
+    class _UnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+
+class Coordinator:
+    """Hands out benchmark tasks to remote workers under renewable leases.
+
+    Workers `lease` a task, `heartbeat` while measuring and post a `result`
+    (or `fail`). A lease that is not renewed within lease_s is taken back and
+    the task queued again; the first result posted for a task wins.
+    """
+
+    def __init__(self, address, lease_s=DEFAULT_LEASE_S, token=None):
+        self.lease_s = lease_s
+        self.token = token
+        self._lock = threading.Lock()
+        self._pending = collections.deque()
+        self._tasks = {}
+        self._leases = {}
+        self._finished = set()
+        self._failures = collections.Counter()
+        self._results = queue.Queue()
+        self._next_id = 0
+        self._closed = False
+        self.workers = {}
+        family, target = parse_address(address)
+        if family == socket.AF_UNIX:
+            if os.path.exists(target):
+                os.unlink(target)
+            self._server = _UnixServer(target, _Handler)
+        else:
+            self._server = _TCPServer(target, _Handler)
+        self._server.coordinator = self
+        self.address = format_address(family, self._server.server_address)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def _requeue_expired(self, now):
+        for task_id, (worker, expires) in list(self._leases.items()):
+            if expires < now:
+                del self._leases[task_id]
+                self._pending.appendleft(task_id)
+
+    def handle(self, message):
+        if self.token is not None and message.get("token") != self.token:
+            return {"error": "unauthorized"}
+        op = message["op"]
+        worker = str(message.get("worker", ""))
+        now = time.monotonic()
+        with self._lock:
+            self.workers[worker] = now
+            self._requeue_expired(now)
+            if op == "lease":
+                if self._pending:
+                    task_id = self._pending.popleft()
+                    self._leases[task_id] = (worker, now + self.lease_s)
+                    return {"task_id": task_id, "task": self._tasks[task_id], "lease_s": self.lease_s}
+                if self._closed:
+                    return {"done": True}
+                return {"wait": DEFAULT_POLL_S}
+            task_id = message["task_id"]
+            held = self._leases.get(task_id, (None, 0))[0] == worker
+            if op == "heartbeat":
+                if held:
+                    self._leases[task_id] = (worker, now + self.lease_s)
+                return {"ok": held}
+            if op == "result":
+                if task_id in self._finished or task_id not in self._tasks:
+                    return {"ok": False}
+                self._leases.pop(task_id, None)
+                self._finished.add(task_id)
+                self._results.put((task_id, message["outcome"], None))
+                return {"ok": True}
+            if op == "fail":
+                if not held:
+                    return {"ok": False}
+                del self._leases[task_id]
+                self._failures[task_id] += 1
+                if self._failures[task_id] >= MAX_TASK_FAILURES:
+                    self._finished.add(task_id)
+                    self._results.put((task_id, None, message.get("error", "")))
+                else:
+                    self._pending.append(task_id)
+                return {"ok": True}
+        return {"error": f"unknown op {op}"}
+
+    def run(self, tasks):
+        """Queue tasks and yield (position, outcome) in completion order."""
+        with self._lock:
+            ids = {}
+            for position, task in enumerate(tasks):
+                task_id = str(self._next_id)
+                self._next_id += 1
+                self._tasks[task_id] = task
+                self._pending.append(task_id)
+                ids[task_id] = position
+        remaining = set(ids)
+        while remaining:
+            try:
+                task_id, outcome, error = self._results.get(timeout=DEFAULT_POLL_S)
+            except queue.Empty:
+                with self._lock:
+                    self._requeue_expired(time.monotonic())
+                continue
+            if error is not None:
+                raise RuntimeError(f"task {task_id} failed on {MAX_TASK_FAILURES} leases: {error}")
+            remaining.discard(task_id)
+            yield ids[task_id], outcome
+
+    def close(self, grace_s=DONE_GRACE_S):
+        with self._lock:
+            self._closed = True
+        # Keep answering until every worker seen so far has polled once more.
+        deadline = time.monotonic() + grace_s
+        closed_at = time.monotonic()
+        while time.monotonic() < deadline:
+            with self._lock:
+                told = {w for w, seen in self.workers.items() if seen >= closed_at}
+                if set(self.workers) <= told:
+                    break
+            time.sleep(0.1)
+        self._server.shutdown()
+        self._server.server_close()
+        family, target = parse_address(self.address)
+        if family == socket.AF_UNIX and os.path.exists(target):
+            os.unlink(target)
+
+
+def _heartbeat(address, base, task_id, interval, stop):
+    while not stop.wait(interval):
+        try:
+            request(address, dict(base, op="heartbeat", task_id=task_id))
+        except OSError:
+            pass
+
+
+def run_worker(
+    address,
+    measure,
+    prepare=None,
+    name=None,
+    token=None,
+    heartbeat_s=DEFAULT_HEARTBEAT_S,
+    connect_timeout_s=DEFAULT_CONNECT_TIMEOUT_S,
+):
+    """Lease and measure tasks until the coordinator says done; returns tasks completed."""
+    name = name or f"{socket.gethostname()}-{os.getpid()}"
+    base = {"worker": name}
+    if token is not None:
+        base["token"] = token
+    completed = 0
+    unreachable_since = None
+    while True:
+        try:
+            reply = request(address, dict(base, op="lease"))
+        except OSError:
+            # Coordinator not up yet, restarting, or gone after the sweep.
+            unreachable_since = unreachable_since or time.monotonic()
+            if time.monotonic() - unreachable_since > connect_timeout_s:
+                return completed
+            time.sleep(DEFAULT_POLL_S)
+            continue
+        unreachable_since = None
+        if reply.get("error"):
+            raise RuntimeError(f"coordinator refused {name}: {reply['error']}")
+        if reply.get("done"):
+            return completed
+        if "task_id" not in reply:
+            time.sleep(reply.get("wait", DEFAULT_POLL_S))
+            continue
+        task_id = reply["task_id"]
+        task = prepare(reply["task"]) if prepare else reply["task"]
+        stop = threading.Event()
+        beat = threading.Thread(
+            target=_heartbeat,
+            args=(address, base, task_id, min(heartbeat_s, reply.get("lease_s", heartbeat_s) / 3.0), stop),
+            daemon=True,
+        )
+        beat.start()
+        try:
+            outcome = measure(task)
+            message = dict(base, op="result", task_id=task_id, outcome=outcome)
+        except Exception:
+            message = dict(base, op="fail", task_id=task_id, error=traceback.format_exc(limit=5))
+        finally:
+            stop.set()
+            beat.join()
+        try:
+            request(address, message)
+        except OSError:
+            # The lease expires and the task is measured again elsewhere.
+            continue
+        if message["op"] == "result":
+            completed += 1
@@ -1,17 +1,41 @@
+import atexit
+import collections
+import contextlib
 import json
 import os
+import signal
 import sys
+import threading
+import time
+import uuid
+import weakref
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, List, Optional
 
 if __package__ in (None, ""):
     sys.path.insert(0, str(Path(__file__).resolve().parent))
+    import abm_aggregate
+    import abm_log
+    import abm_sampling
     import util as util_mod
 else:
+    from . import abm_aggregate
+    from . import abm_log
+    from . import abm_sampling
     from . import util as util_mod
 
 
 RUNS_ROOT = Path("artifacts/abm_runs")
+PARTIAL_AGGREGATES = "aggregates_partial.json"
+LIVE_DEFAULTS = {"enabled": True, "every_events": 100, "every_ms": 1000}
+WRITER_DEFAULTS = {"mode": "async", "queue_size": 10000, "batch_size": 512, "flush_ms": 200, "overflow": "block"}
+OVERFLOW_POLICIES = ("block", "drop_oldest", "drop")
+# How long a SIGTERM/SIGHUP waits for background writers before dying anyway.
+SIGNAL_DRAIN_S = 5.0
+# Open logs with a live aggregator, flushed one last time at exit.
+_LIVE_LOGS: "weakref.WeakSet[Any]" = weakref.WeakSet()
+# Open logs with a background writer, drained at exit or on SIGTERM/SIGHUP.
+_ASYNC_LOGS: "weakref.WeakSet[Any]" = weakref.WeakSet()
 
 
 def ensure_run_dir(run_id: str) -> Path:
@@ -27,13 +51,250 @@ def write_latest_pointer(run_id: str) -> Path:
     return pointer
 
 
+def live_policy() -> Dict[str, Any]:
+    policy = util_mod.hooks_policy("live_aggregates")
+    return {
+        "enabled": bool(policy.get("enabled", LIVE_DEFAULTS["enabled"])),
+        "every_events": max(1, int(policy.get("every_events", LIVE_DEFAULTS["every_events"]))),
+        "every_ms": max(0, int(policy.get("every_ms", LIVE_DEFAULTS["every_ms"]))),
+    }
+
+
+def writer_policy() -> Dict[str, Any]:
+    policy = util_mod.hooks_policy("event_writer")
+    overflow = policy.get("overflow", WRITER_DEFAULTS["overflow"])
+    if overflow not in OVERFLOW_POLICIES:
+        raise ValueError(f"policy.event_writer.overflow must be one of {', '.join(OVERFLOW_POLICIES)}")
+    return {
+        "mode": "sync" if policy.get("mode", WRITER_DEFAULTS["mode"]) == "sync" else "async",
+        "queue_size": max(1, int(policy.get("queue_size", WRITER_DEFAULTS["queue_size"]))),
+        "batch_size": max(1, int(policy.get("batch_size", WRITER_DEFAULTS["batch_size"]))),
+        "flush_ms": max(0, int(policy.get("flush_ms", WRITER_DEFAULTS["flush_ms"]))),
+        "overflow": overflow,
+    }
+
+
+class EventWriter:
+    """Drains emitted events on a background thread with one write and flush per batch.
+
+    A batch is written once batch_size events are queued or flush_ms after the
+    first one arrived. When queue_size events are waiting, put() blocks, evicts
+    the oldest event, or drops the new one, as the overflow policy says. Lost
+    events are counted and logged as a `dropped` event with the next batch.
+    """
+
+    def __init__(self, fh, queue_size: int, batch_size: int, flush_ms: int, overflow: str) -> None:
+        self.fh = fh
+        self.queue_size = queue_size
+        # A full queue is always a full batch, so blocked producers never wait out flush_ms.
+        self.batch_size = min(batch_size, queue_size)
+        self.flush_s = flush_ms / 1000.0
+        self.overflow = overflow
+        self.dropped = 0
+        self.dropped_total = 0
+        self.error: Optional[BaseException] = None
+        self._queue: "collections.deque[Dict[str, Any]]" = collections.deque()
+        # Not reentrant, so a signal handler on a thread already inside put()
+        # fails a non-blocking acquire instead of corrupting the queue.
+        self._cond = threading.Condition(threading.Lock())
+        self._busy = False
+        self._flushing = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="abm-event-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, payload: Dict[str, Any]) -> None:
+        with self._cond:
+            if self._closed:
+                raise ValueError("event log is closed")
+            if len(self._queue) >= self.queue_size:
+                if self.overflow == "block":
+                    while len(self._queue) >= self.queue_size and not self._closed:
+                        self._cond.wait()
+                elif self.overflow == "drop_oldest":
+                    self._queue.popleft()
+                    self.dropped += 1
+                    self.dropped_total += 1
+                else:
+                    self.dropped += 1
+                    self.dropped_total += 1
+                    return
+            self._queue.append(payload)
+            # Wake the writer to start the flush_ms clock, or for a full batch.
+            if len(self._queue) == 1 or len(self._queue) >= self.batch_size:
+                self._cond.notify_all()
+
+    def _next_batch(self) -> Optional[List[Dict[str, Any]]]:
+        with self._cond:
+            deadline = None
+            while not self._closed:
+                if not self._queue and not self.dropped:
+                    self._cond.wait()
+                    continue
+                if self._flushing or len(self._queue) >= self.batch_size:
+                    break
+                deadline = deadline or time.monotonic() + self.flush_s
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            if not self._queue and not self.dropped:
+                return None
+            batch = list(self._queue)
+            self._queue.clear()
+            if self.dropped:
+                batch.append(_prepare({"kind": "dropped", "name": "abm_events", "meta": {"dropped": self.dropped}}))
+                self.dropped = 0
+            self._busy = True
+            self._cond.notify_all()
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            try:
+                _write_payloads(self.fh, batch)
+            except Exception as exc:
+                with self._cond:
+                    self.error = exc
+                    self._closed = True
+                    self._queue.clear()
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def flush(self) -> None:
+        """Block until every event put so far is written."""
+        with self._cond:
+            self._flushing += 1
+            self._cond.notify_all()
+            try:
+                while (self._queue or self.dropped or self._busy) and self._thread.is_alive():
+                    self._cond.wait(0.1)
+            finally:
+                self._flushing -= 1
+        if self.error is not None:
+            raise RuntimeError(f"event writer failed: {self.error}")
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Stop taking events and wait for the queue to drain; False if it did not.
+
+        With a timeout the lock is only tried, never waited on, so this is safe
+        to call from a signal handler that may have interrupted put().
+        """
+        if timeout is None:
+            with self._cond:
+                self._closed = True
+                self._cond.notify_all()
+            self._thread.join()
+            return True
+        if not self._cond.acquire(blocking=False):
+            return False
+        try:
+            self._closed = True
+            self._cond.notify_all()
+        finally:
+            self._cond.release()
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+
+def _flush_on_signal(signum, frame) -> None:
+    _flush_open_logs(SIGNAL_DRAIN_S)
+    signal.signal(signum, signal.SIG_DFL)
+    os.kill(os.getpid(), signum)
+
+
+def _install_signal_flush() -> None:
+    for name in ("SIGTERM", "SIGHUP"):
+        signum = getattr(signal, name, None)
+        if signum is None or signal.getsignal(signum) is not signal.SIG_DFL:
+            continue
+        try:
+            signal.signal(signum, _flush_on_signal)
+        except ValueError:
+            # Only the main thread may install handlers; atexit still drains.
+            return
+
+
 def open_event_log(run_dir: Path):
     run_dir.mkdir(parents=True, exist_ok=True)
     path = run_dir / "events.jsonl"
-    return open(path, "a", encoding="utf-8")
+    policy = live_policy()
+    live = None
+    if policy["enabled"]:
+        aggregator = abm_aggregate.RunningAggregator(**abm_aggregate.sketch_policy())
+        # Appending to an existing log resumes from what is already there.
+        for event in abm_aggregate.load_events(path):
+            aggregator.add(event)
+        live = {
+            "aggregator": aggregator,
+            "path": run_dir / PARTIAL_AGGREGATES,
+            "run_id": run_dir.name,
+            "policy": policy,
+            "pending": 0,
+            "flushed_at": time.monotonic(),
+        }
+    fh = open(path, "a", encoding="utf-8")
+    fh.abm_rotate = abm_log.log_policy()
+    sampling = abm_sampling.load_rules()
+    if sampling is not None:
+        fh.abm_sampler = abm_sampling.Sampler(sampling)
+    if live is not None:
+        fh.abm_live = live
+        _LIVE_LOGS.add(fh)
+    writer = writer_policy()
+    if writer.pop("mode") == "async":
+        fh.abm_writer = EventWriter(fh, **writer)
+        _ASYNC_LOGS.add(fh)
+        _install_signal_flush()
+    return fh
 
 
-def emit_event(fh, event: Dict[str, Any]) -> None:
+def flush_event_log(fh) -> None:
+    writer = getattr(fh, "abm_writer", None)
+    if writer is not None:
+        writer.flush()
+
+
+def flush_live_aggregates(fh) -> Optional[Dict[str, Any]]:
+    live = getattr(fh, "abm_live", None)
+    if live is None:
+        return None
+    live["pending"] = 0
+    live["flushed_at"] = time.monotonic()
+    return abm_aggregate.write_aggregates(live["path"], live["run_id"], live["aggregator"])
+
+
+def close_event_log(fh) -> None:
+    writer = getattr(fh, "abm_writer", None)
+    if writer is not None:
+        writer.close()
+        _ASYNC_LOGS.discard(fh)
+    flush_live_aggregates(fh)
+    _LIVE_LOGS.discard(fh)
+    fh.close()
+
+
+@atexit.register
+def _flush_open_logs(timeout: Optional[float] = None) -> None:
+    deadline = None if timeout is None else time.monotonic() + timeout
+    undrained = set()
+    for fh in list(_ASYNC_LOGS):
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        if not fh.abm_writer.close(remaining):
+            # Its writer may still be feeding the aggregator; leave both alone.
+            undrained.add(id(fh))
+    for fh in list(_LIVE_LOGS):
+        live = fh.abm_live
+        if live["pending"] and id(fh) not in undrained:
+            flush_live_aggregates(fh)
+
+
+def _prepare(event: Dict[str, Any]) -> Dict[str, Any]:
     payload = dict(event)
     if "meta" not in payload or not isinstance(payload.get("meta"), dict):
         payload["meta"] = {}
@@ -43,8 +304,84 @@ def emit_event(fh, event: Dict[str, Any]) -> None:
             payload["ts"] = ts
         else:
             payload.pop("ts", None)
-    line = json.dumps(payload, sort_keys=True, separators=(",", ":"))
-    fh.write(line + "\n")
-    fh.flush()
+    return payload
+
+
+def _write_payloads(fh, payloads: List[Dict[str, Any]]) -> None:
+    lines = [json.dumps(payload, sort_keys=True, separators=(",", ":")) for payload in payloads]
+    abm_log.append_text(fh, "".join(line + "\n" for line in lines))
+    rotate = getattr(fh, "abm_rotate", None)
+    if rotate is not None:
+        abm_log.rotate_if_needed(fh.name, rotate, os.fstat(fh.fileno()).st_size)
+    live = getattr(fh, "abm_live", None)
+    if live is not None:
+        # Fed the parsed lines so the running totals match a batch recompute.
+        for line in lines:
+            live["aggregator"].add(json.loads(line))
+        live["pending"] += len(lines)
+        policy = live["policy"]
+        elapsed_ms = (time.monotonic() - live["flushed_at"]) * 1000.0
+        if live["pending"] >= policy["every_events"] or elapsed_ms >= policy["every_ms"]:
+            flush_live_aggregates(fh)
     if os.environ.get("ABM_STDOUT_EVENTS") == "1":
-        print(f"ABM_EVENT {line}")
+        for line in lines:
+            print(f"ABM_EVENT {line}")
+
+
+def emit_event(fh, event: Dict[str, Any]) -> None:
+    sampler = getattr(fh, "abm_sampler", None)
+    if sampler is not None:
+        event = sampler.admit(event)
+        if event is None:
+            return
+    payload = _prepare(event)
+    writer = getattr(fh, "abm_writer", None)
+    if writer is not None:
+        writer.put(payload)
+    else:
+        _write_payloads(fh, [payload])
+
+
+def start_span(
+    fh, name: str, parent_id: Optional[str] = None, meta: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Open a span; it nests under the innermost open span on fh unless parent_id is given."""
+    stack = getattr(fh, "abm_spans", None)
+    if stack is None:
+        stack = fh.abm_spans = []
+    if parent_id is None and stack:
+        parent_id = stack[-1]["span_id"]
+    span = {
+        "kind": "span",
+        "name": name,
+        "span_id": uuid.uuid4().hex[:16],
+        "parent_id": parent_id,
+        "start_ns": time.monotonic_ns(),
+        "meta": dict(meta or {}),
+    }
+    stack.append(span)
+    return span
+
+
+def end_span(fh, span: Dict[str, Any], meta: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Close a span and emit it as one event carrying both monotonic timestamps."""
+    end_ns = time.monotonic_ns()
+    stack = getattr(fh, "abm_spans", [])
+    if span in stack:
+        stack.remove(span)
+    event = dict(span, end_ns=end_ns, ms=(end_ns - span["start_ns"]) / 1e6)
+    event["meta"] = dict(span["meta"], **(meta or {}))
+    emit_event(fh, event)
+    return event
+
+
+@contextlib.contextmanager
+def span(fh, name: str, meta: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+    opened = start_span(fh, name, meta=meta)
+    try:
+        yield opened
+    except BaseException as exc:
+        end_span(fh, opened, {"error_class": type(exc).__name__})
+        raise
+    else:
+        end_span(fh, opened)
@@ -0,0 +1,221 @@
+import argparse
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    from util import git_session, json_read, now_iso
+else:
+    from .util import git_session, json_read, now_iso
+
+
+HISTORY_PATH = Path("artifacts/abm/benchmarks/history.sqlite")
+RESULTS_PATH = Path("artifacts/abm/benchmarks/results.json")
+# metric -> (relative threshold, direction). "higher" metrics regress when
+# they drop by more than the threshold, "lower" ones when they grow.
+DEFAULT_THRESHOLDS = {
+    "throughput_to_coordination": (0.10, "higher"),
+    "retry_amplification": (0.10, "lower"),
+    "wall_s": (0.20, "lower"),
+}
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    head TEXT NOT NULL,
+    dispatch_hash TEXT NOT NULL,
+    benchmark_id TEXT NOT NULL,
+    parameters TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    recorded_utc TEXT NOT NULL,
+    repetitions INTEGER NOT NULL,
+    throughput_to_coordination REAL,
+    retry_amplification REAL,
+    wall_s REAL,
+    limit_class TEXT,
+    result TEXT NOT NULL,
+    PRIMARY KEY (head, dispatch_hash, benchmark_id, parameters)
+);
+CREATE INDEX IF NOT EXISTS results_by_head ON results (head, benchmark_id, parameters);
+"""
+
+
+def connect(path=HISTORY_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _canonical(payload):
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"))
+
+
+def resolve_head(rev=None):
+    # Results are filed under the commit of the code being benchmarked, not
+    # the scratch workload repositories the runs happened in.
+    rev = rev or "HEAD"
+    return git_session().rev_parse(f"{rev}^{{commit}}") or rev
+
+
+def result_mode(result):
+    if "simulation" in result:
+        return "simulate"
+    if "workload" in result:
+        return "execute"
+    return "latest"
+
+
+def _wall_s(result):
+    stats = result.get("stats", {}).get("wall_s", {})
+    return stats.get("mean") if stats.get("n") else None
+
+
+def record_results(results, head, path=HISTORY_PATH):
+    recorded = now_iso()
+    conn = connect(path)
+    with conn:
+        for result in results:
+            indicators = result.get("indicators", {})
+            conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    head,
+                    result.get("dispatch_hash") or "",
+                    result.get("benchmark_id") or "",
+                    _canonical(result.get("parameters", {})),
+                    result_mode(result),
+                    recorded,
+                    int(result.get("repetitions", 1)),
+                    indicators.get("throughput_to_coordination"),
+                    indicators.get("retry_amplification"),
+                    _wall_s(result),
+                    result.get("limit"),
+                    _canonical(result),
+                ),
+            )
+    conn.close()
+    return len(results)
+
+
+def load_head(conn, head):
+    rows = conn.execute(
+        "SELECT * FROM results WHERE head = ? ORDER BY recorded_utc", (head,)
+    ).fetchall()
+    # Later recordings of the same benchmark/parameters/mode win.
+    return {(row["benchmark_id"], row["parameters"], row["mode"]): row for row in rows}
+
+
+def compare_rows(baseline, candidate, thresholds):
+    findings = []
+    for metric, (threshold, direction) in sorted(thresholds.items()):
+        base = baseline[metric]
+        cand = candidate[metric]
+        if base is None or cand is None:
+            continue
+        if base:
+            change = (cand - base) / abs(base)
+        else:
+            # No relative scale from a zero baseline; count any move as 100%.
+            change = 0.0 if cand == base else (1.0 if cand > base else -1.0)
+        worse = -change if direction == "higher" else change
+        status = "regression" if worse > threshold else "improved" if worse < -threshold else "ok"
+        findings.append(
+            {
+                "metric": metric,
+                "baseline": base,
+                "candidate": cand,
+                "relative_change": change,
+                "threshold": threshold,
+                "status": status,
+            }
+        )
+    return findings
+
+
+def compare(baseline_head, candidate_head, thresholds=None, path=HISTORY_PATH):
+    thresholds = thresholds or DEFAULT_THRESHOLDS
+    conn = connect(path)
+    baseline = load_head(conn, baseline_head)
+    candidate = load_head(conn, candidate_head)
+    conn.close()
+    report = []
+    for key in sorted(set(baseline) & set(candidate)):
+        benchmark_id, parameters, mode = key
+        report.append(
+            {
+                "benchmark_id": benchmark_id,
+                "parameters": json.loads(parameters),
+                "mode": mode,
+                "findings": compare_rows(baseline[key], candidate[key], thresholds),
+            }
+        )
+    return {
+        "baseline": baseline_head,
+        "candidate": candidate_head,
+        "compared": len(report),
+        "missing_in_candidate": len(set(baseline) - set(candidate)),
+        "regressions": sum(
+            1 for entry in report for f in entry["findings"] if f["status"] == "regression"
+        ),
+        "results": report,
+    }
+
+
+def parse_threshold(text):
+    metric, sep, raw = text.partition("=")
+    if not sep or metric not in DEFAULT_THRESHOLDS:
+        raise argparse.ArgumentTypeError(
+            f"expected <metric>=<fraction>, metric one of {', '.join(sorted(DEFAULT_THRESHOLDS))}"
+        )
+    try:
+        value = float(raw)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid threshold: {raw}") from None
+    if value < 0:
+        raise argparse.ArgumentTypeError("threshold must be >= 0")
+    return metric, value
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", default=str(HISTORY_PATH))
+    sub = parser.add_subparsers(dest="command", required=True)
+    record = sub.add_parser("record", help="File a results.json under a commit.")
+    record.add_argument("--results", default=str(RESULTS_PATH))
+    record.add_argument("--head", default=None, help="Commit to file under (default: HEAD).")
+    sub.add_parser("heads", help="List recorded commits.")
+    cmp_parser = sub.add_parser("compare", help="Flag regressions of a commit against a baseline.")
+    cmp_parser.add_argument("--baseline", required=True)
+    cmp_parser.add_argument("--candidate", default="HEAD")
+    cmp_parser.add_argument("--threshold", action="append", type=parse_threshold, default=[])
+    args = parser.parse_args()
+
+    if args.command == "record":
+        results = json_read(args.results).get("results", [])
+        head = resolve_head(args.head)
+        count = record_results(results, head, args.db)
+        print(f"recorded {count} results for {head}")
+        return 0
+    if args.command == "heads":
+        conn = connect(args.db)
+        rows = conn.execute(
+            "SELECT head, COUNT(*) AS n, MAX(recorded_utc) AS last FROM results GROUP BY head ORDER BY last"
+        ).fetchall()
+        conn.close()
+        for row in rows:
+            print(f"{row['head']} {row['n']} {row['last']}")
+        return 0
+
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    for metric, value in args.threshold:
+        thresholds[metric] = (value, DEFAULT_THRESHOLDS[metric][1])
+    report = compare(resolve_head(args.baseline), resolve_head(args.candidate), thresholds, args.db)
+    print(json.dumps(report, indent=2, sort_keys=True))
+    return 1 if report["regressions"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,186 @@
+import contextlib
+import gzip
+import io
+import json
+import os
+import re
+import shutil
+import sys
+from pathlib import Path
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    from util import hooks_policy
+else:
+    from .util import hooks_policy
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+HOOKS_PATH = Path(".harness/contracts/hooks.json")
+DEFAULT_ROTATE_BYTES = 16 * 1024 * 1024
+CODECS = {"gzip": ".gz", "zstd": ".zst"}
+
+
+def log_policy(hooks_path=HOOKS_PATH):
+    policy = hooks_policy("event_logs", hooks_path)
+    codec = policy.get("codec", "gzip")
+    if codec not in CODECS:
+        raise ValueError(f"policy.event_logs.codec must be one of {', '.join(CODECS)}")
+    if codec == "zstd" and zstandard is None:
+        # zstandard is optional; gzip segments read back the same way.
+        codec = "gzip"
+    return {"rotate_bytes": max(0, int(policy.get("rotate_bytes", DEFAULT_ROTATE_BYTES))), "codec": codec}
+
+
+@contextlib.contextmanager
+def locked(fh, exclusive=True):
+    """flock on an open log: appends and rotation hold it exclusively, readers shared."""
+    if fcntl is None:
+        yield fh
+        return
+    fcntl.flock(fh.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+    try:
+        yield fh
+    finally:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+def append_text(fh, text):
+    """Append under the log lock so a concurrent rotate() never drops the write."""
+    with locked(fh):
+        fh.write(text)
+        fh.flush()
+
+
+def _segments(path):
+    path = Path(path)
+    pattern = re.compile(re.escape(path.name) + r"\.(\d+)\.(gz|zst)$")
+    found = []
+    if path.parent.is_dir():
+        for child in path.parent.iterdir():
+            match = pattern.match(child.name)
+            if match:
+                found.append((int(match.group(1)), child))
+    return sorted(found)
+
+
+def segment_paths(path):
+    """Rotated segments of a log, oldest first: events.jsonl.000001.gz, ..."""
+    return [segment for _, segment in _segments(path)]
+
+
+def exists(path):
+    return Path(path).exists() or bool(_segments(path))
+
+
+def _open_segment(path):
+    if path.suffix == ".gz":
+        return gzip.open(path, "rb")
+    if zstandard is None:
+        raise RuntimeError(f"reading {path} needs the zstandard module")
+    return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+
+
+def _open_segment_writer(path, codec):
+    if codec == "gzip":
+        return gzip.open(path, "wb")
+    return zstandard.ZstdCompressor().stream_writer(open(path, "wb"), closefd=True)
+
+
+def iter_lines(path):
+    """Every line of a log as one stream: rotated segments, then the active file.
+
+    Holds a shared lock on the active file throughout, so a rotation cannot
+    move lines between the segments and the active file mid-read.
+    """
+    path = Path(path)
+    if not path.exists():
+        for segment in segment_paths(path):
+            with io.TextIOWrapper(_open_segment(segment), encoding="utf-8") as fh:
+                yield from fh
+        return
+    with open(path, "r", encoding="utf-8") as active, locked(active, exclusive=False):
+        for segment in segment_paths(path):
+            with io.TextIOWrapper(_open_segment(segment), encoding="utf-8") as fh:
+                yield from fh
+        yield from active
+
+
+def read_events(path):
+    return [json.loads(line) for line in iter_lines(path) if line.strip()]
+
+
+def rotate(path, codec="gzip", min_bytes=0):
+    """Compress the active log into the next segment and truncate it in place.
+
+    Copy and truncate happen under the exclusive log lock that append_text
+    takes, so no append lands in between. Truncating rather than replacing
+    keeps other writers' O_APPEND handles valid. Returns None, rotating
+    nothing, when the file is below min_bytes once the lock is held.
+    """
+    path = Path(path)
+    with open(path, "r+b") as src, locked(src):
+        if os.fstat(src.fileno()).st_size < max(min_bytes, 1):
+            return None
+        found = _segments(path)
+        seq = found[-1][0] + 1 if found else 1
+        target = path.with_name(f"{path.name}.{seq:06d}{CODECS[codec]}")
+        tmp_path = target.with_name(f"{target.name}.tmp")
+        with _open_segment_writer(tmp_path, codec) as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(tmp_path, target)
+        src.truncate(0)
+    return target
+
+
+def rotate_if_needed(path, policy, size=None):
+    path = Path(path)
+    if policy["rotate_bytes"] <= 0:
+        return None
+    if size is None:
+        size = path.stat().st_size if path.exists() else 0
+    if size < policy["rotate_bytes"]:
+        return None
+    return rotate(path, policy["codec"], policy["rotate_bytes"])
+
+
+def _complete_lines(data):
+    end = data.rfind(b"\n") + 1
+    return [line.decode("utf-8") for line in data[:end].splitlines()], end
+
+
+def tail_lines(path, cursor=(0, 0)):
+    """Complete lines appended since cursor; returns (lines, cursor).
+
+    cursor is (segments seen, byte offset in the active file). When the file
+    being tailed has since been rotated, the rest of it is read from the
+    segment it became, then any later segments, then the new active file.
+    """
+    path = Path(path)
+    seen, offset = cursor
+    lines = []
+    with contextlib.ExitStack() as stack:
+        active = None
+        if path.exists():
+            active = stack.enter_context(open(path, "rb"))
+            stack.enter_context(locked(active, exclusive=False))
+        segments = segment_paths(path)
+        for segment in segments[seen:]:
+            with _open_segment(segment) as fh:
+                fh.read(offset)
+                lines.extend(_complete_lines(fh.read())[0])
+            offset = 0
+        if active is not None:
+            active.seek(offset)
+            new_lines, consumed = _complete_lines(active.read())
+            lines.extend(new_lines)
+            offset += consumed
+    return lines, (len(segments), offset)
@@ -0,0 +1,92 @@
+import fnmatch
+import json
+import random
+import time
+from pathlib import Path
+
+SAMPLING_PATH = Path("contracts/abm_sampling.json")
+# Never thinned, whatever the contract says: errors and retries are rare and
+# each one matters.
+ALWAYS_KEPT_KINDS = ("error", "retry")
+
+
+def load_rules(path=SAMPLING_PATH):
+    """Sampling contract, or None when there is no contract or no rules."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    contract = json.loads(path.read_text(encoding="utf-8"))
+    rules = contract.get("rules") or []
+    for rule in rules:
+        if not rule.get("name"):
+            raise ValueError(f"{path}: every sampling rule needs a name pattern")
+        rate = rule.get("sample_rate", 1.0)
+        if not 0 < rate <= 1:
+            raise ValueError(f"{path}: sample_rate for {rule['name']} must be in (0, 1]")
+        limit = rule.get("rate_limit_per_s")
+        if limit is not None and limit <= 0:
+            raise ValueError(f"{path}: rate_limit_per_s for {rule['name']} must be positive")
+    if not rules:
+        return None
+    return {
+        "rules": rules,
+        "never_sample_kinds": sorted(set(contract.get("never_sample_kinds", [])) | set(ALWAYS_KEPT_KINDS)),
+        "seed": contract.get("seed"),
+    }
+
+
+class Sampler:
+    """Thins events by per-name rules; each kept event's meta.weight covers the ones it stands for.
+
+    A rule keeps events with probability sample_rate (weight 1/sample_rate) and
+    then lets at most rate_limit_per_s through, with a one-second burst. Events
+    cut by the limit add their weight to the next event that passes, so summed
+    weights stay an unbiased estimate of the real counts.
+    """
+
+    def __init__(self, contract):
+        self.rules = contract["rules"]
+        self.never = set(contract["never_sample_kinds"])
+        self.rng = random.Random(contract.get("seed"))
+        self.buckets = {}
+        self.carry = {}
+
+    def _rule(self, event):
+        for index, rule in enumerate(self.rules):
+            if rule.get("kind") not in (None, event.get("kind")):
+                continue
+            if fnmatch.fnmatchcase(str(event.get("name", "")), rule["name"]):
+                return index, rule
+        return None, None
+
+    def _within_limit(self, index, limit):
+        now = time.monotonic()
+        tokens, last = self.buckets.get(index, (float(limit), now))
+        tokens = min(float(limit), tokens + (now - last) * limit)
+        if tokens < 1.0:
+            self.buckets[index] = (tokens, now)
+            return False
+        self.buckets[index] = (tokens - 1.0, now)
+        return True
+
+    def admit(self, event):
+        """The event to write, with meta.weight set when it stands for others; None to skip it."""
+        if event.get("kind") in self.never:
+            return event
+        index, rule = self._rule(event)
+        if rule is None:
+            return event
+        rate = rule.get("sample_rate", 1.0)
+        if rate < 1.0 and self.rng.random() >= rate:
+            return None
+        weight = 1.0 / rate
+        limit = rule.get("rate_limit_per_s")
+        if limit is not None and not self._within_limit(index, limit):
+            self.carry[index] = self.carry.get(index, 0.0) + weight
+            return None
+        weight += self.carry.pop(index, 0.0)
+        if weight == 1.0:
+            return event
+        meta = dict(event.get("meta") or {})
+        meta["weight"] = int(weight) if weight == int(weight) else weight
+        return dict(event, meta=meta)
@@ -0,0 +1,212 @@
+import argparse
+import json
+import math
+import sys
+from pathlib import Path
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    from util import json_read, json_write
+else:
+    from .util import json_read, json_write
+
+
+RESULTS_PATH = Path("artifacts/abm/benchmarks/results.json")
+SCALING_PATH = Path("artifacts/abm/benchmarks/scaling.json")
+SCALING_VERSION = "abm.scaling.v1"
+# Parameter treated as the concurrency N of a sweep when the benchmark spec
+# does not name one with "load_parameter".
+LOAD_PARAMETERS = {
+    "work_in_progress": "wip_limit",
+    "dependency_graph_depth": "depth",
+}
+# The knee is where efficiency X(N) / (lambda * N) falls to this fraction.
+KNEE_EFFICIENCY = 0.5
+# Peak concurrency inside the measured range means the sweep already went
+# retrograde; contention alone above this caps speedup below 1/sigma.
+CONTENTION_BOUND_SIGMA = 0.1
+# Below this R^2 the fitted curve does not describe the sweep, so neither its
+# class nor its peak and knee are reported.
+MIN_R_SQUARED = 0.8
+# Fit fields that only mean something when the curve fits.
+DERIVED_FIELDS = ("peak_concurrency", "peak_throughput", "asymptotic_throughput", "knee_concurrency")
+
+
+def _solve(matrix, vector):
+    """Gaussian elimination with partial pivoting; None when singular."""
+    n = len(vector)
+    rows = [list(matrix[i]) + [vector[i]] for i in range(n)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(rows[r][col]))
+        if abs(rows[pivot][col]) < 1e-12:
+            return None
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        for r in range(col + 1, n):
+            factor = rows[r][col] / rows[col][col]
+            for c in range(col, n + 1):
+                rows[r][c] -= factor * rows[col][c]
+    solution = [0.0] * n
+    for r in range(n - 1, -1, -1):
+        solution[r] = (rows[r][n] - sum(rows[r][c] * solution[c] for c in range(r + 1, n))) / rows[r][r]
+    return solution
+
+
+def _polyfit(xs, ys, degree):
+    size = degree + 1
+    matrix = [[sum(x ** (i + j) for x in xs) for j in range(size)] for i in range(size)]
+    vector = [sum(y * x ** i for x, y in zip(xs, ys)) for i in range(size)]
+    return _solve(matrix, vector)
+
+
+def usl_throughput(n, lam, sigma, kappa):
+    return lam * n / (1.0 + sigma * (n - 1.0) + kappa * n * (n - 1.0))
+
+
+def _r_squared(points, lam, sigma, kappa):
+    ys = [x for _, x in points]
+    avg = sum(ys) / len(ys)
+    total = sum((y - avg) ** 2 for y in ys)
+    residual = sum((x - usl_throughput(n, lam, sigma, kappa)) ** 2 for n, x in points)
+    return 1.0 - residual / total if total else 1.0
+
+
+def fit_usl(points):
+    """Fit X(N) = lambda*N / (1 + sigma*(N-1) + kappa*N*(N-1)).
+
+    N/X is a quadratic a + b*N + c*N^2 in N with lambda = 1/(a+b+c),
+    sigma = (b+c)*lambda and kappa = c*lambda, so the fit is linear least
+    squares. A negative kappa falls back to Amdahl (kappa = 0), a negative
+    sigma to linear scaling.
+    """
+    points = sorted((float(n), float(x)) for n, x in points if n > 0 and x > 0)
+    if len({n for n, _ in points}) < 2:
+        return None
+    ns = [n for n, _ in points]
+    ys = [n / x for n, x in points]
+    model, sigma, kappa, lam = None, 0.0, 0.0, None
+    if len(set(ns)) >= 3:
+        coeffs = _polyfit(ns, ys, 2)
+        if coeffs and sum(coeffs) > 0:
+            a, b, c = coeffs
+            lam = 1.0 / (a + b + c)
+            sigma, kappa = (b + c) * lam, c * lam
+            model = "usl"
+    if model is None or kappa < 0 or sigma < 0:
+        coeffs = _polyfit(ns, ys, 1)
+        model, kappa = "amdahl", 0.0
+        if coeffs and sum(coeffs) > 0:
+            a, b = coeffs
+            lam = 1.0 / (a + b)
+            sigma = b * lam
+        if lam is None or sigma < 0:
+            model, sigma = "linear", 0.0
+            lam = sum(x / n for n, x in points) / len(points)
+
+    peak_n = math.sqrt((1.0 - sigma) / kappa) if kappa > 0 and sigma < 1 else None
+    knee_n = None
+    # Efficiency hits KNEE_EFFICIENCY where sigma*(N-1) + kappa*N*(N-1) = 1/e - 1.
+    excess = 1.0 / KNEE_EFFICIENCY - 1.0
+    if kappa > 0:
+        b = sigma - kappa
+        knee_n = (-b + math.sqrt(b * b + 4.0 * kappa * (excess + sigma))) / (2.0 * kappa)
+    elif sigma > 0:
+        knee_n = 1.0 + excess / sigma
+    return {
+        "model": model,
+        "lambda": lam,
+        "sigma": sigma,
+        "kappa": kappa,
+        "r_squared": _r_squared(points, lam, sigma, kappa),
+        "peak_concurrency": peak_n,
+        "peak_throughput": usl_throughput(peak_n, lam, sigma, kappa) if peak_n else None,
+        "asymptotic_throughput": lam / sigma if model == "amdahl" and sigma > 0 else None,
+        "knee_concurrency": knee_n,
+        "points": [{"n": n, "throughput": x} for n, x in points],
+    }
+
+
+def classify_scaling(fit):
+    if fit is None:
+        return "insufficient_data"
+    if fit["r_squared"] < MIN_R_SQUARED:
+        return "poor_fit"
+    measured_max = max(p["n"] for p in fit["points"])
+    if fit["peak_concurrency"] is not None and fit["peak_concurrency"] <= measured_max:
+        return "coherency_bound"
+    if fit["sigma"] >= CONTENTION_BOUND_SIGMA:
+        return "contention_bound"
+    return "scalable"
+
+
+def sample_throughput(sample):
+    # Done work orders per second: simulated makespan for --simulate runs,
+    # wall time for everything else.
+    done = sample.get("indicators", {}).get("done_transitions", 0)
+    duration = sample.get("simulation", {}).get("makespan_s") or sample.get("wall_s")
+    return done / duration if duration else 0.0
+
+
+def result_throughput(result):
+    samples = result.get("samples") or [result]
+    values = [sample_throughput(s) for s in samples]
+    return sum(values) / len(values) if values else 0.0
+
+
+def load_parameter(result, specs):
+    spec = specs.get(result.get("benchmark_id"), {})
+    return spec.get("load_parameter") or LOAD_PARAMETERS.get(result.get("stress_axis"))
+
+
+def analyze(results, specs=None):
+    """Fit one curve per benchmark and per combination of the other parameters."""
+    specs = specs or {}
+    series = {}
+    skipped = []
+    for result in results:
+        load = load_parameter(result, specs)
+        params = result.get("parameters", {})
+        if not load or not isinstance(params.get(load), (int, float)):
+            skipped.append(result.get("benchmark_id"))
+            continue
+        fixed = {k: v for k, v in sorted(params.items()) if k != load}
+        key = (result.get("benchmark_id"), load, json.dumps(fixed, sort_keys=True))
+        series.setdefault(key, {"stress_axis": result.get("stress_axis"), "fixed": fixed, "points": []})
+        series[key]["points"].append((params[load], result_throughput(result)))
+
+    fits = []
+    for (benchmark_id, load, _), entry in sorted(series.items()):
+        fit = fit_usl(entry["points"])
+        scaling = classify_scaling(fit)
+        if scaling == "poor_fit":
+            fit = dict(fit, **{field: None for field in DERIVED_FIELDS})
+        fits.append(
+            {
+                "benchmark_id": benchmark_id,
+                "stress_axis": entry["stress_axis"],
+                "load_parameter": load,
+                "parameters": entry["fixed"],
+                "scaling": scaling,
+                "fit": fit,
+            }
+        )
+    return {"version": SCALING_VERSION, "fits": fits, "skipped": sorted(set(skipped))}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--results", default=str(RESULTS_PATH))
+    parser.add_argument("--benchmarks", default="benchmarks")
+    parser.add_argument("--output", default=str(SCALING_PATH))
+    args = parser.parse_args()
+    specs = {}
+    for path in sorted(Path(args.benchmarks).glob("*.json")):
+        spec = json_read(path)
+        specs[spec.get("benchmark_id")] = spec
+    report = analyze(json_read(args.results).get("results", []), specs)
+    json_write(Path(args.output), report)
+    print(str(args.output))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,344 @@
+import argparse
+import json
+import random
+import shutil
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    import abm as abm_mod
+    import abm_aggregate
+    import abm_history
+    import abm_sim
+    import abm_stats
+    import abm_workload
+    import receipt as receipt_mod
+    import verify
+    from util import json_read, json_write
+else:
+    from . import abm as abm_mod
+    from . import abm_aggregate
+    from . import abm_history
+    from . import abm_sim
+    from . import abm_stats
+    from . import abm_workload
+    from . import receipt as receipt_mod
+    from . import verify
+    from .util import json_read, json_write
+
+
+SELFBENCH_PATH = Path("artifacts/abm/benchmarks/selfbench.json")
+FIXTURES_DIR = Path("artifacts/abm/benchmarks/selfbench")
+FIXTURE_VERSION = "abm.selfbench.v1"
+# case -> (fixture kind, sizes). Sizes count events, receipts or work orders
+# depending on the fixture.
+CASES = {
+    "compute_aggregates": ("events", [10**3, 10**4, 10**5, 10**6]),
+    "check_abm": ("events", [10**3, 10**4, 10**5, 10**6]),
+    "aggregate_events": ("agent_events", [10**3, 10**4, 10**5, 10**6]),
+    "check_receipts": ("receipts", [10**2, 10**3, 10**4, 10**5]),
+    "check_scope": ("dispatch", [10**2, 10**3, 10**4]),
+    "write_receipt": ("dispatch", [10**2, 10**3, 10**4]),
+}
+DEFAULT_WARMUP = 1
+DEFAULT_REPEAT = 5
+FIXTURE_WORK_ORDERS = 100
+# Work orders per simulated run when building event histories.
+EVENTS_RUN_WORK_ORDERS = 1000
+SCOPE_CHANGED_FILES = 100
+RECEIPT_WRITES = 20
+RECEIPT_EPOCH = datetime(2000, 1, 1, tzinfo=timezone.utc)
+AGENT_EVENT_NAMES = ["plan", "edit", "test", "review", "commit"]
+AGENT_ERROR_CLASSES = ["timeout", "tool_error", "rate_limit"]
+THRESHOLDS = {
+    "throughput_per_s": (0.20, "higher"),
+    "peak_rss_kb": (0.20, "lower"),
+}
+
+
+def peak_rss_kb():
+    # VmHWM belongs to this process image; Linux's ru_maxrss also carries the
+    # parent's peak across fork/exec.
+    try:
+        with open("/proc/self/status", encoding="utf-8") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _write_lines(path, rows):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        for row in rows:
+            fh.write(json.dumps(row, sort_keys=True, separators=(",", ":")) + "\n")
+
+
+def history_events(size, seed):
+    """Events of consecutive simulated runs, cut at exactly `size`."""
+    emitted = 0
+    run = 0
+    while emitted < size:
+        sim = abm_sim.simulate(
+            {"work_order_count": EVENTS_RUN_WORK_ORDERS, "retry_rate": 0.1},
+            seed=abm_sim.derive_seed(seed, "events", run),
+        )
+        for event in sim["events"][: size - emitted]:
+            yield event
+        emitted += min(len(sim["events"]), size - emitted)
+        run += 1
+
+
+def agent_events(size, seed):
+    rng = random.Random(seed)
+    for idx in range(size):
+        roll = rng.random()
+        kind = "error" if roll < 0.02 else "retry" if roll < 0.05 else "step"
+        meta = {
+            "tokens_in": rng.randrange(2000),
+            "tokens_out": rng.randrange(500),
+            "cost_estimate_usd": round(rng.random() / 100.0, 6),
+        }
+        if kind != "step":
+            meta["error_class"] = rng.choice(AGENT_ERROR_CLASSES)
+        yield {
+            "kind": kind,
+            "name": rng.choice(AGENT_EVENT_NAMES),
+            "ms": round(rng.lognormvariate(5.0, 1.0), 3),
+            "ts": (RECEIPT_EPOCH + timedelta(milliseconds=idx)).isoformat(),
+            "meta": meta,
+        }
+
+
+def build_events_fixture(root, size, seed):
+    abm_workload.build_workload(root, {"work_order_count": FIXTURE_WORK_ORDERS}, seed=seed)
+    events_path = root / abm_mod.EVENTS_PATH
+    _write_lines(events_path, history_events(size, seed))
+    events = abm_mod.load_events_from_path(events_path)
+    json_write(root / abm_mod.AGGREGATES_PATH, abm_mod.compute_aggregates(events))
+
+
+def build_agent_events_fixture(root, size, seed):
+    root.mkdir(parents=True, exist_ok=True)
+    _write_lines(root / "events.jsonl", agent_events(size, seed))
+
+
+def build_receipts_fixture(root, size, seed):
+    abm_workload.build_workload(root, {"work_order_count": FIXTURE_WORK_ORDERS}, seed=seed)
+    dispatch_path = root / ".harness/contracts/dispatch.json"
+    dispatch_bytes = receipt_mod.canonical_dispatch_bytes(dispatch_path)
+    dispatch_hash = receipt_mod.sha256_hex(dispatch_bytes)
+    snapshot = root / receipt_mod.RECEIPTS_DIR / "_dispatch" / f"{dispatch_hash}.json"
+    snapshot.parent.mkdir(parents=True)
+    snapshot.write_bytes(dispatch_bytes)
+    wo_ids = [wo["id"] for wo in json_read(dispatch_path)["work_orders"]]
+    for idx in range(size):
+        payload = {
+            "run_id": f"selfbench-{seed}",
+            "kind": "PROMOTE",
+            "timestamp_utc": (RECEIPT_EPOCH + timedelta(seconds=idx)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "head": "0" * 40,
+            "dispatch_hash": dispatch_hash,
+            "work_order_id": wo_ids[idx % len(wo_ids)],
+        }
+        path = root / receipt_mod.RECEIPTS_DIR / payload["work_order_id"] / receipt_mod.receipt_filename(payload)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(receipt_mod.canonical_json_bytes(payload))
+
+
+def build_dispatch_fixture(root, size, seed):
+    abm_workload.build_workload(root, {"work_order_count": size}, seed=seed)
+    dispatch_path = root / ".harness/contracts/dispatch.json"
+    dispatch = json_read(dispatch_path)
+    dispatch["work_orders"][0]["ready"] = True
+    json_write(dispatch_path, dispatch)
+    subprocess.run(["git", "commit", "-q", "-am", "ready"], cwd=root, check=True, capture_output=True)
+    # Uncommitted work for check_scope to classify.
+    for idx in range(SCOPE_CHANGED_FILES):
+        path = root / "work" / f"file-{idx:04d}.txt"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"{idx}\n", encoding="utf-8")
+
+
+FIXTURE_BUILDERS = {
+    "events": build_events_fixture,
+    "agent_events": build_agent_events_fixture,
+    "receipts": build_receipts_fixture,
+    "dispatch": build_dispatch_fixture,
+}
+
+
+def ensure_fixture(kind, size, seed, fixtures_dir=FIXTURES_DIR):
+    """Build a seeded fixture once and reuse it until FIXTURE_VERSION changes."""
+    root = Path(fixtures_dir).resolve() / f"{kind}-{size}-{seed}"
+    marker = root / "fixture.json"
+    expected = {"version": FIXTURE_VERSION, "kind": kind, "size": size, "seed": seed}
+    if marker.exists() and json_read(marker) == expected:
+        return root
+    if root.exists():
+        shutil.rmtree(root)
+    FIXTURE_BUILDERS[kind](root, size, seed)
+    json_write(marker, expected)
+    return root
+
+
+def prepare_case(case):
+    """Untimed setup for one case; returns (operation, items per operation)."""
+    if case == "compute_aggregates":
+        events = abm_mod.load_events()
+        return (lambda: abm_mod.compute_aggregates(events)), len(events)
+    if case == "aggregate_events":
+        events = abm_aggregate.load_events(Path("events.jsonl"))
+        return (lambda: abm_aggregate.aggregate_events(events)), len(events)
+    if case == "check_abm":
+        return verify.check_abm, sum(1 for _ in open(abm_mod.EVENTS_PATH, encoding="utf-8"))
+    if case == "check_receipts":
+        return verify.check_receipts, sum(1 for p in receipt_mod.RECEIPTS_DIR.rglob("*.json") if p.parent.name != "_dispatch")
+    dispatch = verify.load_dispatch()
+    if case == "check_scope":
+        return verify.check_scope, len(dispatch["work_orders"])
+    wo_id = dispatch["work_orders"][0]["id"]
+    counter = iter(range(10**9))
+
+    def write_batch():
+        for _ in range(RECEIPT_WRITES):
+            receipt_mod.write_receipt("PROMOTE", f"selfbench-{next(counter)}", "0" * 40, None, wo_id)
+
+    return write_batch, RECEIPT_WRITES
+
+
+def run_case(case, warmup, repeat):
+    """Time one case in the current directory; called in a fresh subprocess."""
+    rss_start = peak_rss_kb()
+    operation, items = prepare_case(case)
+    rss_ready = peak_rss_kb()
+    samples = []
+    try:
+        for rep in range(warmup + repeat):
+            started = time.perf_counter()
+            operation()
+            elapsed = time.perf_counter() - started
+            if rep >= warmup:
+                samples.append(elapsed)
+    finally:
+        if case == "write_receipt":
+            shutil.rmtree(receipt_mod.RECEIPTS_DIR, ignore_errors=True)
+    return {
+        "items": items,
+        "samples_s": samples,
+        "rss_start_kb": rss_start,
+        "rss_ready_kb": rss_ready,
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+
+def measure_case(case, size, seed, warmup, repeat, fixtures_dir=FIXTURES_DIR):
+    kind = CASES[case][0]
+    root = ensure_fixture(kind, size, seed, fixtures_dir)
+    result = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), "case", case, "--warmup", str(warmup), "--repeat", str(repeat)],
+        cwd=root,
+        text=True,
+        capture_output=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"selfbench case {case} failed: {result.stderr.strip()}")
+    measured = json.loads(result.stdout.strip().splitlines()[-1])
+    stats = abm_stats.summarize(measured["samples_s"], seed=abm_sim.derive_seed(seed, case, size))
+    return {
+        "case": case,
+        "fixture": kind,
+        "size": size,
+        "items": measured["items"],
+        "stats": stats,
+        "throughput_per_s": measured["items"] / stats["mean"] if stats["mean"] else None,
+        "rss_start_kb": measured["rss_start_kb"],
+        "rss_ready_kb": measured["rss_ready_kb"],
+        "peak_rss_kb": measured["peak_rss_kb"],
+        "samples_s": measured["samples_s"],
+    }
+
+
+def compare_reports(baseline, candidate, thresholds=None):
+    thresholds = thresholds or THRESHOLDS
+    base = {(r["case"], r["size"]): r for r in baseline.get("cases", [])}
+    report = []
+    for result in candidate.get("cases", []):
+        key = (result["case"], result["size"])
+        if key not in base:
+            continue
+        findings = abm_history.compare_rows(base[key], result, thresholds)
+        report.append({"case": result["case"], "size": result["size"], "findings": findings})
+    regressions = sum(1 for entry in report for f in entry["findings"] if f["status"] == "regression")
+    return {"compared": len(report), "regressions": regressions, "results": report}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run", help="Time the harness hot paths against seeded fixtures.")
+    run.add_argument("--case", action="append", choices=sorted(CASES), default=[])
+    run.add_argument("--max-size", type=int, default=None, help="Skip fixture sizes above this.")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--warmup", type=int, default=DEFAULT_WARMUP)
+    run.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    run.add_argument("--fixtures", default=str(FIXTURES_DIR))
+    run.add_argument("--output", default=str(SELFBENCH_PATH))
+    run.add_argument(
+        "--baseline",
+        default=None,
+        help="Earlier selfbench.json; exit 1 when throughput or peak RSS regress by more than 20%%.",
+    )
+    case = sub.add_parser("case", help="Time one case in the current directory (internal).")
+    case.add_argument("case", choices=sorted(CASES))
+    case.add_argument("--warmup", type=int, default=DEFAULT_WARMUP)
+    case.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    args = parser.parse_args()
+    if args.repeat < 1 or args.warmup < 0:
+        parser.error("--repeat must be >= 1 and --warmup >= 0")
+
+    if args.command == "case":
+        print(json.dumps(run_case(args.case, args.warmup, args.repeat), sort_keys=True))
+        return 0
+
+    results = []
+    for name in args.case or sorted(CASES):
+        for size in CASES[name][1]:
+            if args.max_size is not None and size > args.max_size:
+                continue
+            results.append(measure_case(name, size, args.seed, args.warmup, args.repeat, args.fixtures))
+            print(f"{name} size={size} mean_s={results[-1]['stats']['mean']:.6f}", file=sys.stderr)
+    report = {
+        "version": FIXTURE_VERSION,
+        "head": abm_history.resolve_head(),
+        "seed": args.seed,
+        "warmup": args.warmup,
+        "repeat": args.repeat,
+        "cases": results,
+    }
+    if args.baseline:
+        report["comparison"] = compare_reports(json_read(args.baseline), report)
+    json_write(Path(args.output), report)
+    print(str(args.output))
+    if report.get("comparison", {}).get("regressions"):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
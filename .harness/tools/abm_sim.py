@@ -0,0 +1,267 @@
+import argparse
+import hashlib
+import heapq
+import json
+import math
+import random
+import sys
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    import abm as abm_mod
+else:
+    from . import abm as abm_mod
+
+
+SIM_EPOCH = datetime(2000, 1, 1, tzinfo=timezone.utc)
+SIM_HEAD = "0" * 40
+AGENT_ID = "sim"
+DEFAULT_WORK_ORDER_COUNT = 20
+# Durations are simulated seconds. attempt_s is the mean of a lognormal
+# attempt duration; bookkeeping_s is the Mayor's per-cycle overhead.
+DEFAULTS = {
+    "depth": 1,
+    "fanout": 1,
+    "work_order_count": None,
+    "wip_limit": 1,
+    "max_attempts": 3,
+    "max_cycles": abm_mod.MAX_CYCLES_WITHOUT_COMPLETE,
+    "retry_rate": 0.0,
+    "verification_fail_rate": 0.0,
+    "attempt_s": 60.0,
+    "attempt_sigma": 0.5,
+    "verify_s": 5.0,
+    "bookkeeping_s": 2.0,
+    "backoff_s": 1.0,
+}
+
+
+def sim_config(parameters):
+    config = dict(DEFAULTS)
+    for key, value in parameters.items():
+        if key in config:
+            config[key] = value
+    if not {"depth", "fanout", "work_order_count"} & set(parameters):
+        config["work_order_count"] = DEFAULT_WORK_ORDER_COUNT
+    return config
+
+
+def derive_seed(seed, *parts):
+    data = json.dumps([seed, *parts], sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return int(hashlib.sha256(data).hexdigest()[:16], 16)
+
+
+def generate_dag(config, rng):
+    depth = max(1, int(config["depth"]))
+    fanout = max(1, int(config["fanout"]))
+    count = config["work_order_count"]
+    layers = []
+    if count:
+        # Fixed-size workload: spread work orders round-robin over depth layers,
+        # each depending on one random work order of the layer above.
+        for idx in range(int(count)):
+            layer = idx % depth
+            if layer == len(layers):
+                layers.append([])
+            layers[layer].append(idx)
+        parents = {}
+        for layer in range(1, len(layers)):
+            for idx in layers[layer]:
+                parents[idx] = rng.choice(layers[layer - 1])
+        total = int(count)
+    else:
+        # Tree: one root, every work order fans out to `fanout` dependents.
+        parents = {}
+        total = 1
+        previous = [0]
+        for _ in range(1, depth):
+            current = []
+            for parent in previous:
+                for _ in range(fanout):
+                    parents[total] = parent
+                    current.append(total)
+                    total += 1
+            previous = current
+    return [
+        {
+            "id": f"WO-{idx + 1:04d}",
+            "depends_on": [f"WO-{parents[idx] + 1:04d}"] if idx in parents else [],
+        }
+        for idx in range(total)
+    ]
+
+
+def _timestamp(t):
+    return (SIM_EPOCH + timedelta(seconds=t)).isoformat()
+
+
+def simulate(parameters, seed=0, run_id=None):
+    rng = random.Random(seed)
+    config = sim_config(parameters)
+    dag = generate_dag(config, rng)
+    dispatch_hash = hashlib.sha256(
+        json.dumps({"work_orders": dag}, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    ).hexdigest()
+    run_id = run_id or f"sim-{seed:016x}"
+    max_attempts = max(1, int(config["max_attempts"]))
+    max_cycles = max(1, int(config["max_cycles"]))
+    wip_limit = max(1, int(config["wip_limit"]))
+    sigma = float(config["attempt_sigma"])
+    mu = math.log(float(config["attempt_s"])) - sigma * sigma / 2 if config["attempt_s"] > 0 else None
+    half_overhead = float(config["bookkeeping_s"]) / 2
+    events = []
+    counters = {"seq": 0, "cycle": 0}
+
+    def emit(t, event_type, wo_id, cycle_id, detail=None):
+        event = abm_mod.build_event(event_type, run_id, dispatch_hash, SIM_HEAD, wo_id, cycle_id, AGENT_ID, detail)
+        event["timestamp_utc"] = _timestamp(t)
+        events.append((t, counters["seq"], event))
+        counters["seq"] += 1
+
+    def run_cycle(wo_id, start):
+        counters["cycle"] += 1
+        cycle_id = f"cycle-{counters['cycle']:04d}"
+        phases = {"acceptance": 0.0, "verify": 0.0, "backoff": 0.0, "bookkeeping": 2 * half_overhead}
+        emit(start, "cycle_start", wo_id, cycle_id)
+        t = start + half_overhead
+        passed = False
+        for attempt in range(1, max_attempts + 1):
+            attempt_id = f"attempt-{attempt}"
+            emit(t, "attempt_start", wo_id, cycle_id, {"attempt_id": attempt_id})
+            emit(t, "verify_start", wo_id, cycle_id)
+            work = rng.lognormvariate(mu, sigma) if mu is not None else 0.0
+            phases["acceptance"] += work
+            phases["verify"] += config["verify_s"]
+            t += work + config["verify_s"]
+            failed_run = rng.random() < config["retry_rate"]
+            failed_verify = not failed_run and rng.random() < config["verification_fail_rate"]
+            passed = not (failed_run or failed_verify)
+            status = "pass" if passed else "fail"
+            emit(t, "verify_result", wo_id, cycle_id, {"status": status})
+            detail = {"attempt_id": attempt_id, "status": status}
+            if not passed and attempt < max_attempts:
+                detail["retry_in_s"] = config["backoff_s"] * 2 ** (attempt - 1)
+            emit(t, "attempt_end", wo_id, cycle_id, detail)
+            if "retry_in_s" not in detail:
+                break
+            phases["backoff"] += detail["retry_in_s"]
+            t += detail["retry_in_s"]
+        if passed:
+            emit(t, "state_transition", wo_id, cycle_id, {"to_state": "done"})
+        t += half_overhead
+        emit(
+            t,
+            "cycle_end",
+            wo_id,
+            cycle_id,
+            {
+                "status": "pass" if passed else "fail",
+                "phase_ns": {name: int(value * 1e9) for name, value in sorted(phases.items())},
+                "cycle_ns": int((t - start) * 1e9),
+            },
+        )
+        return t, passed
+
+    waiting = {wo["id"]: set(wo["depends_on"]) for wo in dag}
+    dependents = {wo["id"]: [] for wo in dag}
+    for wo in dag:
+        for dep in wo["depends_on"]:
+            dependents[dep].append(wo["id"])
+    ready = deque()
+    for wo in dag:
+        if not waiting[wo["id"]]:
+            emit(0.0, "state_transition", wo["id"], None, {"to_state": "ready"})
+            ready.append(wo["id"])
+    cycles = {wo["id"]: 0 for wo in dag}
+    done, failed = set(), set()
+    running = []
+    now = 0.0
+    free = wip_limit
+    while True:
+        while free and ready:
+            wo_id = ready.popleft()
+            end, passed = run_cycle(wo_id, now)
+            heapq.heappush(running, (end, counters["seq"], wo_id, passed))
+            free -= 1
+        if not running:
+            break
+        now, _, wo_id, passed = heapq.heappop(running)
+        free += 1
+        cycles[wo_id] += 1
+        if passed:
+            done.add(wo_id)
+            for child in dependents[wo_id]:
+                waiting[child].discard(wo_id)
+                if not waiting[child]:
+                    emit(now, "state_transition", child, None, {"to_state": "ready"})
+                    ready.append(child)
+        elif cycles[wo_id] < max_cycles:
+            ready.append(wo_id)
+        else:
+            failed.add(wo_id)
+
+    events.sort(key=lambda item: (item[0], item[1]))
+    summary = {
+        "work_orders": len(dag),
+        "done": len(done),
+        "failed": len(failed),
+        "blocked": len(dag) - len(done) - len(failed),
+        "cycles": counters["cycle"],
+        "makespan_s": round(now, 6),
+        "status": "RUN_DONE" if len(done) == len(dag) else "RUN_FAIL",
+    }
+    return {
+        "run_id": run_id,
+        "dispatch_hash": dispatch_hash,
+        "head": SIM_HEAD,
+        "seed": seed,
+        "config": config,
+        "summary": summary,
+        "events": [event for _, _, event in events],
+    }
+
+
+def parse_param(text):
+    key, sep, raw = text.partition("=")
+    if not sep or not key:
+        raise argparse.ArgumentTypeError(f"expected key=value: {text}")
+    try:
+        return key, json.loads(raw)
+    except json.JSONDecodeError:
+        return key, raw
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--param", action="append", type=parse_param, default=[])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Write simulated events as JSONL.")
+    args = parser.parse_args()
+
+    result = simulate(dict(args.param), seed=args.seed)
+    if args.output:
+        path = Path(args.output)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as fh:
+            for event in result["events"]:
+                fh.write(json.dumps(event, sort_keys=True, separators=(",", ":")) + "\n")
+    aggregates = abm_mod.compute_aggregates(result["events"])
+    indicators = abm_mod.compute_scaling_indicators(aggregates)
+    print(
+        json.dumps(
+            {
+                "run_id": result["run_id"],
+                "summary": result["summary"],
+                "limits": abm_mod.classify_limits(indicators).get(result["run_id"], {}),
+            },
+            sort_keys=True,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
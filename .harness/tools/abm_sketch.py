@@ -0,0 +1,118 @@
+import math
+
+SKETCH_VERSION = "abm.sketch.v1"
+# Every quantile estimate is within this fraction of the true value.
+DEFAULT_RELATIVE_ACCURACY = 0.01
+# Past this many buckets the lowest ones are folded together, so accuracy is
+# only given up on the fastest values.
+DEFAULT_MAX_BINS = 2048
+# Values at or below this land in the zero bucket (log buckets need x > 0).
+MIN_VALUE = 1e-9
+
+
+def new_sketch(relative_accuracy=DEFAULT_RELATIVE_ACCURACY, max_bins=DEFAULT_MAX_BINS):
+    """Log-bucketed quantile sketch: bucket i holds values in (gamma^(i-1), gamma^i]."""
+    if not 0 < relative_accuracy < 1:
+        raise ValueError("relative_accuracy must be in (0, 1)")
+    return {
+        "version": SKETCH_VERSION,
+        "relative_accuracy": float(relative_accuracy),
+        "max_bins": int(max_bins),
+        "count": 0,
+        "sum": 0.0,
+        "min": None,
+        "max": None,
+        "zero_count": 0,
+        "bins": {},
+    }
+
+
+def _gamma(sketch):
+    alpha = sketch["relative_accuracy"]
+    return (1 + alpha) / (1 - alpha)
+
+
+def _collapse(sketch):
+    bins = sketch["bins"]
+    excess = len(bins) - sketch["max_bins"]
+    if excess <= 0:
+        return
+    ordered = sorted(bins)
+    folded = sum(bins.pop(idx) for idx in ordered[: excess + 1])
+    bins[ordered[excess]] = folded
+
+
+def add(sketch, value, count=1):
+    value = float(value)
+    sketch["count"] += count
+    sketch["sum"] += value * count
+    sketch["min"] = value if sketch["min"] is None else min(sketch["min"], value)
+    sketch["max"] = value if sketch["max"] is None else max(sketch["max"], value)
+    if value <= MIN_VALUE:
+        sketch["zero_count"] += count
+        return
+    idx = math.ceil(math.log(value) / math.log(_gamma(sketch)))
+    bins = sketch["bins"]
+    bins[idx] = bins.get(idx, 0) + count
+    if len(bins) > sketch["max_bins"]:
+        _collapse(sketch)
+
+
+def merge(target, other):
+    """Fold `other` into `target` in place; both must share relative_accuracy."""
+    if other["count"] == 0:
+        return target
+    if target["relative_accuracy"] != other["relative_accuracy"]:
+        raise ValueError("cannot merge sketches with different relative_accuracy")
+    target["count"] += other["count"]
+    target["sum"] += other["sum"]
+    for key, pick in (("min", min), ("max", max)):
+        target[key] = other[key] if target[key] is None else pick(target[key], other[key])
+    target["zero_count"] += other["zero_count"]
+    for idx, count in other["bins"].items():
+        target["bins"][idx] = target["bins"].get(idx, 0) + count
+    _collapse(target)
+    return target
+
+
+def quantile(sketch, q):
+    """Estimate the q-quantile (0 <= q <= 1), clamped to the exact min and max."""
+    if not sketch["count"]:
+        return 0.0
+    rank = q * (sketch["count"] - 1)
+    seen = sketch["zero_count"]
+    if rank < seen:
+        return sketch["min"]
+    gamma = _gamma(sketch)
+    estimate = sketch["max"]
+    for idx in sorted(sketch["bins"]):
+        seen += sketch["bins"][idx]
+        if seen > rank:
+            # Midpoint in relative terms, so the error is at most alpha either way.
+            estimate = 2.0 * gamma ** idx / (gamma + 1.0)
+            break
+    return min(max(estimate, sketch["min"]), sketch["max"])
+
+
+def to_json(sketch):
+    """Compact state: buckets as a dense run of counts from the lowest index."""
+    state = {k: v for k, v in sketch.items() if k != "bins"}
+    if sketch["bins"]:
+        low = min(sketch["bins"])
+        high = max(sketch["bins"])
+        state["bins"] = {
+            "offset": low,
+            "counts": [sketch["bins"].get(idx, 0) for idx in range(low, high + 1)],
+        }
+    else:
+        state["bins"] = {"offset": 0, "counts": []}
+    return state
+
+
+def from_json(state):
+    sketch = new_sketch(state["relative_accuracy"], state.get("max_bins", DEFAULT_MAX_BINS))
+    for key in ("count", "sum", "min", "max", "zero_count"):
+        sketch[key] = state[key]
+    offset = state["bins"]["offset"]
+    sketch["bins"] = {offset + i: c for i, c in enumerate(state["bins"]["counts"]) if c}
+    return sketch
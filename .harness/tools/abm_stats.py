@@ -0,0 +1,80 @@
+import math
+import random
+
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_RESAMPLES = 1000
+OUTLIER_IQR_FACTOR = 1.5
+# Quartiles of fewer samples are too coarse to call anything an outlier.
+MIN_OUTLIER_SAMPLES = 4
+
+
+def mean(values):
+    return sum(values) / len(values) if values else 0.0
+
+
+def stddev(values):
+    if len(values) < 2:
+        return 0.0
+    avg = mean(values)
+    return math.sqrt(sum((v - avg) ** 2 for v in values) / (len(values) - 1))
+
+
+def percentile(values, q):
+    """Linear-interpolated percentile, q in [0, 100]."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q / 100.0
+    low = math.floor(pos)
+    high = math.ceil(pos)
+    if low == high:
+        return ordered[low]
+    return ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
+
+
+def bootstrap_ci(values, confidence=DEFAULT_CONFIDENCE, resamples=DEFAULT_RESAMPLES, seed=0):
+    if len(values) < 2:
+        value = values[0] if values else 0.0
+        return value, value
+    rng = random.Random(seed)
+    n = len(values)
+    means = [mean([values[rng.randrange(n)] for _ in range(n)]) for _ in range(resamples)]
+    tail = (1.0 - confidence) * 50.0
+    return percentile(means, tail), percentile(means, 100.0 - tail)
+
+
+def outlier_indices(values, factor=OUTLIER_IQR_FACTOR):
+    if len(values) < MIN_OUTLIER_SAMPLES:
+        return []
+    q1 = percentile(values, 25)
+    q3 = percentile(values, 75)
+    spread = (q3 - q1) * factor
+    return [idx for idx, v in enumerate(values) if v < q1 - spread or v > q3 + spread]
+
+
+def summarize(values, seed=0):
+    values = [float(v) for v in values]
+    ci_low, ci_high = bootstrap_ci(values, seed=seed)
+    outliers = outlier_indices(values)
+    return {
+        "n": len(values),
+        "mean": mean(values),
+        "stddev": stddev(values),
+        "min": min(values) if values else 0.0,
+        "max": max(values) if values else 0.0,
+        "ci_low": ci_low,
+        "ci_high": ci_high,
+        "outlier": bool(outliers),
+        "outliers": outliers,
+    }
+
+
+def summarize_samples(samples, keys, seed=0):
+    """Per-key summary over a list of dicts; keys missing from a sample are skipped."""
+    return {
+        key: summarize(
+            [s[key] for s in samples if isinstance(s.get(key), (int, float)) and not isinstance(s.get(key), bool)],
+            seed=seed,
+        )
+        for key in keys
+    }
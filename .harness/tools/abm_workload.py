@@ -0,0 +1,149 @@
+import argparse
+import json
+import random
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    import abm_sim
+    from util import git_session, json_read, json_write
+else:
+    from . import abm_sim
+    from .util import git_session, json_read, json_write
+
+
+SOURCE_ROOT = Path(__file__).resolve().parents[2]
+# Everything ralph and verify need at runtime; events, receipts and status
+# start empty in every workload.
+WORKLOAD_FILES = [
+    ".gitignore",
+    ".harness/contracts/hooks.json",
+    ".harness/contracts/schema_dispatch.json",
+    "contracts",
+]
+DEFAULT_WORK_ORDER_COUNT = 5
+DEFAULT_TASK_MS = 20
+DENY_GLOBS = ["**/.env", "**/*.pem", "**/*token*", "**/package-lock.json", "**/yarn.lock"]
+GIT_IDENTITY = {"user.name": "abm-bench", "user.email": "abm-bench@localhost"}
+TASK_CMD = "python3 .harness/tools/abm_workload.py task"
+
+
+def workload_dispatch(param_set, seed):
+    params = dict(param_set)
+    if not {"depth", "fanout", "work_order_count"} & set(params):
+        params["work_order_count"] = DEFAULT_WORK_ORDER_COUNT
+    config = abm_sim.sim_config(params)
+    dag = abm_sim.generate_dag(config, random.Random(seed))
+    task_ms = int(params.get("task_ms", DEFAULT_TASK_MS))
+    work_orders = []
+    for priority, node in enumerate(dag, start=1):
+        task = f"{TASK_CMD} --wo {node['id']} --seed {seed} --ms {task_ms}"
+        work_orders.append(
+            {
+                "id": node["id"],
+                "title": f"Synthetic task {node['id']}",
+                "ready": False,
+                "done": False,
+                "role": "WORKER",
+                "priority": priority,
+                "depends_on": node["depends_on"],
+                "scope": {"allow_globs": ["**"], "deny_globs": DENY_GLOBS},
+                "steps": ["Run the synthetic task."],
+                "acceptance": [
+                    {"name": "work", "cmd": f"{task} --name work --fail-rate {float(config['retry_rate'])}"},
+                    {
+                        "name": "check",
+                        "cmd": f"{task} --name check --fail-rate {float(config['verification_fail_rate'])}",
+                    },
+                ],
+                "artifacts": {"receipt_required": True},
+            }
+        )
+    return {"meta": {"version": "harness.v1"}, "work_orders": work_orders}
+
+
+def _git(root, *args):
+    subprocess.run(["git", *args], cwd=root, check=True, capture_output=True, text=True)
+
+
+def build_workload(root, param_set, seed=0, source=SOURCE_ROOT):
+    root = Path(root)
+    if root.exists():
+        shutil.rmtree(root)
+    root.mkdir(parents=True)
+    shutil.copytree(
+        source / ".harness/tools",
+        root / ".harness/tools",
+        ignore=shutil.ignore_patterns("__pycache__"),
+    )
+    for rel in WORKLOAD_FILES:
+        src = source / rel
+        if src.is_dir():
+            shutil.copytree(src, root / rel)
+        elif src.exists():
+            (root / rel).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(src, root / rel)
+
+    hooks = json_read(root / ".harness/contracts/hooks.json")
+    policy = hooks.setdefault("policy", {})
+    if "max_attempts" in param_set:
+        policy["max_worker_attempts_per_wo"] = int(param_set["max_attempts"])
+    # Backoff would only add sleep to every measurement.
+    policy["retry_backoff"] = {"mode": "none"}
+    json_write(root / ".harness/contracts/hooks.json", hooks)
+    dispatch = workload_dispatch(param_set, seed)
+    json_write(root / ".harness/contracts/dispatch.json", dispatch)
+    (root / "docs").mkdir(exist_ok=True)
+    (root / "docs/STATUS.md").write_text("", encoding="utf-8")
+
+    _git(root, "init", "-q")
+    for key, value in GIT_IDENTITY.items():
+        _git(root, "config", key, value)
+    _git(root, "add", "-A")
+    _git(root, "commit", "-q", "-m", "workload")
+    return {"root": str(root), "work_orders": len(dispatch["work_orders"])}
+
+
+def run_task(wo_id, name, seed, ms, fail_rate):
+    # Attempt counters live under the git dir so they survive retries without
+    # showing up in the worktree, scope checks or the acceptance cache key.
+    state_dir = Path(git_session().git_dir() or ".git") / "workload"
+    state_dir.mkdir(parents=True, exist_ok=True)
+    state_path = state_dir / f"{wo_id}.{name}.json"
+    attempt = json_read(state_path).get("attempt", 0) + 1 if state_path.exists() else 1
+    json_write(state_path, {"attempt": attempt})
+    time.sleep(ms / 1000.0)
+    rng = random.Random(abm_sim.derive_seed(seed, wo_id, name, attempt))
+    if rng.random() < fail_rate:
+        print(f"{wo_id} {name} attempt {attempt}: injected failure", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Create a scratch repository for one parameter set.")
+    build.add_argument("root")
+    build.add_argument("--param", action="append", type=abm_sim.parse_param, default=[])
+    build.add_argument("--seed", type=int, default=0)
+    task = sub.add_parser("task", help="Synthetic acceptance command used by generated work orders.")
+    task.add_argument("--wo", required=True)
+    task.add_argument("--name", required=True)
+    task.add_argument("--seed", type=int, default=0)
+    task.add_argument("--ms", type=int, default=DEFAULT_TASK_MS)
+    task.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    if args.command == "task":
+        return run_task(args.wo, args.name, args.seed, args.ms, args.fail_rate)
+    print(json.dumps(build_workload(args.root, dict(args.param), seed=args.seed), sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+import platform
+import sys
+import threading
+from pathlib import Path
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    from util import git_session, hooks_policy, json_read, json_write, now_iso
+else:
+    from .util import git_session, hooks_policy, json_read, json_write, now_iso
+
+
+CACHE_DIR = Path("artifacts/acceptance_cache")
+CACHE_VERSION = "harness.acceptance_cache.v1"
+DEFAULT_EXCLUDE_GLOBS = ["artifacts/**", "receipts/**", "docs/STATUS.md"]
+DEFAULT_ENV_KEYS = ["PATH"]
+
+
+def cache_policy():
+    policy = hooks_policy("acceptance_cache")
+    exclude_globs = policy.get("exclude_globs", DEFAULT_EXCLUDE_GLOBS)
+    env_keys = policy.get("env_keys", DEFAULT_ENV_KEYS)
+    return {
+        "dir": Path(policy.get("dir") or CACHE_DIR),
+        "exclude_globs": [g for g in exclude_globs if isinstance(g, str)] if isinstance(exclude_globs, list) else [],
+        "env_keys": [k for k in env_keys if isinstance(k, str)] if isinstance(env_keys, list) else [],
+    }
+
+
+def _digest(payload):
+    data = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def env_fingerprint(env_keys):
+    return _digest(
+        {
+            "python": sys.version,
+            "platform": platform.platform(),
+            "env": {key: os.environ.get(key) for key in sorted(env_keys)},
+        }
+    )
+
+
+def cache_key(tree, cmd, env_fp):
+    return _digest({"version": CACHE_VERSION, "tree": tree, "cmd": cmd, "env": env_fp})
+
+
+class AcceptanceCache:
+    """(tree, cmd, env) -> result store for opted-in work orders.
+
+    Only passing results are stored: a failure is exactly what a retry needs
+    to re-check, so it is never served from the cache.
+    """
+
+    def __init__(self, policy=None):
+        self.policy = policy or cache_policy()
+        self.tree = git_session().worktree_tree(self.policy["exclude_globs"])
+        self.env_fp = env_fingerprint(self.policy["env_keys"])
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _path(self, cmd):
+        return self.policy["dir"] / f"{cache_key(self.tree, cmd, self.env_fp)}.json"
+
+    def lookup(self, cmd):
+        if not self.tree:
+            self._count(False)
+            return None
+        path = self._path(cmd)
+        try:
+            entry = json_read(path) if path.exists() else None
+        except (OSError, ValueError):
+            entry = None
+        if not entry or entry.get("tree") != self.tree or entry.get("cmd") != cmd or entry.get("code") != 0:
+            self._count(False)
+            return None
+        self._count(True)
+        return entry
+
+    def store(self, cmd, result):
+        if not self.tree or result.get("code") != 0:
+            return None
+        output = f"{result.get('stdout', '')}\n{result.get('stderr', '')}".encode("utf-8")
+        entry = {
+            "cmd": cmd,
+            "code": result["code"],
+            "env_fingerprint": self.env_fp,
+            "ms": result.get("ms", 0.0),
+            "output_digest": hashlib.sha256(output).hexdigest(),
+            "recorded_utc": now_iso(),
+            "tree": self.tree,
+        }
+        json_write(self._path(cmd), entry)
+        return entry
+
+    def summary(self):
+        return {"hits": self.hits, "misses": self.misses, "tree": self.tree}
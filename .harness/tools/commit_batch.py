@@ -0,0 +1,109 @@
+import sys
+import time
+from pathlib import Path
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    from util import git_session, hooks_policy, json_read, json_write
+else:
+    from .util import git_session, hooks_policy, json_read, json_write
+
+
+HOOKS_PATH = Path(".harness/contracts/hooks.json")
+COMMIT_MODES = ("per_transition", "combined", "batched")
+DEFAULT_BATCH_WORK_ORDERS = 10
+DEFAULT_BATCH_SECONDS = 60.0
+
+
+def commit_policy(hooks_path=HOOKS_PATH, mode_override=None):
+    policy = hooks_policy("commit", hooks_path)
+    mode = mode_override or policy.get("mode", "per_transition")
+    if mode not in COMMIT_MODES:
+        raise ValueError(f"unknown commit mode: {mode}")
+    batch_work_orders = policy.get("batch_work_orders", DEFAULT_BATCH_WORK_ORDERS)
+    if not isinstance(batch_work_orders, int) or batch_work_orders < 1:
+        batch_work_orders = DEFAULT_BATCH_WORK_ORDERS
+    batch_seconds = policy.get("batch_seconds", DEFAULT_BATCH_SECONDS)
+    if not isinstance(batch_seconds, (int, float)) or batch_seconds < 0:
+        batch_seconds = DEFAULT_BATCH_SECONDS
+    return {
+        "mode": mode,
+        "batch_work_orders": batch_work_orders,
+        "batch_seconds": float(batch_seconds),
+    }
+
+
+def pending_path():
+    # Lives inside the git dir: never committed, never seen by the scope guard.
+    git_dir = git_session().git_dir()
+    if not git_dir:
+        return None
+    return Path(git_dir) / "harness" / "pending_commit.json"
+
+
+def load_pending():
+    path = pending_path()
+    if path is None or not path.exists():
+        return {"run_id": None, "opened_epoch": None, "transitions": []}
+    return json_read(path)
+
+
+def add_pending(run_id, transition):
+    pending = load_pending()
+    if not pending["transitions"]:
+        pending["run_id"] = run_id
+        pending["opened_epoch"] = time.time()
+    pending["transitions"].append(transition)
+    save_pending(pending)
+    return pending
+
+
+def save_pending(pending):
+    path = pending_path()
+    if path is None:
+        raise RuntimeError("commit batching requires a git repository")
+    json_write(path, pending)
+
+
+def clear_pending():
+    path = pending_path()
+    if path is not None and path.exists():
+        path.unlink()
+
+
+def pending_work_orders(kind=None):
+    return {
+        item.get("work_order_id")
+        for item in load_pending().get("transitions", [])
+        if kind is None or item.get("kind") == kind
+    }
+
+
+def scope_base_tree():
+    # Completed work orders waiting for a batched commit are not the active
+    # work order's changes; its scope is checked against the tree they left.
+    trees = [item.get("tree") for item in load_pending().get("transitions", []) if item.get("kind") == "COMPLETE"]
+    return trees[-1] if trees else None
+
+
+def batch_due(pending, policy, now=None):
+    transitions = pending.get("transitions", [])
+    if not transitions:
+        return False
+    if policy["mode"] != "batched":
+        return True
+    completed = sum(1 for item in transitions if item.get("kind") == "COMPLETE")
+    if completed >= policy["batch_work_orders"]:
+        return True
+    opened = pending.get("opened_epoch") or 0.0
+    now = time.time() if now is None else now
+    return now - opened >= policy["batch_seconds"]
+
+
+def commit_message(transitions):
+    parts = []
+    for verb, kind in (("complete", "COMPLETE"), ("promote", "PROMOTE")):
+        ids = [item["work_order_id"] for item in transitions if item.get("kind") == kind]
+        if ids:
+            parts.append(f"{verb} {', '.join(ids)}")
+    return f"ralph: {'; '.join(parts)}"
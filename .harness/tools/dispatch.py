@@ -4,16 +4,18 @@ from pathlib import Path
 
 if __package__ in (None, ""):
     sys.path.insert(0, str(Path(__file__).resolve().parent))
-    from util import json_read, json_write, run_cmd
+    from dispatch_journal import compact, dispatch_pathspec, load_dispatch, write_dispatch
+    from util import run_cmd
 else:
-    from .util import json_read, json_write, run_cmd
+    from .dispatch_journal import compact, dispatch_pathspec, load_dispatch, write_dispatch
+    from .util import run_cmd
 
 
 DISPATCH_PATH = Path(".harness/contracts/dispatch.json")
 
 
 def set_ready(wo_id):
-    dispatch = json_read(DISPATCH_PATH)
+    dispatch = load_dispatch(DISPATCH_PATH)
     found = False
     for wo in dispatch.get("work_orders", []):
         if not wo.get("done"):
@@ -25,23 +27,46 @@ def set_ready(wo_id):
             wo["ready"] = True
     if not found:
         raise SystemExit(f"unknown work order: {wo_id}")
-    json_write(DISPATCH_PATH, dispatch)
+    write_dispatch(dispatch, DISPATCH_PATH)
     return dispatch
 
 
 def commit_ready(wo_id):
-    run_cmd(["git", "add", str(DISPATCH_PATH)], check=True)
+    run_cmd(["git", "add", "-A", "--", dispatch_pathspec(DISPATCH_PATH)], check=True)
     run_cmd(["git", "commit", "-m", f"dispatch: ready {wo_id}"], check=True)
 
 
+def commit_compaction():
+    run_cmd(["git", "add", "-A", "--", dispatch_pathspec(DISPATCH_PATH)], check=True)
+    run_cmd(["git", "commit", "-m", "dispatch: compact journal"], check=True)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Debug helper for dispatch readiness.")
-    parser.add_argument("--ready", required=True, help="Work order ID to mark ready.")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--ready", help="Work order ID to mark ready.")
+    group.add_argument(
+        "--compact",
+        action="store_true",
+        help="Fold the dispatch state journal into dispatch.json.",
+    )
     args = parser.parse_args()
 
-    before = run_cmd(["git", "status", "--porcelain", str(DISPATCH_PATH)])
+    pathspec = dispatch_pathspec(DISPATCH_PATH)
+    if args.compact:
+        before = run_cmd(["git", "status", "--porcelain", "--", pathspec])
+        compact(DISPATCH_PATH)
+        after = run_cmd(["git", "status", "--porcelain", "--", pathspec])
+        if before["stdout"] == after["stdout"] and not after["stdout"]:
+            print("dispatch journal already compact")
+            return 0
+        commit_compaction()
+        print("dispatch journal compacted")
+        return 0
+
+    before = run_cmd(["git", "status", "--porcelain", "--", pathspec])
     _ = set_ready(args.ready)
-    after = run_cmd(["git", "status", "--porcelain", str(DISPATCH_PATH)])
+    after = run_cmd(["git", "status", "--porcelain", "--", pathspec])
     if before["stdout"] == after["stdout"] and not after["stdout"]:
         print(f"dispatch already set: {args.ready}")
         return 0
@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    from util import hooks_policy, json_read, json_write
+else:
+    from .util import hooks_policy, json_read, json_write
+
+
+DISPATCH_PATH = Path(".harness/contracts/dispatch.json")
+HOOKS_PATH = Path(".harness/contracts/hooks.json")
+JOURNAL_VERSION = "harness.journal.v1"
+DEFAULT_COMPACT_EVERY = 64
+TRANSITION_STATES = {"ready", "done"}
+
+
+def journal_path(dispatch_path=DISPATCH_PATH):
+    dispatch_path = Path(dispatch_path)
+    return dispatch_path.with_name(f"{dispatch_path.stem}.journal.jsonl")
+
+
+def dispatch_pathspec(dispatch_path=DISPATCH_PATH):
+    # Matches the base file and its journal so `git add -A` stages journal
+    # creation and the deletion left behind by compaction alike.
+    dispatch_path = Path(dispatch_path)
+    return str(dispatch_path.with_name(f"{dispatch_path.stem}.*"))
+
+
+def journal_policy(hooks_path=HOOKS_PATH):
+    policy = hooks_policy("dispatch_journal", hooks_path)
+    compact_every = policy.get("compact_every", DEFAULT_COMPACT_EVERY)
+    if not isinstance(compact_every, int) or compact_every < 1:
+        compact_every = DEFAULT_COMPACT_EVERY
+    return {"enabled": policy.get("enabled") is True, "compact_every": compact_every}
+
+
+def _canonical_hash(payload):
+    data = (json.dumps(payload, sort_keys=True, separators=(",", ":")) + "\n").encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def _dump_line(payload):
+    return json.dumps(payload, sort_keys=True, separators=(",", ":")) + "\n"
+
+
+def read_journal(path):
+    header = None
+    records = []
+    for line_no, line in enumerate(Path(path).read_text(encoding="utf-8").splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            payload = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise RuntimeError(f"dispatch journal line {line_no} invalid json: {exc.msg}") from exc
+        if header is None:
+            if payload.get("journal_version") != JOURNAL_VERSION:
+                raise RuntimeError(f"dispatch journal header must declare {JOURNAL_VERSION}")
+            header = payload
+            continue
+        if payload.get("to_state") not in TRANSITION_STATES or not isinstance(
+            payload.get("work_order_id"), str
+        ):
+            raise RuntimeError(f"dispatch journal line {line_no} invalid transition")
+        records.append(payload)
+    return header or {}, records
+
+
+def apply_transition(dispatch, wo_id, to_state):
+    if to_state not in TRANSITION_STATES:
+        raise ValueError(f"unknown transition state: {to_state}")
+    for wo in dispatch.get("work_orders", []):
+        if wo.get("id") == wo_id:
+            if to_state == "done":
+                wo["done"] = True
+                wo["ready"] = False
+            else:
+                wo["ready"] = True
+            return True
+    return False
+
+
+def load_dispatch(dispatch_path=DISPATCH_PATH):
+    dispatch = json_read(dispatch_path)
+    path = journal_path(dispatch_path)
+    if not path.exists():
+        return dispatch
+    header, records = read_journal(path)
+    base_hash = _canonical_hash(dispatch)
+    materialized = json.loads(json.dumps(dispatch))
+    for record in records:
+        if not apply_transition(materialized, record["work_order_id"], record["to_state"]):
+            raise RuntimeError(f"dispatch journal unknown work order {record['work_order_id']}")
+    if header.get("base_hash") != base_hash:
+        # Transitions are idempotent, so a journal left behind by an interrupted
+        # compaction replays to the base unchanged; anything else is a real conflict.
+        if _canonical_hash(materialized) == base_hash:
+            return dispatch
+        raise RuntimeError(f"dispatch journal base mismatch: {path.as_posix()}")
+    return materialized
+
+
+def write_dispatch(dispatch, dispatch_path=DISPATCH_PATH):
+    dispatch_path = Path(dispatch_path)
+    tmp_path = dispatch_path.with_name(f"{dispatch_path.name}.tmp")
+    json_write(tmp_path, dispatch)
+    os.replace(tmp_path, dispatch_path)
+    path = journal_path(dispatch_path)
+    if path.exists():
+        path.unlink()
+
+
+def compact(dispatch_path=DISPATCH_PATH):
+    dispatch = load_dispatch(dispatch_path)
+    write_dispatch(dispatch, dispatch_path)
+    return dispatch
+
+
+def append_transition(wo_id, to_state, dispatch_path=DISPATCH_PATH, compact_every=DEFAULT_COMPACT_EVERY):
+    if to_state not in TRANSITION_STATES:
+        raise ValueError(f"unknown transition state: {to_state}")
+    path = journal_path(dispatch_path)
+    if path.exists():
+        _, records = read_journal(path)
+        seq = len(records) + 1
+    else:
+        base_hash = _canonical_hash(json_read(dispatch_path))
+        path.write_text(
+            _dump_line({"base_hash": base_hash, "journal_version": JOURNAL_VERSION}),
+            encoding="utf-8",
+        )
+        seq = 1
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write(_dump_line({"seq": seq, "to_state": to_state, "work_order_id": wo_id}))
+    if compact_every and seq >= compact_every:
+        compact(dispatch_path)
+    return seq
+
+
+def record_transition(dispatch, wo_id, to_state, dispatch_path=DISPATCH_PATH, policy=None):
+    if not apply_transition(dispatch, wo_id, to_state):
+        raise ValueError(f"unknown work order: {wo_id}")
+    policy = policy or journal_policy()
+    if policy["enabled"]:
+        append_transition(wo_id, to_state, dispatch_path, policy["compact_every"])
+    else:
+        write_dispatch(dispatch, dispatch_path)
+    return dispatch
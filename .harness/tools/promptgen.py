@@ -3,9 +3,9 @@ from pathlib import Path
 
 if __package__ in (None, ""):
     sys.path.insert(0, str(Path(__file__).resolve().parent))
-    from util import json_read
+    from dispatch_journal import load_dispatch
 else:
-    from .util import json_read
+    from .dispatch_journal import load_dispatch
 
 
 def select_active_wo(dispatch):
@@ -16,7 +16,7 @@ def select_active_wo(dispatch):
 
 
 def main():
-    dispatch = json_read(".harness/contracts/dispatch.json")
+    dispatch = load_dispatch()
     wo = select_active_wo(dispatch)
     if not wo:
         print("NO_READY_WORK_ORDERS")
@@ -1,31 +1,73 @@
 import argparse
+import json
+import os
+import random
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 
 if __package__ in (None, ""):
     sys.path.insert(0, str(Path(__file__).resolve().parent))
     import abm as abm_mod
     import verify as verify_mod
+    from acceptance_cache import AcceptanceCache, cache_policy
+    from commit_batch import (
+        add_pending,
+        batch_due,
+        clear_pending,
+        commit_message,
+        commit_policy,
+        COMMIT_MODES,
+        load_pending,
+        save_pending,
+    )
+    from dispatch_journal import dispatch_pathspec, load_dispatch, record_transition
     from receipt import dispatch_hash, make_run_id, write_receipt
-    from util import git_changed_files, git_head, json_read, json_write, now_iso, run_cmd
+    from util import git_session, hooks_policy, json_read, json_write, now_iso, run_cmd, run_cmd_bounded
 else:
     from . import abm as abm_mod
     from . import verify as verify_mod
+    from .acceptance_cache import AcceptanceCache, cache_policy
+    from .commit_batch import (
+        add_pending,
+        batch_due,
+        clear_pending,
+        commit_message,
+        commit_policy,
+        COMMIT_MODES,
+        load_pending,
+        save_pending,
+    )
+    from .dispatch_journal import dispatch_pathspec, load_dispatch, record_transition
     from .receipt import dispatch_hash, make_run_id, write_receipt
-    from .util import git_changed_files, git_head, json_read, json_write, now_iso, run_cmd
+    from .util import git_session, hooks_policy, json_read, json_write, now_iso, run_cmd, run_cmd_bounded
 
 
 DISPATCH_PATH = Path(".harness/contracts/dispatch.json")
+HOOKS_PATH = Path(".harness/contracts/hooks.json")
 STATUS_PATH = Path("docs/STATUS.md")
 
 
 def ensure_git_repo():
     if Path(".git").exists():
         return True
-    result = run_cmd(["git", "init"])
+    result = git_session().init()
     return result["code"] == 0
 
 
+@contextmanager
+def timed(phases, name):
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        if phases is not None:
+            phases[name] = phases.get(name, 0) + time.perf_counter_ns() - start
+
+
 def append_status(line):
     STATUS_PATH.parent.mkdir(parents=True, exist_ok=True)
     with open(STATUS_PATH, "a", encoding="utf-8") as fh:
@@ -60,19 +102,180 @@ def select_next_eligible(dispatch):
     return eligible[0] if eligible else None
 
 
-def run_acceptance(wo):
-    results = []
-    ok = True
-    for acc in wo["acceptance"]:
-        result = run_cmd(acc["cmd"])
-        result["name"] = acc["name"]
-        results.append(result)
-        if result["code"] != 0:
-            ok = False
+DEFAULT_ACCEPTANCE_WORKERS = 4
+DEFAULT_ACCEPTANCE_TIMEOUT_S = 600
+DEFAULT_MAX_ATTEMPTS = 3
+RETRY_BACKOFF_MODES = ("none", "fixed", "exponential")
+# Checks whose outcome depends only on the worktree; a pass is reused by a
+# retry whose whole tree, hashed just before the checks run, is unchanged.
+# Scope always re-runs: it judges exactly what this attempt changed.
+TREE_CHECKS = ("schema", "project")
+
+
+def acceptance_policy():
+    policy = hooks_policy("acceptance")
+    max_workers = policy.get("max_workers", DEFAULT_ACCEPTANCE_WORKERS)
+    if not isinstance(max_workers, int) or max_workers < 1:
+        max_workers = DEFAULT_ACCEPTANCE_WORKERS
+    timeout_s = policy.get("timeout_s", DEFAULT_ACCEPTANCE_TIMEOUT_S)
+    budget_s = policy.get("budget_s")
+    return {
+        "max_workers": max_workers,
+        "timeout_s": timeout_s if isinstance(timeout_s, (int, float)) and timeout_s > 0 else None,
+        "budget_s": budget_s if isinstance(budget_s, (int, float)) and budget_s > 0 else None,
+        "fail_fast": policy.get("fail_fast") is True,
+    }
+
+
+def retry_policy(hooks_path=HOOKS_PATH):
+    try:
+        policy = json_read(hooks_path).get("policy", {})
+    except (OSError, ValueError, AttributeError):
+        policy = {}
+    max_attempts = policy.get("max_worker_attempts_per_wo", DEFAULT_MAX_ATTEMPTS)
+    if not isinstance(max_attempts, int) or max_attempts < 1:
+        max_attempts = DEFAULT_MAX_ATTEMPTS
+    backoff = hooks_policy("retry_backoff", hooks_path)
+    mode = backoff.get("mode", "none")
+
+    def number(key, default):
+        value = backoff.get(key, default)
+        return value if isinstance(value, (int, float)) and value >= 0 else default
+
+    return {
+        "max_attempts": max_attempts,
+        "mode": mode if mode in RETRY_BACKOFF_MODES else "none",
+        "base_s": number("base_s", 0.5),
+        "max_s": number("max_s", 30.0),
+        "jitter": min(number("jitter", 0.0), 1.0),
+    }
+
+
+def backoff_seconds(policy, attempt, rng=random):
+    if policy["mode"] == "none":
+        return 0.0
+    delay = policy["base_s"]
+    if policy["mode"] == "exponential":
+        delay *= 2 ** (attempt - 1)
+    if policy["max_s"]:
+        delay = min(delay, policy["max_s"])
+    return delay - delay * policy["jitter"] * rng.random()
+
+
+def acceptance_stages(acceptance):
+    # Consecutive parallel-safe commands share a stage; everything else runs alone, in order.
+    stages = []
+    for idx, acc in enumerate(acceptance):
+        if acc.get("parallel") is True and stages and stages[-1][0]:
+            stages[-1][1].append((idx, acc))
+        else:
+            stages.append((acc.get("parallel") is True, [(idx, acc)]))
+    return stages
+
+
+def skipped_result(acc, reason):
+    return {
+        "cmd": acc["cmd"],
+        "code": None,
+        "stdout": "",
+        "stderr": reason,
+        "status": "skipped",
+        "ms": 0.0,
+    }
+
+
+def cached_result(acc, entry):
+    return {
+        "cmd": acc["cmd"],
+        "code": entry["code"],
+        "stdout": "",
+        "stderr": "",
+        "status": "pass",
+        "ms": 0.0,
+        "cached": True,
+        "cached_ms": entry.get("ms", 0.0),
+    }
+
+
+def reused_result(acc, prior):
+    return dict(prior, ms=0.0, reused=True)
+
+
+def _reuse_key(cmd):
+    return json.dumps(cmd, sort_keys=True)
+
+
+def run_acceptance(wo, policy=None, cache=None, reuse=None):
+    policy = policy or acceptance_policy()
+    acceptance = wo["acceptance"]
+    deadline = time.monotonic() + policy["budget_s"] if policy["budget_s"] else None
+    cancel = threading.Event()
+    results = [None] * len(acceptance)
+
+    def run_one(acc):
+        if cancel.is_set():
+            return skipped_result(acc, "cancelled after earlier failure")
+        if reuse is not None and _reuse_key(acc["cmd"]) in reuse:
+            return reused_result(acc, reuse[_reuse_key(acc["cmd"])])
+        if cache is not None:
+            entry = cache.lookup(acc["cmd"])
+            if entry:
+                return cached_result(acc, entry)
+        timeout = acc.get("timeout_s", policy["timeout_s"])
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return skipped_result(acc, "acceptance budget exhausted")
+            timeout = min(timeout, remaining) if timeout else remaining
+        result = run_cmd_bounded(acc["cmd"], timeout=timeout, cancel=cancel)
+        if cache is not None:
+            cache.store(acc["cmd"], result)
+        if reuse is not None and result["status"] == "pass":
+            reuse[_reuse_key(acc["cmd"])] = result
+        if result["status"] != "pass" and policy["fail_fast"]:
+            cancel.set()
+        return result
+
+    for parallel, stage in acceptance_stages(acceptance):
+        if parallel and len(stage) > 1:
+            with ThreadPoolExecutor(max_workers=min(policy["max_workers"], len(stage))) as pool:
+                futures = [(idx, pool.submit(run_one, acc)) for idx, acc in stage]
+                for idx, future in futures:
+                    results[idx] = future.result()
+        else:
+            for idx, acc in stage:
+                results[idx] = run_one(acc)
+
+    for idx, acc in enumerate(acceptance):
+        results[idx]["name"] = acc["name"]
+    ok = all(result["status"] == "pass" for result in results)
     return ok, results
 
 
-def run_verify_work():
+def acceptance_detail(results):
+    return [
+        {
+            "name": result["name"],
+            "status": result["status"],
+            "code": result["code"],
+            "ms": result["ms"],
+            "cached": result.get("cached", False),
+            "reused": result.get("reused", False),
+        }
+        for result in results
+    ]
+
+
+def run_check(name, func, memo=None):
+    if memo is not None and name in memo:
+        return memo[name]
+    passed, errs = func()
+    if passed and memo is not None and name in TREE_CHECKS:
+        memo[name] = (passed, errs)
+    return passed, errs
+
+
+def run_verify_work(memo=None):
     checks = [
         ("schema", verify_mod.check_schema),
         ("receipts", verify_mod.check_receipts),
@@ -83,13 +286,13 @@ def run_verify_work():
     ok = True
     errors = {}
     for name, func in checks:
-        passed, errs = func()
+        passed, errs = run_check(name, func, memo)
         errors[name] = errs
         ok = ok and passed
     return ok, errors
 
 
-def run_verify_dod():
+def run_verify_dod(memo=None):
     checks = [
         ("schema", verify_mod.check_schema),
         ("receipts", verify_mod.check_receipts),
@@ -101,60 +304,164 @@ def run_verify_dod():
     ok = True
     errors = {}
     for name, func in checks:
-        passed, errs = func()
+        passed, errs = run_check(name, func, memo)
         errors[name] = errs
         ok = ok and passed
     return ok, errors
 
 
 def mark_done(dispatch, wo_id):
-    for wo in dispatch.get("work_orders", []):
-        if wo.get("id") == wo_id:
-            wo["done"] = True
-            wo["ready"] = False
-    json_write(DISPATCH_PATH, dispatch)
-
-
-def commit_work(wo_id):
-    run_cmd(["git", "add", "-A"], check=True)
-    run_cmd(["git", "commit", "-m", f"ralph: complete {wo_id}"], check=True)
+    record_transition(dispatch, wo_id, "done", DISPATCH_PATH)
+
+
+def stage_transition(run_id, kind, wo_id, cycle_id, agent_id, dispatch_hash_value, tree=None):
+    transition = {
+        "kind": kind,
+        "work_order_id": wo_id,
+        "run_id": run_id,
+        "cycle_id": cycle_id,
+        "agent_id": agent_id,
+        "dispatch_hash": dispatch_hash_value,
+    }
+    if tree:
+        transition["tree"] = tree
+    return add_pending(run_id, transition)
+
+
+def flush_transitions(policy, phases=None):
+    # The manifest records progress so a crash between commit and receipts
+    # resumes without a second commit or duplicate receipts.
+    pending = load_pending()
+    transitions = pending.get("transitions", [])
+    if not transitions:
+        return None
+    landed = pending.get("landed_head")
+    if not landed:
+        paths = None
+        if all(item.get("kind") == "PROMOTE" for item in transitions):
+            paths = [dispatch_pathspec(DISPATCH_PATH)]
+        with timed(phases, "git"):
+            landed = git_session().commit(commit_message(transitions), paths=paths)
+        pending["landed_head"] = landed
+        save_pending(pending)
+    for item in transitions:
+        if item.get("recorded"):
+            continue
+        abm_mod.append_event(
+            abm_mod.build_event(
+                "state_transition",
+                item["run_id"],
+                item["dispatch_hash"],
+                landed,
+                item["work_order_id"],
+                item["cycle_id"],
+                item["agent_id"],
+                detail={
+                    "to_state": "done" if item["kind"] == "COMPLETE" else "ready",
+                    "commit_mode": policy["mode"],
+                },
+            )
+        )
+        with timed(phases, "receipts"):
+            write_receipt(
+                item["kind"],
+                run_id=item["run_id"],
+                head=landed,
+                dispatch_hash_value=dispatch_hash(),
+                work_order_id=item["work_order_id"],
+            )
+        item["recorded"] = True
+        save_pending(pending)
+    clear_pending()
+    with timed(phases, "aggregates"):
+        abm_mod.write_aggregates()
+    return landed
 
 
-def commit_promotion(wo_id):
-    run_cmd(["git", "add", str(DISPATCH_PATH)], check=True)
-    run_cmd(["git", "commit", "-m", f"ralph: promote {wo_id}"], check=True)
+def maybe_flush(policy, phases=None):
+    if batch_due(load_pending(), policy):
+        return flush_transitions(policy, phases)
+    return None
 
 
-def promote_next(dispatch, run_id, cycle_id, agent_id, head, dispatch_hash_value):
+def promote_next(dispatch, run_id, cycle_id, agent_id, dispatch_hash_value, policy, phases=None):
     wo = select_next_eligible(dispatch)
     if not wo:
         return None
-    for item in dispatch.get("work_orders", []):
-        if item.get("id") == wo.get("id"):
-            item["ready"] = True
-            break
-    json_write(DISPATCH_PATH, dispatch)
-    commit_promotion(wo["id"])
+    record_transition(dispatch, wo["id"], "ready", DISPATCH_PATH)
+    stage_transition(run_id, "PROMOTE", wo["id"], cycle_id, agent_id, dispatch_hash_value)
+    maybe_flush(policy, phases)
+    return wo["id"]
+
+
+def verify_result_detail(status, cache):
+    detail = {"status": status}
+    if cache is not None:
+        detail["acceptance_cache"] = cache.summary()
+    return detail
+
+
+def emit_cycle_end(
+    run_id, dispatch_hash_value, head, wo_id, cycle_id, agent_id, status, spawns_start, phases, start_ns, summary=None
+):
+    cycle_ns = time.perf_counter_ns() - start_ns
+    if summary is not None:
+        summary["cycle_ns"] += cycle_ns
+        for name, value in phases.items():
+            summary["phase_ns"][name] = summary["phase_ns"].get(name, 0) + value
     abm_mod.append_event(
         abm_mod.build_event(
-            "state_transition",
+            "cycle_end",
             run_id,
             dispatch_hash_value,
             head,
-            wo["id"],
+            wo_id,
             cycle_id,
             agent_id,
-            detail={"to_state": "ready"},
+            detail={
+                "status": status,
+                "git_spawns": git_session().spawns - spawns_start,
+                "phase_ns": dict(sorted(phases.items())),
+                "cycle_ns": cycle_ns,
+            },
         )
     )
-    write_receipt(
-        "PROMOTE",
+    abm_mod.write_aggregates()
+
+
+def new_summary(run_id):
+    return {
+        "run_id": run_id,
+        "status": None,
+        "exit_code": None,
+        "cycles": 0,
+        "attempts": 0,
+        "phase_ns": {},
+        "cycle_ns": 0,
+        "receipt": None,
+    }
+
+
+def write_terminal_receipt(kind, run_id, summary=None):
+    path = write_receipt(
+        kind,
         run_id=run_id,
-        head=git_head(),
+        head=git_session().head(),
         dispatch_hash_value=dispatch_hash(),
-        work_order_id=wo["id"],
+        work_order_id=None,
     )
-    return wo["id"]
+    if summary is not None:
+        summary["status"] = kind
+        summary["receipt"] = path
+    return path
+
+
+def write_json_summary(path, summary):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    json_write(tmp_path, summary)
+    os.replace(tmp_path, path)
 
 
 def run_verify_cmd(mode):
@@ -162,29 +469,32 @@ def run_verify_cmd(mode):
     return result["code"] == 0, result
 
 
-def one_cycle(run_id):
+def one_cycle(run_id, policy=None, summary=None):
+    policy = policy or commit_policy()
+    spawns_start = git_session().spawns
+    start_ns = time.perf_counter_ns()
+    phases = {}
     if not ensure_git_repo():
         print("git repo missing", file=sys.stderr)
         return 1
 
-    dispatch = json_read(DISPATCH_PATH)
+    pending = load_pending()
+    if pending.get("transitions") and pending.get("run_id") != run_id:
+        flush_transitions(policy)
+
+    dispatch = load_dispatch(DISPATCH_PATH)
     ready_ids = select_ready_ids(dispatch)
     if len(ready_ids) > 1:
         print(
             f"multiple ready work orders (wip=1): {', '.join(ready_ids)}",
             file=sys.stderr,
         )
-        write_receipt(
-            "RUN_FAIL",
-            run_id=run_id,
-            head=git_head(),
-            dispatch_hash_value=dispatch_hash(),
-            work_order_id=None,
-        )
+        flush_transitions(policy)
+        write_terminal_receipt("RUN_FAIL", run_id, summary)
         return 1
 
     wo = select_ready_wo(dispatch)
-    head = git_head()
+    head = git_session().head()
     dispatch_hash_value = dispatch_hash()
     agent_id = "ralph"
     cycle_id = None
@@ -194,38 +504,29 @@ def one_cycle(run_id):
             run_id,
             cycle_id,
             agent_id,
-            head,
             dispatch_hash_value,
+            policy,
         )
         if promoted:
             append_status(f"PROMOTE {promoted}")
             abm_mod.write_aggregates()
             return 0
+        flush_transitions(policy)
         dod_ok, _ = run_verify_cmd("dod")
         if dod_ok:
             append_status("DONE DoD=PASS")
-            write_receipt(
-                "RUN_DONE",
-                run_id=run_id,
-                head=git_head(),
-                dispatch_hash_value=dispatch_hash(),
-                work_order_id=None,
-            )
+            write_terminal_receipt("RUN_DONE", run_id, summary)
             print("DONE")
             abm_mod.write_aggregates()
             return 2
         append_status("FAIL DoD=FAIL")
-        write_receipt(
-            "RUN_FAIL",
-            run_id=run_id,
-            head=git_head(),
-            dispatch_hash_value=dispatch_hash(),
-            work_order_id=None,
-        )
+        write_terminal_receipt("RUN_FAIL", run_id, summary)
         abm_mod.write_aggregates()
         return 1
 
     cycle_id = abm_mod.next_cycle_id(run_id)
+    if summary is not None:
+        summary["cycles"] += 1
     abm_mod.append_event(
         abm_mod.build_event(
             "cycle_start",
@@ -237,185 +538,161 @@ def one_cycle(run_id):
             agent_id,
         )
     )
-    attempt_id = "attempt-1"
-    abm_mod.append_event(
-        abm_mod.build_event(
-            "attempt_start",
-            run_id,
-            dispatch_hash_value,
-            head,
-            wo["id"],
-            cycle_id,
-            agent_id,
-            detail={"attempt_id": attempt_id},
-        )
-    )
-    abm_mod.append_event(
-        abm_mod.build_event(
-            "verify_start",
-            run_id,
-            dispatch_hash_value,
-            head,
-            wo["id"],
-            cycle_id,
-            agent_id,
-        )
-    )
-    abm_mod.write_aggregates()
-
-    acceptance_ok, acceptance_results = run_acceptance(wo)
-    scope_ok, scope_errors = verify_mod.check_scope()
-    verify_ok, verify_errors = run_verify_work()
-    run_verify_cmd("work")
-    dod_ok_after, dod_errors_after = run_verify_dod()
-    abm_mod.append_event(
-        abm_mod.build_event(
-            "verify_result",
-            run_id,
-            dispatch_hash_value,
-            head,
-            wo["id"],
-            cycle_id,
-            agent_id,
-            detail={
-                "status": "pass" if (acceptance_ok and scope_ok and verify_ok) else "fail"
-            },
+    retry = retry_policy()
+    memo = {"tree": None, "acceptance": {}, "checks_tree": None, "checks": {}}
+    for attempt in range(1, retry["max_attempts"] + 1):
+        attempt_id = f"attempt-{attempt}"
+        if summary is not None:
+            summary["attempts"] += 1
+        abm_mod.append_event(
+            abm_mod.build_event(
+                "attempt_start",
+                run_id,
+                dispatch_hash_value,
+                head,
+                wo["id"],
+                cycle_id,
+                agent_id,
+                detail={"attempt_id": attempt_id},
+            )
         )
-    )
-    abm_mod.append_event(
-        abm_mod.build_event(
-            "attempt_end",
-            run_id,
-            dispatch_hash_value,
-            head,
-            wo["id"],
-            cycle_id,
-            agent_id,
-            detail={
-                "attempt_id": attempt_id,
-                "status": "pass" if (acceptance_ok and scope_ok and verify_ok) else "fail",
-            },
+        abm_mod.append_event(
+            abm_mod.build_event(
+                "verify_start",
+                run_id,
+                dispatch_hash_value,
+                head,
+                wo["id"],
+                cycle_id,
+                agent_id,
+            )
         )
-    )
+        with timed(phases, "aggregates"):
+            abm_mod.write_aggregates()
 
-    if acceptance_ok and scope_ok and verify_ok:
-        mark_done(dispatch, wo["id"])
+        if retry["max_attempts"] > 1:
+            with timed(phases, "git"):
+                tree = git_session().worktree_tree(cache_policy()["exclude_globs"])
+            # No tree hash (git failed) means nothing can be proven unchanged.
+            if not tree or tree != memo["tree"]:
+                memo["tree"], memo["acceptance"] = tree, {}
+        with timed(phases, "acceptance"):
+            cache = AcceptanceCache() if wo.get("acceptance_cache") is True else None
+            acceptance_ok, acceptance_results = run_acceptance(wo, cache=cache, reuse=memo["acceptance"])
+        if retry["max_attempts"] > 1:
+            # Checks see what acceptance left behind, artifacts and receipts included.
+            with timed(phases, "git"):
+                checks_tree = git_session().worktree_tree()
+            if not checks_tree or checks_tree != memo["checks_tree"]:
+                memo["checks_tree"], memo["checks"] = checks_tree, {}
+        with timed(phases, "scope"):
+            scope_ok, scope_errors = run_check("scope", verify_mod.check_scope, memo["checks"])
+        with timed(phases, "verify"):
+            verify_ok, verify_errors = run_verify_work(memo["checks"])
+        with timed(phases, "verify_cmd"):
+            run_verify_cmd("work")
+        with timed(phases, "verify"):
+            dod_ok_after, dod_errors_after = run_verify_dod(memo["checks"])
+        passed = acceptance_ok and scope_ok and verify_ok
+        retry_in_s = None
+        if not passed and attempt < retry["max_attempts"]:
+            retry_in_s = round(backoff_seconds(retry, attempt), 3)
         abm_mod.append_event(
             abm_mod.build_event(
-                "state_transition",
+                "verify_result",
                 run_id,
                 dispatch_hash_value,
                 head,
                 wo["id"],
                 cycle_id,
                 agent_id,
-                detail={"to_state": "done"},
+                detail=verify_result_detail("pass" if passed else "fail", cache),
             )
         )
-        abm_mod.write_aggregates()
-        commit_work(wo["id"])
-        write_receipt(
-            "COMPLETE",
-            run_id=run_id,
-            head=git_head(),
-            dispatch_hash_value=dispatch_hash(),
-            work_order_id=wo["id"],
+        attempt_detail = {
+            "attempt_id": attempt_id,
+            "status": "pass" if passed else "fail",
+            "acceptance": acceptance_detail(acceptance_results),
+        }
+        if retry_in_s is not None:
+            attempt_detail["retry_in_s"] = retry_in_s
+        abm_mod.append_event(
+            abm_mod.build_event(
+                "attempt_end",
+                run_id,
+                dispatch_hash_value,
+                head,
+                wo["id"],
+                cycle_id,
+                agent_id,
+                detail=attempt_detail,
+            )
         )
+        if retry_in_s is None:
+            break
+        with timed(phases, "backoff"):
+            time.sleep(retry_in_s)
+
+    if passed:
+        mark_done(dispatch, wo["id"])
+        tree = None
+        if policy["mode"] == "batched":
+            # Stays uncommitted past this cycle; the next scope check starts from here.
+            with timed(phases, "git"):
+                tree = git_session().worktree_tree()
+        stage_transition(run_id, "COMPLETE", wo["id"], cycle_id, agent_id, dispatch_hash_value, tree)
+        with timed(phases, "aggregates"):
+            abm_mod.write_aggregates()
+        if policy["mode"] == "per_transition":
+            flush_transitions(policy, phases)
         append_status(f"PASS {wo['id']}")
-        dispatch = json_read(DISPATCH_PATH)
+        dispatch = load_dispatch(DISPATCH_PATH)
         promoted = promote_next(
             dispatch,
             run_id,
             cycle_id,
             agent_id,
-            head,
             dispatch_hash_value,
+            policy,
+            phases,
         )
         if promoted:
             append_status(f"PROMOTE {promoted}")
-            abm_mod.append_event(
-                abm_mod.build_event(
-                    "cycle_end",
-                    run_id,
-                    dispatch_hash_value,
-                    head,
-                    wo["id"],
-                    cycle_id,
-                    agent_id,
-                    detail={"status": "pass"},
-                )
+            emit_cycle_end(
+                run_id, dispatch_hash_value, head, wo["id"], cycle_id, agent_id,
+                "pass", spawns_start, phases, start_ns, summary,
             )
-            abm_mod.write_aggregates()
             return 0
-        dod_ok, _ = run_verify_cmd("dod")
+        flush_transitions(policy, phases)
+        with timed(phases, "verify_cmd"):
+            dod_ok, _ = run_verify_cmd("dod")
         if dod_ok:
             append_status("DONE DoD=PASS")
-            write_receipt(
-                "RUN_DONE",
-                run_id=run_id,
-                head=git_head(),
-                dispatch_hash_value=dispatch_hash(),
-                work_order_id=None,
-            )
+            with timed(phases, "receipts"):
+                write_terminal_receipt("RUN_DONE", run_id, summary)
             print("DONE")
-            abm_mod.append_event(
-                abm_mod.build_event(
-                    "cycle_end",
-                    run_id,
-                    dispatch_hash_value,
-                    head,
-                    wo["id"],
-                    cycle_id,
-                    agent_id,
-                    detail={"status": "pass"},
-                )
+            emit_cycle_end(
+                run_id, dispatch_hash_value, head, wo["id"], cycle_id, agent_id,
+                "pass", spawns_start, phases, start_ns, summary,
             )
-            abm_mod.write_aggregates()
             return 2
         append_status("FAIL DoD=FAIL")
-        write_receipt(
-            "RUN_FAIL",
-            run_id=run_id,
-            head=git_head(),
-            dispatch_hash_value=dispatch_hash(),
-            work_order_id=None,
-        )
-        abm_mod.append_event(
-            abm_mod.build_event(
-                "cycle_end",
-                run_id,
-                dispatch_hash_value,
-                head,
-                wo["id"],
-                cycle_id,
-                agent_id,
-                detail={"status": "fail"},
-            )
+        with timed(phases, "receipts"):
+            write_terminal_receipt("RUN_FAIL", run_id, summary)
+        emit_cycle_end(
+            run_id, dispatch_hash_value, head, wo["id"], cycle_id, agent_id,
+            "fail", spawns_start, phases, start_ns, summary,
         )
-        abm_mod.write_aggregates()
         return 1
 
     append_status(f"FAIL {wo['id']}")
-    write_receipt(
-        "RUN_FAIL",
-        run_id=run_id,
-        head=git_head(),
-        dispatch_hash_value=dispatch_hash(),
-        work_order_id=None,
-    )
-    abm_mod.append_event(
-        abm_mod.build_event(
-            "cycle_end",
-            run_id,
-            dispatch_hash_value,
-            head,
-            wo["id"],
-            cycle_id,
-            agent_id,
-            detail={"status": "fail"},
-        )
+    flush_transitions(policy, phases)
+    with timed(phases, "receipts"):
+        write_terminal_receipt("RUN_FAIL", run_id, summary)
+    emit_cycle_end(
+        run_id, dispatch_hash_value, head, wo["id"], cycle_id, agent_id,
+        "fail", spawns_start, phases, start_ns, summary,
     )
-    abm_mod.write_aggregates()
     return 1
 
 
@@ -424,17 +701,48 @@ def main():
     group = parser.add_mutually_exclusive_group(required=True)
     group.add_argument("--once", action="store_true")
     group.add_argument("--loop", action="store_true")
+    parser.add_argument(
+        "--commit-policy",
+        choices=COMMIT_MODES,
+        default=None,
+        help="Override policy.commit.mode from hooks.json.",
+    )
+    parser.add_argument(
+        "--run-id",
+        default=None,
+        help="Use this run id instead of generating one (lets callers find the run's receipts).",
+    )
+    parser.add_argument(
+        "--json-summary",
+        default=None,
+        metavar="PATH",
+        help="Write run_id, exit status, cycle/attempt counts, phase timings and the terminal receipt path as JSON.",
+    )
     args = parser.parse_args()
-    run_id = make_run_id()
+    run_id = args.run_id or make_run_id()
+    policy = commit_policy(mode_override=args.commit_policy)
+    summary = new_summary(run_id)
 
     if args.once:
-        code = one_cycle(run_id)
-        return 0 if code == 2 else code
-
-    while True:
-        code = one_cycle(run_id)
-        if code != 0:
-            return 0 if code == 2 else code
+        code = one_cycle(run_id, policy, summary)
+        if code == 0:
+            flush_transitions(policy)
+    else:
+        while True:
+            code = one_cycle(run_id, policy, summary)
+            if code != 0:
+                break
+    exit_code = 0 if code == 2 else code
+
+    if args.json_summary:
+        summary["exit_code"] = exit_code
+        if summary["status"] is None:
+            summary["status"] = "IN_PROGRESS" if exit_code == 0 else "ERROR"
+        summary["head"] = git_session().head()
+        summary["dispatch_hash"] = dispatch_hash()
+        summary["phase_ns"] = dict(sorted(summary["phase_ns"].items()))
+        write_json_summary(args.json_summary, summary)
+    return exit_code
 
 
 if __name__ == "__main__":
@@ -7,8 +7,9 @@ from pathlib import Path
 
 if __package__ in (None, ""):
     sys.path.insert(0, str(Path(__file__).resolve().parent))
+    from dispatch_journal import load_dispatch
 else:
-    pass
+    from .dispatch_journal import load_dispatch
 
 
 RECEIPTS_DIR = Path("receipts")
@@ -34,8 +35,9 @@ def sha256_hex(data):
 
 
 def canonical_dispatch_bytes(dispatch_path=Path(".harness/contracts/dispatch.json")):
-    data = json.loads(dispatch_path.read_text(encoding="utf-8"))
-    return canonical_json_bytes(data)
+    # Hash the materialized state (base file plus journal) so receipts and
+    # snapshots do not depend on when the journal was last compacted.
+    return canonical_json_bytes(load_dispatch(dispatch_path))
 
 
 def dispatch_hash(dispatch_path=Path(".harness/contracts/dispatch.json")):
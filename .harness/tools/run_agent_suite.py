@@ -1,16 +1,20 @@
 import argparse
 import hashlib
 import json
+import os
 import random
 import subprocess
 import sys
+import uuid
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 if __package__ in (None, ""):
     sys.path.insert(0, str(Path(__file__).resolve().parent))
+    import abm_aggregate
     import util as util_mod
 else:
+    from . import abm_aggregate
     from . import util as util_mod
 
 
@@ -49,11 +53,18 @@ def ensure_suite_id(suite_id: str, scenarios: List[str], runs: int, seed: Option
     return "suite-" + "".join(rng.choice("0123456789abcdef") for _ in range(8))
 
 
-def load_latest_run_id() -> str:
-    latest = RUNS_ROOT / "LATEST"
-    if latest.exists():
-        return latest.read_text(encoding="utf-8").strip()
-    return ""
+def summarize_run(run_summary: Dict[str, Any]) -> Dict[str, Any]:
+    # Fallback for runs that emitted no agent telemetry under their run_id.
+    ralph = run_summary.get("ralph") or {}
+    step_codes = run_summary.get("step_codes", {})
+    return {
+        "total_ms": float(run_summary.get("wall_ms", 0.0)),
+        "errors_total": sum(1 for code in step_codes.values() if code != 0),
+        "retries_total": max(int(ralph.get("attempts", 0)) - int(ralph.get("cycles", 0)), 0),
+        "tokens_total": 0,
+        "tokens_estimated": False,
+        "cost_total_usd": 0.0,
+    }
 
 
 def summarize_aggregates(aggregates: Dict[str, Any]) -> Dict[str, Any]:
@@ -153,6 +164,7 @@ def main() -> int:
     parser.add_argument("--concurrency", type=int, default=1)
     parser.add_argument("--suite_id", default="")
     parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--jobs", type=int, default=None, help="Processes for aggregating runs (default: CPUs)")
     args = parser.parse_args()
 
     if args.concurrency != 1:
@@ -176,32 +188,50 @@ def main() -> int:
 
     for scenario in scenarios:
         for run_index in range(1, args.runs + 1):
+            # Each run gets an explicit id and summary path, so nothing depends
+            # on whichever run last wrote artifacts/abm_runs/LATEST.
+            summary_path = repo_root / suite_dir / "runs" / f"{scenario}-{run_index}.json"
+            # The suffix keeps labels unique when a pinned clock repeats suite_id.
+            run_label = f"{suite_id}-{scenario}-{run_index}-{uuid.uuid4().hex[:8]}"
+            env = dict(os.environ, SUITE_RUN_ID=run_label)
             result = subprocess.run(
-                ["python3", ".harness/tools/run_agent_test.py", "--scenario", scenario],
+                [
+                    "python3",
+                    ".harness/tools/run_agent_test.py",
+                    "--scenario",
+                    scenario,
+                    "--json-summary",
+                    str(summary_path),
+                ],
                 text=True,
                 capture_output=True,
                 cwd=repo_root,
+                env=env,
             )
-            run_id = load_latest_run_id()
-            if not run_id:
-                print("ERROR: missing artifacts/abm_runs/LATEST after run")
+            if not summary_path.exists():
+                print(f"ERROR: missing run summary {summary_path}")
                 return 1
-            aggregates_path = RUNS_ROOT / run_id / "aggregates.json"
-            if not aggregates_path.exists():
-                print(f"ERROR: missing aggregates {aggregates_path}")
-                return 1
-            aggregates = load_json(aggregates_path)
-            summary = summarize_aggregates(aggregates)
+            run_summary = load_json(summary_path)
             suite_runs.append(
                 {
                     "index": run_index,
                     "scenario": scenario,
-                    "run_id": run_id,
+                    "run_id": run_summary["run_id"],
                     "return_code": result.returncode,
-                    "summary": summary,
+                    "summary": summarize_run(run_summary),
                 }
             )
 
+    # Aggregate every run's events in parallel, then merge the states into
+    # per-scenario and overall aggregates instead of re-reading each run.
+    policy = abm_aggregate.sketch_policy(repo_root / abm_aggregate.HOOKS_PATH)
+    states = abm_aggregate.collect_run_states([row["run_id"] for row in suite_runs], repo_root, policy, args.jobs)
+    for row in suite_runs:
+        state = states[row["run_id"]]
+        if state is not None and state["event_count"]:
+            row["summary"] = summarize_aggregates(abm_aggregate.RunningAggregator.from_state(state).snapshot())
+    rollup = abm_aggregate.rollup_states(states, {row["run_id"]: row["scenario"] for row in suite_runs}, policy)
+
     pass_count = sum(1 for row in suite_runs if row["return_code"] == 0)
     fail_count = len(suite_runs) - pass_count
     pass_rate = float(pass_count / len(suite_runs)) if suite_runs else 0.0
@@ -235,6 +265,7 @@ def main() -> int:
 
     write_json(suite_dir / "suite_runs.json", suite_runs_payload)
     write_json(suite_dir / "suite_report.json", suite_report)
+    write_json(suite_dir / "suite_rollup.json", rollup)
     write_summary(suite_dir / "suite_summary.md", suite_report)
 
     scenarios_contract = load_json(repo_root / "contracts/abm_scenarios.json")
@@ -10,9 +10,13 @@ Contract:
 - exit 0 on pass
 - non-zero on fail
 - writes an artifact JSON to artifacts/agent_tests/<run_id>.json
+- with --json-summary PATH, also writes run_id, return codes, wall time and
+  (for orc_smoke) ralph's own run summary to PATH; ralph mints its own run id
+  for receipts, reported there as ralph.run_id
 
 Env:
-- HARNESS_NOW_ISO preferred for run_id determinism (falls back to UTC now)
+- SUITE_RUN_ID labels the run (artifacts and agent telemetry); otherwise
+  HARNESS_NOW_ISO (falls back to UTC now) plus a random suffix
 """
 from __future__ import annotations
 
@@ -21,6 +25,8 @@ import json
 import os
 import subprocess
 import sys
+import time
+import uuid
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
@@ -47,7 +53,7 @@ def sh(cmd: list[str], timeout_s: int = 600) -> tuple[int, str]:
     return p.returncode, p.stdout
 
 
-def write_artifact(run_id: str, scenario: str, rc: int, out: str, extra: dict[str, Any] | None = None) -> None:
+def write_artifact(run_id: str, scenario: str, rc: int, out: str, extra: dict[str, Any] | None = None) -> Path:
     d: dict[str, Any] = {
         "run_id": run_id,
         "scenario": scenario,
@@ -59,37 +65,79 @@ def write_artifact(run_id: str, scenario: str, rc: int, out: str, extra: dict[st
         d.update(extra)
     out_dir = ROOT / "artifacts" / "agent_tests"
     out_dir.mkdir(parents=True, exist_ok=True)
-    (out_dir / f"{run_id}-{scenario}.json").write_text(json.dumps(d, sort_keys=True) + "\n")
+    path = out_dir / f"{run_id}-{scenario}.json"
+    path.write_text(json.dumps(d, sort_keys=True) + "\n")
+    return path
+
+
+def write_summary(path: Path, payload: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.tmp")
+    tmp.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
 
 
 def verify_dod() -> tuple[int, str]:
     return sh([sys.executable, ".harness/tools/verify.py", "--check", "dod"])
 
 
-def ralph_loop_once() -> tuple[int, str]:
-    return sh([sys.executable, ".harness/tools/ralph.py", "--loop"], timeout_s=900)
+def ralph_loop_once(summary_path: Path) -> tuple[int, str, dict[str, Any] | None]:
+    # No --run-id: ralph's make_run_id() keeps receipt ids unique even when
+    # the label repeats under a pinned HARNESS_NOW_ISO.
+    rc, out = sh(
+        [
+            sys.executable,
+            ".harness/tools/ralph.py",
+            "--loop",
+            "--json-summary",
+            str(summary_path),
+        ],
+        timeout_s=900,
+    )
+    summary = json.loads(summary_path.read_text(encoding="utf-8")) if summary_path.exists() else None
+    return rc, out, summary
 
 
 def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--scenario", required=True, choices=["orc_verify_dod", "orc_smoke"])
+    ap.add_argument("--json-summary", default=None, help="Write a machine-readable run summary to this path")
     args = ap.parse_args()
 
-    run_id = os.environ.get("SUITE_RUN_ID") or now_iso()
+    run_id = os.environ.get("SUITE_RUN_ID") or f"{now_iso()}-{uuid.uuid4().hex[:8]}"
+    started = time.monotonic()
+    ralph_summary = None
 
     if args.scenario == "orc_verify_dod":
         rc, out = verify_dod()
-        write_artifact(run_id, args.scenario, rc, out)
-        return rc
-
-    if args.scenario == "orc_smoke":
-        rc1, out1 = ralph_loop_once()
+        step_codes = {"dod": rc}
+        artifact = write_artifact(run_id, args.scenario, rc, out)
+    elif args.scenario == "orc_smoke":
+        ralph_path = ROOT / "artifacts" / "agent_tests" / f"{run_id}-{args.scenario}.ralph.json"
+        rc1, out1, ralph_summary = ralph_loop_once(ralph_path)
         rc2, out2 = verify_dod()
         rc = 0 if (rc1 == 0 and rc2 == 0) else (rc2 if rc2 != 0 else rc1)
-        write_artifact(run_id, args.scenario, rc, out1 + "\n---\n" + out2, extra={"rc_ralph": rc1, "rc_dod": rc2})
-        return rc
-
-    raise AssertionError("unreachable")
+        step_codes = {"ralph": rc1, "dod": rc2}
+        artifact = write_artifact(
+            run_id, args.scenario, rc, out1 + "\n---\n" + out2, extra={"rc_ralph": rc1, "rc_dod": rc2}
+        )
+    else:
+        raise AssertionError("unreachable")
+
+    if args.json_summary:
+        write_summary(
+            Path(args.json_summary),
+            {
+                "run_id": run_id,
+                "scenario": args.scenario,
+                "return_code": rc,
+                "step_codes": step_codes,
+                "wall_ms": round((time.monotonic() - started) * 1000.0, 3),
+                "artifact": str(artifact.relative_to(ROOT)),
+                "ralph": ralph_summary,
+            },
+        )
+    return rc
 
 
 if __name__ == "__main__":
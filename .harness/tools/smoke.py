@@ -1,3 +1,4 @@
+import json
 import os
 import sys
 import tempfile
@@ -5,6 +6,7 @@ from pathlib import Path
 
 if __package__ in (None, ""):
     sys.path.insert(0, str(Path(__file__).resolve().parent))
+    from abm_workload import build_workload
     from receipt import write_receipt
     try:
         from util import resolve_cmd_spec as resolve_cmd_spec
@@ -12,6 +14,7 @@ if __package__ in (None, ""):
         resolve_cmd_spec = None
     from util import run_cmd as util_run_cmd
 else:
+    from .abm_workload import build_workload
     from .receipt import write_receipt
     try:
         from .util import resolve_cmd_spec as resolve_cmd_spec
@@ -51,6 +54,27 @@ def _resolve_cmd_spec(spec, context="command"):
     raise ValueError(f"{context} cmd must be a list or string")
 
 
+def batched_scope_loop(root):
+    """Run ralph --loop, batched, over two work orders with disjoint scopes."""
+    build_workload(root, {"work_order_count": 2, "depth": 1})
+    dispatch_path = root / ".harness/contracts/dispatch.json"
+    dispatch = json.loads(dispatch_path.read_text(encoding="utf-8"))
+    bookkeeping = ["artifacts/**", "receipts/**", "docs/STATUS.md", ".harness/contracts/dispatch.json"]
+    for wo, name in zip(dispatch["work_orders"], ("a", "b")):
+        wo["depends_on"] = []
+        wo["scope"]["allow_globs"] = [f"{name}/**"] + bookkeeping
+        write = f"import os; os.makedirs('{name}', exist_ok=True); open('{name}/f', 'w').write('x')"
+        wo["acceptance"] = [{"name": "work", "cmd": f'{sys.executable} -c "{write}"'}]
+    dispatch_path.write_text(json.dumps(dispatch, indent=2) + "\n", encoding="utf-8")
+    cwd = Path.cwd()
+    os.chdir(root)
+    try:
+        util_run_cmd(["git", "commit", "-q", "-am", "disjoint scopes"], check=True)
+        return util_run_cmd([sys.executable, ".harness/tools/ralph.py", "--loop", "--commit-policy", "batched"])
+    finally:
+        os.chdir(cwd)
+
+
 def run():
     errors = []
 
@@ -111,6 +135,15 @@ def run():
     except Exception as exc:
         errors.append(f"shell command error: {exc}")
 
+    print("smoke: batched scope")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        try:
+            result = batched_scope_loop(Path(tmpdir) / "workload")
+            if result["code"] != 0:
+                errors.append(f"batched loop over disjoint scopes exited {result['code']}, not DONE")
+        except Exception as exc:
+            errors.append(f"batched scope error: {exc}")
+
     if errors:
         print("smoke: FAIL")
         for err in errors:
@@ -1,6 +1,11 @@
+import atexit
 import json
 import os
+import shutil
+import signal
 import subprocess
+import tempfile
+import time
 from datetime import datetime, timezone
 from fnmatch import fnmatch
 from pathlib import Path
@@ -25,12 +30,23 @@ def json_write(path, data):
         fh.write("\n")
 
 
-def run_cmd(cmd, check=False):
+def hooks_policy(name, hooks_path=".harness/contracts/hooks.json"):
+    try:
+        hooks = json_read(hooks_path)
+    except (OSError, ValueError):
+        return {}
+    policy = hooks.get("policy", {}) if isinstance(hooks, dict) else {}
+    section = policy.get(name, {}) if isinstance(policy, dict) else {}
+    return section if isinstance(section, dict) else {}
+
+
+def run_cmd(cmd, check=False, strip=True, env=None):
     result = subprocess.run(
         cmd,
         shell=isinstance(cmd, str),
         text=True,
         capture_output=True,
+        env=dict(os.environ, **env) if env else None,
     )
     if check and result.returncode != 0:
         raise RuntimeError(
@@ -39,33 +55,235 @@ def run_cmd(cmd, check=False):
     return {
         "cmd": cmd,
         "code": result.returncode,
-        "stdout": result.stdout.strip(),
-        "stderr": result.stderr.strip(),
+        "stdout": result.stdout.strip() if strip else result.stdout,
+        "stderr": result.stderr.strip() if strip else result.stderr,
     }
 
 
-def git_head():
-    result = run_cmd(["git", "rev-parse", "HEAD"])
-    return result["stdout"] if result["code"] == 0 else ""
+def _kill_group(proc):
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        proc.kill()
 
 
-def git_status_short():
-    return run_cmd(["git", "status", "--short"])  # includes untracked
+def run_cmd_bounded(cmd, timeout=None, cancel=None, poll_s=0.05):
+    """Like run_cmd, but kills the command's process group on timeout or when `cancel` is set."""
+    started = time.monotonic()
+    proc = subprocess.Popen(
+        cmd,
+        shell=isinstance(cmd, str),
+        text=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        start_new_session=True,
+    )
+    status = None
+    while True:
+        try:
+            stdout, stderr = proc.communicate(timeout=poll_s)
+            break
+        except subprocess.TimeoutExpired:
+            pass
+        if timeout is not None and time.monotonic() - started >= timeout:
+            status = "timeout"
+        elif cancel is not None and cancel.is_set():
+            status = "cancelled"
+        if status:
+            _kill_group(proc)
+            stdout, stderr = proc.communicate()
+            break
+    code = proc.returncode
+    if status is None:
+        status = "pass" if code == 0 else "fail"
+    return {
+        "cmd": cmd,
+        "code": code,
+        "stdout": (stdout or "").strip(),
+        "stderr": (stderr or "").strip(),
+        "status": status,
+        "ms": round((time.monotonic() - started) * 1000.0, 3),
+    }
+
+
+class GitSession:
+    """Git access for one process: cached HEAD, long-lived cat-file batches, spawn count."""
+
+    def __init__(self):
+        self.spawns = 0
+        self._cwd = os.getcwd()
+        self._head = None
+        self._git_dir = None
+        self._procs = {}
+
+    def _check_cwd(self):
+        cwd = os.getcwd()
+        if cwd != self._cwd:
+            self.close()
+            self._cwd = cwd
+            self._head = None
+            self._git_dir = None
+
+    def run(self, args, check=False, strip=True, env=None):
+        self._check_cwd()
+        self.spawns += 1
+        return run_cmd(["git", *args], check=check, strip=strip, env=env)
+
+    def _batch(self, mode):
+        self._check_cwd()
+        proc = self._procs.get(mode)
+        if proc is None or proc.poll() is not None:
+            self.spawns += 1
+            proc = subprocess.Popen(
+                ["git", "cat-file", mode],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+            self._procs[mode] = proc
+        return proc
+
+    def _query(self, mode, rev):
+        proc = self._batch(mode)
+        try:
+            proc.stdin.write(f"{rev}\n".encode("utf-8"))
+            proc.stdin.flush()
+            header = proc.stdout.readline().decode("utf-8").strip()
+        except (BrokenPipeError, OSError):
+            self._procs.pop(mode, None)
+            return None, None
+        parts = header.split()
+        if len(parts) != 3:
+            return None, None
+        info = {"oid": parts[0], "type": parts[1], "size": int(parts[2])}
+        if mode != "--batch":
+            return info, None
+        data = proc.stdout.read(info["size"])
+        proc.stdout.read(1)
+        return info, data
 
+    def object_info(self, rev):
+        info, _ = self._query("--batch-check", rev)
+        return info
 
-def git_diff_name_only():
-    return run_cmd(["git", "diff", "--name-only", "HEAD"])
+    def read_object(self, rev):
+        _, data = self._query("--batch", rev)
+        return data
 
+    def rev_parse(self, rev):
+        info = self.object_info(rev)
+        return info["oid"] if info else ""
 
-def git_changed_files():
-    diff = git_diff_name_only()
-    files = set(line.strip() for line in diff["stdout"].splitlines() if line.strip())
-    status = git_status_short()
-    for line in status["stdout"].splitlines():
-        parts = line.split()
-        if len(parts) == 2:
-            files.add(parts[1])
-    return sorted(files)
+    def tree_hash(self, rev="HEAD"):
+        return self.rev_parse(f"{rev}^{{tree}}")
+
+    def worktree_tree(self, exclude_globs=()):
+        """Tree hash of the working tree (tracked + untracked), built in a scratch index."""
+        git_dir = self.git_dir()
+        if not git_dir:
+            return ""
+        with tempfile.TemporaryDirectory() as tmp:
+            index = os.path.join(tmp, "index")
+            # Seeding from the real index keeps its stat cache, so unchanged files are not rehashed.
+            if os.path.exists(os.path.join(git_dir, "index")):
+                shutil.copyfile(os.path.join(git_dir, "index"), index)
+            env = {"GIT_INDEX_FILE": index}
+            pathspec = ["."] + [f":(exclude,glob){pattern}" for pattern in exclude_globs]
+            added = self.run(["add", "-A", "--", *pathspec], env=env)
+            if added["code"] != 0:
+                return ""
+            tree = self.run(["write-tree"], env=env)
+            return tree["stdout"] if tree["code"] == 0 else ""
+
+    def head(self):
+        self._check_cwd()
+        if self._head is None:
+            self._head = self.rev_parse("HEAD")
+        return self._head
+
+    def git_dir(self):
+        self._check_cwd()
+        if self._git_dir is None:
+            result = self.run(["rev-parse", "--absolute-git-dir"])
+            self._git_dir = result["stdout"] if result["code"] == 0 else ""
+        return self._git_dir
+
+    def invalidate(self):
+        self._head = None
+
+    def init(self):
+        result = self.run(["init"])
+        self.close()
+        self._head = None
+        self._git_dir = None
+        return result
+
+    def commit(self, message, paths=None):
+        add = ["add", "-A"]
+        if paths:
+            add += ["--", *paths]
+        self.run(add, check=True)
+        self.run(["commit", "-m", message], check=True)
+        self._head = None
+        return self.head()
+
+    def changed_paths(self, base_tree=None):
+        if base_tree:
+            # Against a recorded worktree tree rather than HEAD, untracked files included.
+            tree = self.worktree_tree()
+            if not tree:
+                return None
+            result = self.run(["diff-tree", "-r", "-z", "--name-only", "--no-renames", base_tree, tree], strip=False)
+            if result["code"] != 0:
+                return None
+            return sorted(path for path in result["stdout"].split("\0") if path)
+        # One `git status` replaces `diff --name-only HEAD` plus `ls-files --others`.
+        result = self.run(["status", "--porcelain", "-z", "--untracked-files=all"], strip=False)
+        if result["code"] != 0:
+            return None
+        head_exists = bool(self.head())
+        paths = set()
+        entries = result["stdout"].split("\0")
+        idx = 0
+        while idx < len(entries):
+            entry = entries[idx]
+            idx += 1
+            if len(entry) < 4:
+                continue
+            status, path = entry[:2], entry[3:]
+            if "R" in status or "C" in status:
+                idx += 1
+            if status == "??" or head_exists:
+                paths.add(path)
+        return sorted(paths)
+
+    def close(self):
+        for proc in self._procs.values():
+            try:
+                proc.stdin.close()
+                proc.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                proc.kill()
+        self._procs = {}
+
+
+_GIT_SESSION = None
+
+
+def git_session():
+    global _GIT_SESSION
+    if _GIT_SESSION is None:
+        _GIT_SESSION = GitSession()
+        atexit.register(_GIT_SESSION.close)
+    return _GIT_SESSION
+
+
+def git_head():
+    return git_session().head()
+
+
+def git_status_short():
+    return run_cmd(["git", "status", "--short"])  # includes untracked
 
 
 def matches_any(path, patterns):
@@ -8,12 +8,18 @@ from pathlib import Path
 if __package__ in (None, ""):
     sys.path.insert(0, str(Path(__file__).resolve().parent))
     import abm as abm_mod
+    import abm_log
+    import dispatch_journal
+    from commit_batch import pending_work_orders, scope_base_tree
     from receipt import canonical_json_bytes, RECEIPT_KINDS, TERMINAL_KINDS
-    from util import git_diff_name_only, json_read, matches_any, run_cmd
+    from util import git_session, json_read, matches_any, run_cmd
 else:
     from . import abm as abm_mod
+    from . import abm_log
+    from . import dispatch_journal
+    from .commit_batch import pending_work_orders, scope_base_tree
     from .receipt import canonical_json_bytes, RECEIPT_KINDS, TERMINAL_KINDS
-    from .util import git_diff_name_only, json_read, matches_any, run_cmd
+    from .util import git_session, json_read, matches_any, run_cmd
 
 
 DISPATCH_PATH = Path(".harness/contracts/dispatch.json")
@@ -28,7 +34,7 @@ REQUIRED_DENY = [
 
 
 def load_dispatch():
-    return json_read(DISPATCH_PATH)
+    return dispatch_journal.load_dispatch(DISPATCH_PATH)
 
 
 def select_active_wo(dispatch):
@@ -42,7 +48,10 @@ def check_schema():
     errors = []
     if not DISPATCH_PATH.exists():
         return False, ["dispatch.json missing"]
-    dispatch = load_dispatch()
+    try:
+        dispatch = load_dispatch()
+    except RuntimeError as exc:
+        return False, [str(exc)]
     if not isinstance(dispatch, dict):
         return False, ["dispatch.json must be an object"]
     meta = dispatch.get("meta")
@@ -109,6 +118,8 @@ def check_schema():
         steps = wo.get("steps")
         if not isinstance(steps, list) or not steps or not all(isinstance(s, str) and s for s in steps):
             errors.append(f"{prefix} steps must be non-empty list of strings")
+        if "acceptance_cache" in wo and not isinstance(wo.get("acceptance_cache"), bool):
+            errors.append(f"{prefix} acceptance_cache must be bool")
         acceptance = wo.get("acceptance")
         if not isinstance(acceptance, list) or not acceptance:
             errors.append(f"{prefix} acceptance must be non-empty list")
@@ -122,6 +133,13 @@ def check_schema():
                     errors.append(f"{a_prefix} name must be non-empty string")
                 if not isinstance(acc.get("cmd"), str) or not acc.get("cmd"):
                     errors.append(f"{a_prefix} cmd must be non-empty string")
+                if "parallel" in acc and not isinstance(acc.get("parallel"), bool):
+                    errors.append(f"{a_prefix} parallel must be bool")
+                timeout_s = acc.get("timeout_s")
+                if "timeout_s" in acc and (
+                    isinstance(timeout_s, bool) or not isinstance(timeout_s, (int, float)) or timeout_s <= 0
+                ):
+                    errors.append(f"{a_prefix} timeout_s must be a positive number")
         artifacts = wo.get("artifacts")
         if not isinstance(artifacts, dict):
             errors.append(f"{prefix} artifacts must be object")
@@ -302,7 +320,11 @@ def check_receipts():
             if count > 1:
                 errors.append(f"{rel_path} multiple terminal receipts for run_id {run_id}")
 
+    # Completions staged by a batched commit policy get their receipt when the batch lands.
+    pending_complete = pending_work_orders("COMPLETE")
     for wo_id, wo in work_orders.items():
+        if wo_id in pending_complete:
+            continue
         if wo.get("done") and complete_counts.get(wo_id, 0) < 1:
             errors.append(f"receipts missing COMPLETE for done work order {wo_id}")
 
@@ -317,24 +339,17 @@ def check_scope():
     scope = wo["scope"]
     allow = scope["allow_globs"]
     deny = scope["deny_globs"]
-    head = run_cmd(["git", "rev-parse", "--verify", "HEAD"])
-    head_exists = head["code"] == 0
-    tracked = []
-    if head_exists:
-        diff = git_diff_name_only()
-        if diff["code"] != 0:
-            return False, ["git diff failed"]
-        tracked = [line.strip() for line in diff["stdout"].splitlines() if line.strip()]
-    untracked = run_cmd(["git", "ls-files", "--others", "--exclude-standard"])
-    if untracked["code"] != 0:
-        return False, ["git ls-files failed"]
-    untracked_files = [line.strip() for line in untracked["stdout"].splitlines() if line.strip()]
-    changed = sorted(set(tracked + untracked_files))
+    changed = git_session().changed_paths(scope_base_tree())
+    if changed is None:
+        return False, ["git status failed"]
+    # The journal is dispatch state, so it is scoped exactly like dispatch.json.
+    journal = dispatch_journal.journal_path(DISPATCH_PATH).as_posix()
     errors = []
     for path in changed:
-        if matches_any(path, deny):
+        subject = DISPATCH_PATH.as_posix() if path == journal else path
+        if matches_any(subject, deny):
             errors.append(f"scope denied: {path}")
-        if not matches_any(path, allow):
+        if not matches_any(subject, allow):
             errors.append(f"scope not allowed: {path}")
     return not errors, errors
 
@@ -399,7 +414,7 @@ def _validate_abm_events_schema(events_path, schema_path):
         import jsonschema  # type: ignore
     except Exception:
         jsonschema = None
-    for line_no, line in enumerate(events_path.read_text(encoding="utf-8").splitlines(), start=1):
+    for line_no, line in enumerate(abm_log.iter_lines(events_path), start=1):
         if not line.strip():
             continue
         try:
@@ -425,7 +440,7 @@ def check_abm():
     done_ids = [wo.get("id") for wo in work_orders if wo.get("done")]
 
     events_path = abm_mod.EVENTS_PATH
-    if events_path.exists():
+    if abm_log.exists(events_path):
         schema_path = Path("contracts/abm_event.schema.json")
         ok, schema_errors = _validate_abm_events_schema(events_path, schema_path)
         if not ok:
@@ -464,6 +479,7 @@ def check_abm():
 
     first_event_ts = min(timestamps) if timestamps else None
     required_event_types = {"cycle_start", "attempt_start", "verify_result", "state_transition"}
+    pending_complete = pending_work_orders("COMPLETE")
     for wo_id in done_ids:
         wo_events = events_by_wo.get(wo_id, [])
         in_scope = bool(wo_events)
@@ -484,6 +500,8 @@ def check_abm():
             continue
         types = {e.get("event_type") for e in wo_events}
         missing = required_event_types - types
+        if wo_id in pending_complete:
+            missing.discard("state_transition")
         if missing:
             errors.append(f"abm silent execution for {wo_id}: missing {', '.join(sorted(missing))}")
 
@@ -1,9 +1,16 @@
 import argparse
 import json
+import sys
 import time
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    import abm_log
+else:
+    from . import abm_log
+
 RUNS_ROOT = Path("artifacts/abm_runs")
 
 
@@ -52,21 +59,18 @@ def extract_metrics(aggregates: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def tail_new_bytes(path: Path, position: int) -> Tuple[List[Dict[str, Any]], int]:
-    if not path.exists():
-        return [], position
+def tail_new_bytes(path: Path, cursor: Tuple[int, int]) -> Tuple[List[Dict[str, Any]], Tuple[int, int]]:
+    # Follows the log across rotation into compressed segments.
+    lines, cursor = abm_log.tail_lines(path, cursor)
     events: List[Dict[str, Any]] = []
-    with open(path, "r", encoding="utf-8") as fh:
-        fh.seek(position)
-        for line in fh:
-            if not line.strip():
-                continue
-            try:
-                events.append(json.loads(line))
-            except json.JSONDecodeError:
-                break
-        position = fh.tell()
-    return events, position
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            events.append(json.loads(line))
+        except json.JSONDecodeError:
+            break
+    return events, cursor
 
 
 def format_plain(
@@ -150,7 +154,7 @@ def main() -> int:
     run_id = pinned_run_id or read_latest_run_id() or ""
 
     events_path = RUNS_ROOT / run_id / "events.jsonl" if run_id else None
-    position = 0
+    position = (0, 0)
     counts: Dict[str, int] = {}
     errors: List[str] = []
     ticks = 0
@@ -161,7 +165,7 @@ def main() -> int:
             if latest_run_id and latest_run_id != run_id:
                 run_id = latest_run_id
                 events_path = RUNS_ROOT / run_id / "events.jsonl"
-                position = 0
+                position = (0, 0)
                 counts = {}
                 errors = []
 
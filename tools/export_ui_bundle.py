@@ -15,6 +15,9 @@ from pathlib import Path
 import shutil
 import sys
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / ".harness" / "tools"))
+import abm_log  # noqa: E402
+
 CANDIDATES = {
     "results.json": [
         "artifacts/abm/benchmarks/results.json",
@@ -55,7 +58,12 @@ def main() -> int:
             missing.append(name)
             continue
         dst = out / name
-        shutil.copyfile(src, dst)
+        if name == "events.jsonl" and abm_log.segment_paths(src):
+            # Rotated segments are inflated and joined, so consumers still get one plain file.
+            with dst.open("w", encoding="utf-8") as fh:
+                fh.writelines(abm_log.iter_lines(src))
+        else:
+            shutil.copyfile(src, dst)
         copied.append((name, str(src), str(dst)))
 
     # Write a minimal manifest for consumers (optional)